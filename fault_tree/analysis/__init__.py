@@ -0,0 +1,11 @@
+from .bdd import Bdd, BddNodeBudgetError, FaultTreeBdd, top_event_probability
+from .importance import ImportanceMeasures, importance_measures, rank
+from .zbdd import Zbdd, FaultTreeZbdd, count_cut_sets, minimal_cut_sets
+from .mocus import MocusProgram, minimize_cut_sets, mocus
+from .modules import Module, find_modules, module_gates
+from .program import Program
+from .monte_carlo import BitParallelSimulator, MonteCarloResult, monte_carlo
+from .importance_sampling import ImportanceSampler, importance_sampling
+from .tdigest import TDigest
+from .truth_table import TruthTable
+from .uncertainty import UncertaintyAnalysis, UncertaintyResult, latin_hypercube, lognormal_parameters, propagate_uncertainty
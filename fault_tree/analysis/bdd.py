@@ -0,0 +1,411 @@
+"""Reduced ordered binary decision diagrams (BDD) with complement edges.
+
+Edges are integers ``2 * node + complement``. Node 0 is the terminal ONE,
+so edge 0 is TRUE and edge 1 is FALSE. The high (then) edge of every node is
+regular, which makes the representation canonical: equal functions get equal
+edges, and negation is a bit flip. Nodes are hash-consed in a unique table,
+and AND/XOR results are memoized in a computed table; OR comes from AND by
+De Morgan.
+
+All operations use explicit stacks, so diagrams deeper than the recursion
+limit are fine. Nodes are only ever appended, and the children of a node
+always have smaller indices, so the node list is a topological order.
+"""
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from fault_tree import FaultTree
+from fault_tree.io.tables import FaultTreeTables, OPERATORS
+
+TRUE = 0
+FALSE = 1
+
+_AND = 0
+_XOR = 1
+_BUILD = -1
+
+
+class BddNodeBudgetError(Exception):
+    """The BDD grew beyond its node budget."""
+    pass
+
+
+class Bdd:
+    """Manager of BDD nodes over variables ``0..num_vars-1``; lower variables are closer to the root.
+
+    Attributes:
+        num_vars (int): The number of variables.
+        max_nodes (Optional[int]): The node budget, or None for no limit.
+        variables (List[int]): The variable of every node; ``num_vars`` for the terminal.
+        lows (List[int]): The low (else) edge of every node.
+        highs (List[int]): The high (then) edge of every node, always regular.
+    """
+
+    def __init__(self, num_vars: int, max_nodes: Optional[int] = 1_000_000):
+        """Initializes a manager with only the terminal node.
+
+        Args:
+            num_vars (int): The number of variables.
+            max_nodes (Optional[int]): The node budget, or None for no limit.
+        """
+        self.num_vars = num_vars
+        self.max_nodes = max_nodes
+        self.variables: List[int] = [num_vars]
+        self.lows: List[int] = [TRUE]
+        self.highs: List[int] = [TRUE]
+        self._unique: Dict[Tuple[int, int, int], int] = {}
+        self._computed: Dict[Tuple[int, int, int], int] = {}
+
+    @property
+    def num_nodes(self) -> int:
+        """The number of nodes, the terminal included."""
+        return len(self.variables)
+
+    def clear_cache(self):
+        """Empties the computed table."""
+        self._computed.clear()
+
+    def make_node(self, variable: int, low: int, high: int) -> int:
+        """Returns the edge of the reduced node ``variable ? high : low``.
+
+        Raises:
+            BddNodeBudgetError: If a new node would exceed the budget.
+        """
+        if low == high:
+            return low
+        complement = high & 1
+        low ^= complement
+        high ^= complement
+        key = (variable, low, high)
+        node = self._unique.get(key)
+        if node is None:
+            node = len(self.variables)
+            if self.max_nodes is not None and node >= self.max_nodes:
+                raise BddNodeBudgetError(f"The BDD exceeds the budget of {self.max_nodes} nodes")
+            self._unique[key] = node
+            self.variables.append(variable)
+            self.lows.append(low)
+            self.highs.append(high)
+        return 2 * node | complement
+
+    def variable(self, variable: int) -> int:
+        """Returns the edge of the single-variable function."""
+        return self.make_node(variable, FALSE, TRUE)
+
+    def top_variable(self, edge: int) -> int:
+        """Returns the variable of the node an edge points to."""
+        return self.variables[edge >> 1]
+
+    def cofactors(self, edge: int, variable: int) -> Tuple[int, int]:
+        """Returns the (low, high) cofactors of an edge with respect to a variable at or above it."""
+        node = edge >> 1
+        if self.variables[node] != variable:
+            return edge, edge
+        complement = edge & 1
+        return self.lows[node] ^ complement, self.highs[node] ^ complement
+
+    def apply_and(self, f: int, g: int) -> int:
+        """Returns the conjunction of two functions."""
+        return self._apply(_AND, f, g)
+
+    def apply_or(self, f: int, g: int) -> int:
+        """Returns the disjunction of two functions."""
+        return self._apply(_AND, f ^ 1, g ^ 1) ^ 1
+
+    def apply_xor(self, f: int, g: int) -> int:
+        """Returns the exclusive disjunction of two functions."""
+        return self._apply(_XOR, f, g)
+
+    def atleast(self, k_num: int, edges: Sequence[int]) -> int:
+        """Returns the function that holds iff at least ``k_num`` of the functions hold.
+
+        The sequential counter takes ``O(n * k)`` apply operations.
+        """
+        num_edges = len(edges)
+        if k_num <= 0:
+            return TRUE
+        if k_num > num_edges:
+            return FALSE
+        # counts[j] holds iff at least j of the functions seen so far hold.
+        counts = [TRUE] + [FALSE] * k_num
+        for i, edge in enumerate(edges, start=1):
+            low = max(1, k_num - (num_edges - i))  # cells that can no longer reach k are dropped
+            for j in range(min(i, k_num), low - 1, -1):
+                counts[j] = self.apply_or(counts[j], self.apply_and(counts[j - 1], edge))
+        return counts[k_num]
+
+    @staticmethod
+    def _terminal(operation: int, f: int, g: int) -> Optional[int]:
+        if operation == _AND:
+            if f == FALSE or g == FALSE or f == g ^ 1:
+                return FALSE
+            if f == TRUE or f == g:
+                return g
+            if g == TRUE:
+                return f
+        else:
+            if f == g:
+                return FALSE
+            if f == g ^ 1:
+                return TRUE
+            if f == FALSE or f == TRUE:  # XOR with FALSE (edge 1) keeps, with TRUE (edge 0) negates
+                return g ^ f ^ 1
+            if g == FALSE or g == TRUE:
+                return f ^ g ^ 1
+        return None
+
+    def _apply(self, operation: int, f: int, g: int) -> int:
+        """Applies a binary operation with an explicit stack instead of recursion."""
+        results: List[int] = []
+        stack: List[tuple] = [(operation, f, g)]
+        computed = self._computed
+        variables = self.variables
+        while stack:
+            task = stack.pop()
+            if task[0] == _BUILD:
+                _, key, variable, flip = task
+                high = results.pop()
+                low = results.pop()
+                result = self.make_node(variable, low, high)
+                computed[key] = result
+                results.append(result ^ flip)
+                continue
+            _, f, g = task
+            result = self._terminal(operation, f, g)
+            if result is not None:
+                results.append(result)
+                continue
+            flip = 0
+            if operation == _XOR:  # complements factor out of XOR
+                flip = (f ^ g) & 1
+                f &= ~1
+                g &= ~1
+            if f > g:
+                f, g = g, f
+            key = (operation, f, g)
+            result = computed.get(key)
+            if result is not None:
+                results.append(result ^ flip)
+                continue
+            variable = min(variables[f >> 1], variables[g >> 1])
+            f_low, f_high = self.cofactors(f, variable)
+            g_low, g_high = self.cofactors(g, variable)
+            stack.append((_BUILD, key, variable, flip))
+            stack.append((operation, f_high, g_high))
+            stack.append((operation, f_low, g_low))
+        return results[0]
+
+    def probability(self, edge: int, probabilities: Sequence[float]) -> float:
+        """Computes the probability of a function of independent variables.
+
+        Both the probability of every node and of its complement are propagated
+        as sums of non-negative terms, so complement edges do not cause cancellation.
+
+        Args:
+            edge (int): The function.
+            probabilities (Sequence[float]): The probability of every variable.
+
+        Returns:
+            float: The probability that the function holds.
+        """
+        node_true, node_false = self.node_probabilities(probabilities, edge >> 1)
+        return node_false[edge >> 1] if edge & 1 else node_true[edge >> 1]
+
+    def node_probabilities(self, probabilities: Sequence[float],
+                           last_node: Optional[int] = None) -> Tuple[List[float], List[float]]:
+        """Computes the probability of every node function and of its complement.
+
+        Args:
+            probabilities (Sequence[float]): The probability of every variable.
+            last_node (Optional[int]): The last node to compute; defaults to all nodes.
+
+        Returns:
+            Tuple[List[float], List[float]]: The probabilities of the node functions and of their complements.
+        """
+        last_node = self.num_nodes - 1 if last_node is None else last_node
+        node_true = [1.0] * (last_node + 1)
+        node_false = [0.0] * (last_node + 1)
+        variables, lows, highs = self.variables, self.lows, self.highs
+        for node in range(1, last_node + 1):
+            p = probabilities[variables[node]]
+            low, high = lows[node], highs[node]
+            low_true, low_false = node_true[low >> 1], node_false[low >> 1]
+            if low & 1:
+                low_true, low_false = low_false, low_true
+            node_true[node] = p * node_true[high >> 1] + (1 - p) * low_true
+            node_false[node] = p * node_false[high >> 1] + (1 - p) * low_false
+        return node_true, node_false
+
+    def gradient(self, edge: int, probabilities: Sequence[float]) -> List[float]:
+        """Computes the derivatives of the probability of a function by all variable probabilities.
+
+        The probability is multilinear, so the derivative by a variable is the sum over
+        its nodes of the probability of reaching the node times the difference between
+        the probabilities of the high and the low branches. One pass from the root down
+        accumulates the signed reach probabilities (adjoints) of all nodes.
+
+        Args:
+            edge (int): The function.
+            probabilities (Sequence[float]): The probability of every variable.
+
+        Returns:
+            List[float]: The derivative by every variable probability, i.e., the Birnbaum importance.
+        """
+        root = edge >> 1
+        node_true, node_false = self.node_probabilities(probabilities, root)
+        adjoints = [0.0] * (root + 1)
+        adjoints[root] = -1.0 if edge & 1 else 1.0
+        gradient = [0.0] * self.num_vars
+        variables, lows, highs = self.variables, self.lows, self.highs
+        for node in range(root, 0, -1):  # parents always come after their children
+            adjoint = adjoints[node]
+            if not adjoint:
+                continue
+            variable, low, high = variables[node], lows[node], highs[node]
+            p = probabilities[variable]
+            if low & 1:
+                gradient[variable] += adjoint * (node_true[high >> 1] - node_false[low >> 1])
+                adjoints[low >> 1] -= adjoint * (1 - p)
+            else:
+                gradient[variable] += adjoint * (node_true[high >> 1] - node_true[low >> 1])
+                adjoints[low >> 1] += adjoint * (1 - p)
+            adjoints[high >> 1] += adjoint * p
+        return gradient
+
+
+def variable_order(tables: FaultTreeTables) -> List[int]:
+    """Orders the basic events under the top gate by an iterative depth-first traversal.
+
+    Events that appear close together in the structure get neighbouring variables,
+    which is the usual structural heuristic for small fault tree BDDs.
+
+    Args:
+        tables (FaultTreeTables): The indexed fault tree.
+
+    Returns:
+        List[int]: The node indices of the basic events in variable order.
+    """
+    num_basic = len(tables.basic_events)
+    gate_offset = tables.gate_offset
+    offsets, children = tables.child_offsets, tables.children
+    order: List[int] = []
+    seen = bytearray(tables.num_nodes)
+    stack = [tables.top_index] if tables.top_index >= 0 else []
+    while stack:
+        node = stack.pop()
+        if seen[node]:
+            continue
+        seen[node] = 1
+        if node < num_basic:
+            order.append(node)
+        elif node >= gate_offset:
+            gate_number = node - gate_offset
+            stack.extend(reversed(children[offsets[gate_number]:offsets[gate_number + 1]]))
+    return order
+
+
+class FaultTreeBdd:
+    """The BDD of the top gate of a fault tree.
+
+    CCF groups are not expanded; basic events are taken as independent.
+
+    Attributes:
+        tables (FaultTreeTables): The indexed fault tree.
+        bdd (Bdd): The node manager.
+        order (List[int]): The node indices of the basic events in variable order.
+        levels (Dict[int, int]): The variable of every basic event node index in the order.
+        root (int): The edge of the top gate function.
+    """
+
+    def __init__(self, fault_tree: FaultTree, max_nodes: Optional[int] = 1_000_000):
+        """Builds the BDD of the top gate gate by gate in topological order.
+
+        Args:
+            fault_tree (FaultTree): The fault tree.
+            max_nodes (Optional[int]): The node budget, or None for no limit.
+
+        Raises:
+            ValueError: If there is no top gate or a gate is malformed.
+            BddNodeBudgetError: If the BDD exceeds the node budget.
+        """
+        self.tables = tables = FaultTreeTables.from_fault_tree(fault_tree)
+        if tables.top_index < 0:
+            raise ValueError("The fault tree has no top gate")
+        self.order = variable_order(tables)
+        self.levels: Dict[int, int] = {node: level for level, node in enumerate(self.order)}
+        self.bdd = bdd = Bdd(len(self.order), max_nodes)
+        gate_offset = tables.gate_offset
+        edges: List[int] = [bdd.variable(self.levels[i]) if i in self.levels else FALSE
+                            for i in range(len(tables.basic_events))]
+        edges.extend(TRUE if x else FALSE for x in tables.house_states)
+        edges.extend([FALSE] * len(tables.gates))
+        offsets, children = tables.child_offsets, tables.children
+        for gate_number in tables.topological_order([tables.top_index - gate_offset]):
+            arguments = [edges[x] for x in children[offsets[gate_number]:offsets[gate_number + 1]]]
+            operator = OPERATORS[tables.operators[gate_number]]
+            if operator == "and":
+                result = TRUE
+                for argument in arguments:
+                    result = bdd.apply_and(result, argument)
+            elif operator == "or":
+                result = FALSE
+                for argument in arguments:
+                    result = bdd.apply_or(result, argument)
+            elif operator == "xor":
+                result = FALSE
+                for argument in arguments:
+                    result = bdd.apply_xor(result, argument)
+            elif operator == "not":
+                if len(arguments) != 1:
+                    raise ValueError(f"NOT gate {tables.gates[gate_number].name} must have exactly one argument")
+                result = arguments[0] ^ 1
+            else:
+                result = bdd.atleast(tables.k_nums[gate_number], arguments)
+            edges[gate_offset + gate_number] = result
+        self.root = edges[tables.top_index]
+
+    def probabilities(self) -> List[float]:
+        """Returns the probability of every variable from the basic events.
+
+        Raises:
+            ValueError: If a basic event has no probability.
+        """
+        values = []
+        for node in self.order:
+            value = self.tables.probabilities[node]
+            if math.isnan(value):
+                raise ValueError(f"Basic event {self.tables.basic_events[node].name} has no probability")
+            values.append(value)
+        return values
+
+    def probability(self, probabilities: Optional[Sequence[float]] = None) -> float:
+        """Computes the exact top event probability.
+
+        Args:
+            probabilities (Optional[Sequence[float]]): The probability of every variable;
+                defaults to the basic event probabilities (lognormal means).
+
+        Returns:
+            float: The top event probability.
+
+        Raises:
+            ValueError: If a basic event has no probability.
+        """
+        return self.bdd.probability(self.root, self.probabilities() if probabilities is None else probabilities)
+
+
+def top_event_probability(fault_tree: FaultTree, max_nodes: Optional[int] = 1_000_000) -> float:
+    """Computes the exact top event probability of a fault tree with a BDD.
+
+    Args:
+        fault_tree (FaultTree): The fault tree with basic event probabilities.
+        max_nodes (Optional[int]): The node budget, or None for no limit.
+
+    Returns:
+        float: The top event probability.
+
+    Raises:
+        ValueError: If there is no top gate, a gate is malformed, or a basic event has no probability.
+        BddNodeBudgetError: If the BDD exceeds the node budget.
+    """
+    return FaultTreeBdd(fault_tree, max_nodes).probability()
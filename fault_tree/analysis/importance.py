@@ -0,0 +1,81 @@
+"""Importance measures of basic events from one BDD gradient pass.
+
+The top event probability ``P`` is multilinear in the basic event probabilities,
+so the Birnbaum importance ``B_i = dP/dp_i`` of every event comes from one
+reverse sweep over the BDD (:meth:`fault_tree.analysis.bdd.Bdd.gradient`), and
+the conditional probabilities follow without re-quantification:
+
+    P(p_i = 1) = P + (1 - p_i) * B_i,    P(p_i = 0) = P - p_i * B_i.
+
+The other measures derive from these:
+
+    FV_i = (P - P(p_i = 0)) / P = p_i * B_i / P     (Fussell-Vesely)
+    RAW_i = P(p_i = 1) / P                           (risk achievement worth)
+    RRW_i = P / P(p_i = 0)                           (risk reduction worth)
+
+Ratios with a zero denominator are infinite, or 1 if the numerator is zero too.
+"""
+from collections import namedtuple
+from typing import Dict, List, Optional
+
+from fault_tree import FaultTree
+from fault_tree.analysis.bdd import FaultTreeBdd
+
+MEASURES = ("birnbaum", "fussell_vesely", "raw", "rrw")
+
+ImportanceMeasures = namedtuple('ImportanceMeasures', ['probability', 'birnbaum', 'fussell_vesely', 'raw', 'rrw'])
+
+
+def _ratio(numerator: float, denominator: float) -> float:
+    if denominator > 0:
+        return numerator / denominator
+    return float('inf') if numerator > 0 else 1.0
+
+
+def importance_measures(fault_tree: FaultTree,
+                        max_nodes: Optional[int] = 1_000_000) -> Dict[str, ImportanceMeasures]:
+    """Computes the importance measures of all basic events under the top gate.
+
+    CCF groups are not expanded; basic events are taken as independent.
+
+    Args:
+        fault_tree (FaultTree): The fault tree with basic event probabilities.
+        max_nodes (Optional[int]): The node budget of the BDD, or None for no limit.
+
+    Returns:
+        Dict[str, ImportanceMeasures]: The event probability and the Birnbaum, Fussell-Vesely,
+        RAW, and RRW importance of every basic event by name, in the BDD variable order.
+
+    Raises:
+        ValueError: If there is no top gate, a gate is malformed, or a basic event has no probability.
+        BddNodeBudgetError: If the BDD exceeds the node budget.
+    """
+    bdd = FaultTreeBdd(fault_tree, max_nodes)
+    probabilities = bdd.probabilities()
+    top = bdd.bdd.probability(bdd.root, probabilities)
+    gradient = bdd.bdd.gradient(bdd.root, probabilities)
+    measures = {}
+    for node, p, birnbaum in zip(bdd.order, probabilities, gradient):
+        failed = min(1.0, max(0.0, top + (1 - p) * birnbaum))
+        working = min(1.0, max(0.0, top - p * birnbaum))
+        measures[bdd.tables.basic_events[node].name] = ImportanceMeasures(
+            p, birnbaum, p * birnbaum / top if top > 0 else 0.0, _ratio(failed, top), _ratio(top, working))
+    return measures
+
+
+def rank(measures: Dict[str, ImportanceMeasures], by: str = "birnbaum") -> List[str]:
+    """Ranks basic events by an importance measure, the most important first.
+
+    Args:
+        measures (Dict[str, ImportanceMeasures]): The importance measures by event name.
+        by (str): The measure, one of ``MEASURES``.
+
+    Returns:
+        List[str]: The event names in descending importance; ties keep their order.
+
+    Raises:
+        ValueError: If the measure is unknown.
+    """
+    if by not in MEASURES:
+        raise ValueError(f"Unknown importance measure: {by}")
+    return sorted(measures, key=lambda name: getattr(measures[name], by), reverse=True)
@@ -0,0 +1,237 @@
+"""Importance sampling of rare top events guided by low-order cut sets.
+
+Naive Monte Carlo needs about ``100 / P`` trials for a 20% relative error,
+which is hopeless for top event probabilities around 1e-9. The proposal here
+is a mixture: with probability ``beta`` a trial samples the basic events from
+their own probabilities, and otherwise it picks a cut set ``C_j`` with
+probability ``P(C_j) / S``, where ``S`` is the sum of the cut set probabilities,
+forces the literals of the cut set, and samples the other events as usual.
+The likelihood ratio of a trial ``x`` then depends only on the number
+``N(x)`` of the chosen cut sets that hold in it:
+
+    w(x) = 1 / (beta + (1 - beta) * N(x) / S),
+
+and the mean of ``w(x)`` over the trials with the top event is an unbiased
+estimate of its probability. Failures covered by the cut sets get weights
+about ``S / N(x)``, close to the probability itself when the cut sets dominate,
+so the variance collapses. The nominal component keeps the estimate unbiased
+when the cut sets miss some failures.
+
+The cut sets are the most likely ZBDD minimal cut sets up to an order limit,
+raised until there are any. The trials are evaluated on bit-planes as in
+:mod:`fault_tree.analysis.monte_carlo`; only the forced literals and the
+cut set counts are per-trial work.
+"""
+import math
+from statistics import NormalDist
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from fault_tree import FaultTree
+from fault_tree.analysis.monte_carlo import BitParallelSimulator, MonteCarloResult
+from fault_tree.analysis.zbdd import FaultTreeZbdd
+
+# Cut set literal rows held in memory at once while counting the cut sets of trials.
+_MAX_ROWS = 1 << 22
+
+
+class ImportanceSampler(BitParallelSimulator):
+    """Samples trials biased towards the likeliest low-order cut sets and reweights them.
+
+    Attributes:
+        cut_sets (List[Tuple[Tuple[int, bool], ...]]): The guiding cut sets as (basic event, negated) literals.
+        cut_set_probabilities (np.ndarray): The probabilities of the guiding cut sets.
+        nominal_fraction (float): The fraction of trials sampled from the basic event probabilities.
+    """
+
+    def __init__(self, fault_tree: FaultTree, limit_order: Optional[int] = 4, max_cut_sets: int = 1000,
+                 nominal_fraction: float = 0.05, max_nodes: Optional[int] = 1_000_000):
+        """Indexes the fault tree and finds the guiding cut sets.
+
+        Args:
+            fault_tree (FaultTree): The fault tree with basic event probabilities.
+            limit_order (Optional[int]): The initial order limit of the cut sets, or None for no limit.
+            max_cut_sets (int): The largest number of guiding cut sets, the likeliest ones.
+            nominal_fraction (float): The fraction of trials sampled from the basic event probabilities.
+            max_nodes (Optional[int]): The node budget of the ZBDD, or None for no limit.
+
+        Raises:
+            ValueError: If there is no top gate, a gate is malformed, a basic event has no probability,
+                or the nominal fraction is not in ``(0, 1]``.
+            BddNodeBudgetError: If the ZBDD exceeds the node budget.
+        """
+        super().__init__(fault_tree)
+        if not 0 < nominal_fraction <= 1:
+            raise ValueError("The nominal fraction of importance sampling must be in (0, 1]")
+        self.nominal_fraction = nominal_fraction
+        indices = {x.name: i for i, x in enumerate(self.tables.basic_events)}
+        num_events = len(self.tables.basic_events)
+        while True:
+            zbdd = FaultTreeZbdd(fault_tree, limit_order, max_nodes=max_nodes)
+            if zbdd.count() or limit_order is None or limit_order >= num_events:
+                break
+            limit_order += 1
+        events = [indices[zbdd.tables.basic_events[x].name] for x in zbdd.order]
+        cut_sets = [tuple((events[x >> 1], bool(x & 1)) for x in cut_set) for cut_set in zbdd.zbdd.sets(zbdd.root)]
+        probabilities = np.array([self.literal_probability(x) for x in cut_sets], dtype=np.float64)
+        likeliest = np.argsort(-probabilities, kind='stable')[:max_cut_sets]
+        likeliest = likeliest[probabilities[likeliest] > 0]
+        self.cut_sets: List[Tuple[Tuple[int, bool], ...]] = [cut_sets[i] for i in likeliest]
+        self.cut_set_probabilities = probabilities[likeliest]
+
+    def literal_probability(self, literals: Tuple[Tuple[int, bool], ...]) -> float:
+        """Returns the probability of a conjunction of basic event literals."""
+        result = 1.0
+        for event, negated in literals:
+            p = self.probabilities[event]
+            result *= 1 - p if negated else p
+        return result
+
+    def force(self, basic_planes: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """Picks the mixture component of every trial and forces the literals of the chosen cut sets.
+
+        Args:
+            basic_planes (np.ndarray): The ``(num_basic, num_words)`` planes sampled from the probabilities;
+                they are modified in place.
+            rng (np.random.Generator): The source of randomness.
+
+        Returns:
+            np.ndarray: The planes of the basic events.
+        """
+        if not self.cut_sets:
+            return basic_planes
+        num_words = basic_planes.shape[1]
+        num_trials = 64 * num_words
+        trials = np.flatnonzero(rng.random(num_trials) >= self.nominal_fraction)
+        cumulative = np.cumsum(self.cut_set_probabilities)
+        choices = np.searchsorted(cumulative, rng.random(len(trials)) * cumulative[-1], side='right')
+        choices = np.minimum(choices, len(self.cut_sets) - 1)
+        order = np.argsort(choices, kind='stable')
+        trials, bounds = trials[order], np.searchsorted(choices[order], np.arange(len(self.cut_sets) + 1))
+        flat = basic_planes.reshape(-1)
+        for j, cut_set in enumerate(self.cut_sets):
+            chosen = trials[bounds[j]:bounds[j + 1]]
+            if not len(chosen):
+                continue
+            words, bits = chosen >> 6, np.left_shift(np.uint64(1), (chosen & 63).astype(np.uint64))
+            for event, negated in cut_set:
+                if negated:
+                    np.bitwise_and.at(flat, event * num_words + words, ~bits)
+                else:
+                    np.bitwise_or.at(flat, event * num_words + words, bits)
+        return basic_planes
+
+    def count_cut_sets(self, basic_planes: np.ndarray, trials: np.ndarray) -> np.ndarray:
+        """Counts the guiding cut sets that hold in some trials.
+
+        Args:
+            basic_planes (np.ndarray): The ``(num_basic, num_words)`` planes of the basic events.
+            trials (np.ndarray): The trial numbers.
+
+        Returns:
+            np.ndarray: The number of cut sets holding in every trial.
+        """
+        num_words = basic_planes.shape[1]
+        counts = np.zeros(len(trials), dtype=np.int64)
+        rows = max(1, _MAX_ROWS // (64 * num_words))
+        for start in range(0, len(self.cut_sets), rows):
+            chunk = self.cut_sets[start:start + rows]
+            planes = np.full((len(chunk), num_words), ~np.uint64(0))
+            for i, cut_set in enumerate(chunk):
+                for event, negated in cut_set:
+                    planes[i] &= ~basic_planes[event] if negated else basic_planes[event]
+            bits = np.unpackbits(planes.view(np.uint8), axis=1, bitorder='little')
+            counts += bits[:, trials].sum(axis=0, dtype=np.int64)
+        return counts
+
+    def weights(self, basic_planes: np.ndarray, trials: np.ndarray) -> np.ndarray:
+        """Returns the likelihood ratios of the nominal over the proposal distribution of some trials."""
+        if not self.cut_sets:
+            return np.ones(len(trials))
+        total = self.cut_set_probabilities.sum()
+        beta = self.nominal_fraction
+        return 1 / (beta + (1 - beta) * self.count_cut_sets(basic_planes, trials) / total)
+
+    def run(self, relative_error: float = 0.01, confidence: float = 0.95, max_samples: int = 100_000_000,
+            batch_words: int = 1024, seed: Optional[int] = None) -> MonteCarloResult:
+        """Samples batches of biased trials until the estimate is precise enough.
+
+        Args:
+            relative_error (float): The target half-width of the confidence interval relative to the estimate.
+            confidence (float): The confidence level of the interval.
+            max_samples (int): The largest number of trials.
+            batch_words (int): The number of 64-trial words per batch.
+            seed (Optional[int]): The seed of the random generator.
+
+        Returns:
+            MonteCarloResult: The weighted estimate, its normal confidence interval, the achieved
+            relative error, and the numbers of trials and of biased trials with the top event.
+        """
+        rng = np.random.default_rng(seed)
+        z_score = NormalDist().inv_cdf(0.5 + confidence / 2)
+        num_samples = num_hits = 0
+        total = squares = 0.0
+        while True:
+            basic_planes = self.force(self.sample(batch_words, rng), rng)
+            top = self.evaluate(basic_planes)
+            trials = np.flatnonzero(np.unpackbits(top.view(np.uint8), bitorder='little'))
+            weights = self.weights(basic_planes, trials)
+            num_hits += len(trials)
+            num_samples += 64 * batch_words
+            total += float(weights.sum())
+            squares += float(np.square(weights).sum())
+            result = weighted_estimate(total, squares, num_samples, num_hits, z_score)
+            if result.relative_error <= relative_error or num_samples + 64 * batch_words > max_samples:
+                return result
+
+
+def weighted_estimate(total: float, squares: float, num_samples: int, num_hits: int,
+                      z_score: float) -> MonteCarloResult:
+    """Computes the estimate and the normal confidence interval from the weighted trial sums.
+
+    Args:
+        total (float): The sum of the weights of the trials with the top event.
+        squares (float): The sum of the squared weights of the trials with the top event.
+        num_samples (int): The number of trials.
+        num_hits (int): The number of trials with the top event.
+        z_score (float): The standard normal quantile of the confidence level.
+
+    Returns:
+        MonteCarloResult: The estimate with its interval; the relative error is infinite without hits.
+    """
+    p = total / num_samples
+    variance = max(0.0, squares / num_samples - p * p) / max(1, num_samples - 1)
+    half_width = z_score * math.sqrt(variance)
+    relative_error = half_width / p if num_hits else math.inf
+    return MonteCarloResult(p, max(0.0, p - half_width), min(1.0, p + half_width), relative_error,
+                            num_samples, num_hits)
+
+
+def importance_sampling(fault_tree: FaultTree, relative_error: float = 0.01, confidence: float = 0.95,
+                        max_samples: int = 100_000_000, batch_words: int = 1024, seed: Optional[int] = None,
+                        limit_order: Optional[int] = 4, max_cut_sets: int = 1000,
+                        nominal_fraction: float = 0.05) -> MonteCarloResult:
+    """Estimates a rare top event probability with cut set importance sampling.
+
+    Args:
+        fault_tree (FaultTree): The fault tree with basic event probabilities.
+        relative_error (float): The target half-width of the confidence interval relative to the estimate.
+        confidence (float): The confidence level of the interval.
+        max_samples (int): The largest number of trials.
+        batch_words (int): The number of 64-trial words per batch.
+        seed (Optional[int]): The seed of the random generator.
+        limit_order (Optional[int]): The initial order limit of the guiding cut sets, or None for no limit.
+        max_cut_sets (int): The largest number of guiding cut sets.
+        nominal_fraction (float): The fraction of trials sampled from the basic event probabilities.
+
+    Returns:
+        MonteCarloResult: The estimate with its confidence interval.
+
+    Raises:
+        ValueError: If there is no top gate, a gate is malformed, a basic event has no probability,
+            or the nominal fraction is not in ``(0, 1]``.
+        BddNodeBudgetError: If the ZBDD exceeds the node budget.
+    """
+    sampler = ImportanceSampler(fault_tree, limit_order, max_cut_sets, nominal_fraction)
+    return sampler.run(relative_error, confidence, max_samples, batch_words, seed)
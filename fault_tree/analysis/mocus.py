@@ -0,0 +1,350 @@
+"""Top-down MOCUS cut set generation with bitset-encoded partial cut sets.
+
+A partial cut set is a pair of integers used as bitsets: the literals of basic
+events (bit ``2 * i`` for the basic event of index ``i``, and ``2 * i + 1``
+for its complement) and the signed gates still to expand (bit ``2 * g`` for
+gate number ``g``, and ``2 * g + 1`` for its negation). Every signed gate is
+compiled once into its alternatives, e.g. one per argument of an OR gate and a
+single one with all arguments of an AND gate; negated gates use the dual
+alternatives, so NOT and XOR gates are supported as in the ZBDD engine. Wide
+AT-LEAST and XOR gates are compiled through intermediate gates over the suffixes
+of their arguments, the sequential counter and the parity chain of
+:mod:`fault_tree.transform.expand`, so they take a number of alternatives
+linear in their arguments rather than all their combinations or parities.
+
+Gates with a single alternative are absorbed without branching, and sets that
+exceed the order limit or contain both literals of an event are dropped as
+soon as they appear. The parent process expands the sets breadth-first until
+the frontier is wide enough, splits it across a process pool, and merges the
+locally minimized cut sets of the workers with a global minimization. Trees
+whose frontier never gets that wide are expanded without starting the pool.
+"""
+import concurrent.futures
+import os
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from fault_tree import FaultTree
+from fault_tree.io.tables import FaultTreeTables, OPERATORS
+
+# A partial cut set: the literal bitset and the bitset of signed gates to expand.
+PartialCutSet = Tuple[int, int]
+
+_EVEN_BITS_CACHE: Dict[int, int] = {}
+
+
+def order(cut_set: int) -> int:
+    """Returns the number of literals in a cut set bitset."""
+    return bin(cut_set).count("1")
+
+
+def _even_bits(num_bits: int) -> int:
+    """Returns the mask of the even bits below ``num_bits``."""
+    mask = _EVEN_BITS_CACHE.get(num_bits)
+    if mask is None:
+        mask = _EVEN_BITS_CACHE[num_bits] = int("01" * (num_bits // 2 + 1), 2) & ((1 << num_bits) - 1)
+    return mask
+
+
+def minimize_cut_sets(cut_sets: Iterable[int]) -> List[int]:
+    """Removes duplicates and every cut set that has a proper subset among the cut sets.
+
+    The cut sets are taken in the order of size, and each one is checked only
+    against the kept sets whose lowest literal it contains.
+
+    Args:
+        cut_sets (Iterable[int]): The cut set bitsets.
+
+    Returns:
+        List[int]: The minimal cut sets in the order of size.
+    """
+    cut_sets = set(cut_sets)
+    if 0 in cut_sets:  # the empty cut set subsumes all others
+        return [0]
+    kept: List[int] = []
+    by_lowest_bit: Dict[int, List[int]] = {}
+    for cut_set in sorted(cut_sets, key=lambda x: (order(x), x)):
+        remaining = cut_set
+        subsumed = False
+        while remaining and not subsumed:
+            bit = remaining & -remaining
+            remaining ^= bit
+            subsumed = any(x & cut_set == x for x in by_lowest_bit.get(bit, ()))
+        if not subsumed:
+            kept.append(cut_set)
+            by_lowest_bit.setdefault(cut_set & -cut_set, []).append(cut_set)
+    return kept
+
+
+class MocusProgram:
+    """The signed gates of a fault tree compiled into bitset alternatives.
+
+    The program holds only integers, so it is cheap to send to worker processes.
+
+    Attributes:
+        num_basic (int): The number of basic events.
+        limit_order (Optional[int]): The largest order of the cut sets, or None for no limit.
+        top (int): The bit of the top gate.
+        alternatives (Dict[int, List[PartialCutSet]]): The alternatives of every reachable signed gate bit.
+        single_mask (int): The bits of the signed gates with exactly one alternative.
+        dead_mask (int): The bits of the signed gates without alternatives, i.e., constant false.
+    """
+
+    def __init__(self, tables: FaultTreeTables, limit_order: Optional[int] = None):
+        """Compiles the signed gates reachable from the top gate.
+
+        Args:
+            tables (FaultTreeTables): The indexed fault tree.
+            limit_order (Optional[int]): The largest order of the cut sets, or None for no limit.
+
+        Raises:
+            ValueError: If there is no top gate or a gate is malformed.
+        """
+        if tables.top_index < 0:
+            raise ValueError("The fault tree has no top gate")
+        self.num_basic = len(tables.basic_events)
+        self.limit_order = limit_order
+        self.top = 2 * (tables.top_index - tables.gate_offset)
+        self.alternatives: Dict[int, List[PartialCutSet]] = {}
+        self.single_mask = 0
+        self.dead_mask = 0
+        # The intermediate gates of wide XOR and AT-LEAST gates, numbered after the gates of the tables:
+        # the gate, the position of the first argument, the threshold (-1 for XOR), and the sign of the arguments.
+        self._suffixes: List[Tuple[int, int, int, int]] = []
+        self._suffix_numbers: Dict[Tuple[int, int, int, int], int] = {}
+        stack = [self.top]
+        while stack:
+            signed_gate = stack.pop()
+            if signed_gate in self.alternatives:
+                continue
+            alternatives = self._compile(tables, signed_gate >> 1, signed_gate & 1)
+            self.alternatives[signed_gate] = alternatives
+            if not alternatives:
+                self.dead_mask |= 1 << signed_gate
+            elif len(alternatives) == 1:
+                self.single_mask |= 1 << signed_gate
+            for _, gates in alternatives:
+                while gates:
+                    bit = gates & -gates
+                    gates ^= bit
+                    stack.append(bit.bit_length() - 1)
+
+    def _compile(self, tables: FaultTreeTables, gate_number: int, negated: int) -> List[PartialCutSet]:
+        """Returns the alternatives of a signed gate as partial cut sets of its signed arguments."""
+        if gate_number >= len(tables.gates):
+            original, position, k_num, sign = self._suffixes[gate_number - len(tables.gates)]
+            if k_num < 0:
+                signed_products = self._xor_products(tables, original, position, negated)
+            else:
+                signed_products = self._atleast_products(tables, original, position, k_num, sign)
+        else:
+            arguments = tables.children[tables.child_offsets[gate_number]:tables.child_offsets[gate_number + 1]]
+            operator = OPERATORS[tables.operators[gate_number]]
+            num_arguments = len(arguments)
+            if operator == "not":
+                if num_arguments != 1:
+                    raise ValueError(f"NOT gate {tables.gates[gate_number].name} must have exactly one argument")
+                signed_products = [[(arguments[0], negated ^ 1)]]
+            elif operator == "xor":
+                signed_products = self._xor_products(tables, gate_number, 0, negated) if arguments else \
+                    [[]] * negated
+            else:
+                k_num = {"and": num_arguments, "or": 1}.get(operator, tables.k_nums[gate_number])
+                if negated:
+                    k_num = num_arguments - k_num + 1
+                signed_products = self._atleast_products(tables, gate_number, 0, k_num, negated)
+        alternatives = []
+        for signed_product in signed_products:
+            alternative = self._partial_cut_set(tables, signed_product)
+            if alternative is not None:
+                alternatives.append(alternative)
+        return alternatives
+
+    def _suffix(self, tables: FaultTreeTables, gate_number: int, position: int, k_num: int, sign: int) -> int:
+        """Returns the node of an intermediate gate over the arguments of a gate from a position on."""
+        key = (gate_number, position, k_num, sign)
+        number = self._suffix_numbers.get(key)
+        if number is None:
+            number = self._suffix_numbers[key] = len(tables.gates) + len(self._suffixes)
+            self._suffixes.append(key)
+        return tables.gate_offset + number
+
+    def _xor_products(self, tables: FaultTreeTables, gate_number: int, position: int,
+                      negated: int) -> List[List[Tuple[int, int]]]:
+        """Returns the products of the XOR (or, negated, XNOR) of the arguments of a gate from a position on.
+
+        With ``S`` the XOR of the later arguments, ``a ^ S = a * -S + -a * S``, so every
+        argument takes two alternatives instead of all parities of the arguments.
+        """
+        arguments = tables.children[tables.child_offsets[gate_number] + position:tables.child_offsets[gate_number + 1]]
+        if len(arguments) == 1:
+            return [[(arguments[0], negated)]]
+        rest = self._suffix(tables, gate_number, position + 1, -1, 0)
+        return [[(arguments[0], 0), (rest, negated ^ 1)], [(arguments[0], 1), (rest, negated)]]
+
+    def _atleast_products(self, tables: FaultTreeTables, gate_number: int, position: int, k_num: int,
+                          sign: int) -> List[List[Tuple[int, int]]]:
+        """Returns the products of at least ``k_num`` of the arguments of a gate from a position on, all signed.
+
+        AND and OR are the cases ``k = n`` and ``k = 1``. Other thresholds follow the sequential counter
+        ``atleast_k(a, rest) = a * atleast_(k-1)(rest) + atleast_k(rest)`` with intermediate gates,
+        so a gate takes ``O(n k)`` alternatives instead of all ``C(n, k)`` combinations.
+        """
+        arguments = tables.children[tables.child_offsets[gate_number] + position:tables.child_offsets[gate_number + 1]]
+        if k_num <= 0:
+            return [[]]
+        if k_num > len(arguments):
+            return []
+        if k_num == len(arguments):
+            return [[(x, sign) for x in arguments]]
+        if k_num == 1:
+            return [[(x, sign)] for x in arguments]
+        return [[(arguments[0], sign), (self._suffix(tables, gate_number, position + 1, k_num - 1, sign), 0)],
+                [(self._suffix(tables, gate_number, position + 1, k_num, sign), 0)]]
+
+    def _partial_cut_set(self, tables: FaultTreeTables,
+                         signed_product: Sequence[Tuple[int, int]]) -> Optional[PartialCutSet]:
+        """Returns the partial cut set of a product of signed nodes, or None if it is constant false."""
+        literals = gates = 0
+        gate_offset = tables.gate_offset
+        for node, negated in signed_product:
+            if node < self.num_basic:
+                literals |= 1 << (2 * node + negated)
+            elif node < gate_offset:
+                if tables.house_states[node - self.num_basic] == negated:
+                    return None
+            else:
+                gates |= 1 << (2 * (node - gate_offset) + negated)
+        if self.is_contradictory(literals):
+            return None
+        return literals, gates
+
+    def is_contradictory(self, literals: int) -> bool:
+        """Returns whether a literal bitset contains both literals of a basic event."""
+        return bool(literals & (literals >> 1) & _even_bits(2 * self.num_basic))
+
+    def absorb(self, literals: int, gates: int) -> Optional[PartialCutSet]:
+        """Expands the signed gates with a single alternative, and drops contradictory and too large sets.
+
+        Returns:
+            Optional[PartialCutSet]: The partial cut set with only branching gates left, or None if dropped.
+        """
+        alternatives, single_mask = self.alternatives, self.single_mask
+        expanded = 0
+        while gates & single_mask:
+            bit = gates & single_mask
+            bit &= -bit
+            gates ^= bit
+            expanded |= bit
+            alternative_literals, alternative_gates = alternatives[bit.bit_length() - 1][0]
+            literals |= alternative_literals
+            gates |= alternative_gates & ~expanded
+        if gates & self.dead_mask or self.is_contradictory(literals):
+            return None
+        if self.limit_order is not None and order(literals) > self.limit_order:
+            return None
+        return literals, gates
+
+    def branch(self, literals: int, gates: int) -> List[PartialCutSet]:
+        """Expands the lowest branching gate of an absorbed partial cut set into its alternatives."""
+        bit = gates & -gates
+        gates ^= bit
+        return [(literals | x, gates | y) for x, y in self.alternatives[bit.bit_length() - 1]]
+
+    def expand(self, partial_cut_sets: Iterable[PartialCutSet]) -> List[int]:
+        """Expands partial cut sets depth-first into minimal cut sets.
+
+        Args:
+            partial_cut_sets (Iterable[PartialCutSet]): The partial cut sets to expand.
+
+        Returns:
+            List[int]: The minimal cut sets among all the expansions.
+        """
+        cut_sets = set()
+        stack = list(partial_cut_sets)
+        while stack:
+            partial_cut_set = self.absorb(*stack.pop())
+            if partial_cut_set is None:
+                continue
+            if partial_cut_set[1]:
+                stack.extend(self.branch(*partial_cut_set))
+            else:
+                cut_sets.add(partial_cut_set[0])
+        return minimize_cut_sets(cut_sets)
+
+    def split(self, num_partial_cut_sets: int) -> Tuple[List[PartialCutSet], List[int]]:
+        """Expands breadth-first from the top gate until the frontier is wide enough or exhausted.
+
+        Args:
+            num_partial_cut_sets (int): The wanted number of partial cut sets.
+
+        Returns:
+            Tuple[List[PartialCutSet], List[int]]: The frontier of partial cut sets, and the cut sets completed on the way.
+        """
+        frontier: List[PartialCutSet] = [(0, 1 << self.top)]
+        cut_sets: List[int] = []
+        while frontier and len(frontier) < num_partial_cut_sets:
+            next_frontier = []
+            for partial_cut_set in frontier:
+                partial_cut_set = self.absorb(*partial_cut_set)
+                if partial_cut_set is None:
+                    continue
+                if partial_cut_set[1]:
+                    next_frontier.extend(self.branch(*partial_cut_set))
+                else:
+                    cut_sets.append(partial_cut_set[0])
+            frontier = next_frontier
+        return frontier, cut_sets
+
+    def literal_names(self, tables: FaultTreeTables, cut_set: int) -> Tuple[str, ...]:
+        """Returns the basic event names of a cut set bitset, with ``'`` for the complements."""
+        names = []
+        while cut_set:
+            bit = cut_set & -cut_set
+            cut_set ^= bit
+            position = bit.bit_length() - 1
+            name = tables.basic_events[position >> 1].name
+            names.append(name + "'" if position & 1 else name)
+        return tuple(names)
+
+
+def _expand_chunk(program: MocusProgram, partial_cut_sets: List[PartialCutSet]) -> List[int]:
+    """Expands and minimizes one part of the frontier in a worker process."""
+    return program.expand(partial_cut_sets)
+
+
+def mocus(fault_tree: FaultTree, limit_order: Optional[int] = None, max_workers: Optional[int] = None,
+          chunks_per_worker: int = 4) -> List[Tuple[str, ...]]:
+    """Computes the minimal cut sets of a fault tree with MOCUS on a pool of processes.
+
+    CCF groups are not expanded.
+
+    Args:
+        fault_tree (FaultTree): The fault tree.
+        limit_order (Optional[int]): The largest order of the cut sets, as SCRAM ``--limit-order``.
+        max_workers (Optional[int]): The number of worker processes. Defaults to the number of CPUs.
+            No pool is started if the expansion finishes before the frontier is wide enough.
+        chunks_per_worker (int): The number of frontier parts per worker, for load balancing.
+
+    Returns:
+        List[Tuple[str, ...]]: The minimal cut sets in the order of size, as tuples of basic event names;
+        complements end with ``'``.
+
+    Raises:
+        ValueError: If there is no top gate or a gate is malformed.
+    """
+    tables = FaultTreeTables.from_fault_tree(fault_tree)
+    program = MocusProgram(tables, limit_order)
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers == 1:
+        cut_sets = program.expand([(0, 1 << program.top)])
+    else:
+        num_chunks = max_workers * chunks_per_worker
+        frontier, cut_sets = program.split(num_chunks)
+        if frontier:  # trees that never get wide enough are done without a pool
+            chunks = [frontier[i::num_chunks] for i in range(min(num_chunks, len(frontier)))]
+            with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(_expand_chunk, program, chunk) for chunk in chunks]
+                for future in futures:
+                    cut_sets.extend(future.result())
+        cut_sets = minimize_cut_sets(cut_sets)
+    return [program.literal_names(tables, x) for x in cut_sets]
@@ -0,0 +1,131 @@
+"""Linear-time module detection (Dutuit and Rauzy).
+
+A module is a gate whose descendants are reachable from the rest of the tree
+only through it, so its function depends on events that no other part of
+the tree sees. An analysis can solve every module on its own, cache the result,
+and use it as a pseudo-event of the enclosing module.
+
+One depth-first traversal from the top gate stamps every node with the clock
+of its first visit, a gate with the clock of its exit, and every node with
+the clock of its last visit; revisits of shared nodes only update the last
+visit. A second pass in post-order takes, for every gate, the earliest first
+visit and the latest last visit of its descendants. A gate is a module iff
+all its descendants were first visited after it was entered and last visited
+before it was left. House events are constants and do not break modules.
+
+Both passes are iterative and linear in the size of the tree.
+"""
+from collections import namedtuple
+from typing import Dict, List
+
+from fault_tree import FaultTree
+from fault_tree.io.tables import FaultTreeTables
+
+Module = namedtuple('Module', ['gate', 'gates', 'basic_events', 'submodules'])
+
+
+def module_gates(tables: FaultTreeTables) -> List[bool]:
+    """Finds the module gates under the top gate.
+
+    Args:
+        tables (FaultTreeTables): The indexed fault tree.
+
+    Returns:
+        List[bool]: Whether every gate (by gate number) is a module; unreachable gates are not.
+
+    Raises:
+        ValueError: If there is no top gate or the gates form a cycle.
+    """
+    if tables.top_index < 0:
+        raise ValueError("The fault tree has no top gate")
+    num_basic, gate_offset = len(tables.basic_events), tables.gate_offset
+    offsets, children = tables.child_offsets, tables.children
+    first = [0] * tables.num_nodes
+    exit_time = [0] * len(tables.gates)
+    last = [0] * tables.num_nodes
+    post_order: List[int] = []
+    clock = 1
+    top = tables.top_index - gate_offset
+    first[tables.top_index] = clock
+    stack = [[top, offsets[top]]]  # every frame is a gate and the position of its next argument
+    while stack:
+        frame = stack[-1]
+        gate_number, position = frame
+        clock += 1
+        if position == offsets[gate_number + 1]:
+            exit_time[gate_number] = last[gate_offset + gate_number] = clock
+            post_order.append(gate_number)
+            stack.pop()
+            continue
+        frame[1] += 1
+        child = children[position]
+        if num_basic <= child < gate_offset:
+            continue
+        if first[child]:
+            if child >= gate_offset and not exit_time[child - gate_offset]:
+                raise ValueError(f"Gate {tables.gates[child - gate_offset].name} is in a cycle")
+            last[child] = clock
+            continue
+        first[child] = last[child] = clock
+        if child >= gate_offset:
+            stack.append([child - gate_offset, offsets[child - gate_offset]])
+
+    # The earliest first and the latest last visits of the descendants of every gate
+    earliest = [0] * len(tables.gates)
+    latest = [0] * len(tables.gates)
+    modules = [False] * len(tables.gates)
+    for gate_number in post_order:
+        low, high = clock + 1, 0
+        for child in children[offsets[gate_number]:offsets[gate_number + 1]]:
+            if num_basic <= child < gate_offset:
+                continue
+            low, high = min(low, first[child]), max(high, last[child])
+            if child >= gate_offset:
+                low, high = min(low, earliest[child - gate_offset]), max(high, latest[child - gate_offset])
+        earliest[gate_number], latest[gate_number] = low, high
+        modules[gate_number] = first[gate_offset + gate_number] < low and high < exit_time[gate_number]
+    return modules
+
+
+def find_modules(fault_tree: FaultTree) -> Dict[str, Module]:
+    """Finds the module hierarchy under the top gate of a fault tree.
+
+    Args:
+        fault_tree (FaultTree): The fault tree.
+
+    Returns:
+        Dict[str, Module]: The modules by gate name, the top gate first and every module before its submodules.
+        Every module lists its other gates and its basic events outside of submodules, and its submodules.
+
+    Raises:
+        ValueError: If there is no top gate or the gates form a cycle.
+    """
+    tables = FaultTreeTables.from_fault_tree(fault_tree)
+    modules = module_gates(tables)
+    num_basic, gate_offset = len(tables.basic_events), tables.gate_offset
+    offsets, children = tables.child_offsets, tables.children
+    result: Dict[str, Module] = {}
+    seen = bytearray(tables.num_nodes)
+    order = [tables.top_index - gate_offset]
+    seen[tables.top_index] = 1
+    for module in order:  # grows with the submodules found
+        gates, basic_events, submodules = [], [], []
+        stack = [module]
+        while stack:
+            gate_number = stack.pop()
+            for child in children[offsets[gate_number]:offsets[gate_number + 1]]:
+                if child < num_basic:
+                    if not seen[child]:
+                        seen[child] = 1
+                        basic_events.append(tables.basic_events[child].name)
+                elif child >= gate_offset and not seen[child]:
+                    seen[child] = 1
+                    if modules[child - gate_offset]:
+                        submodules.append(tables.gates[child - gate_offset].name)
+                        order.append(child - gate_offset)
+                    else:
+                        gates.append(tables.gates[child - gate_offset].name)
+                        stack.append(child - gate_offset)
+        name = tables.gates[module].name
+        result[name] = Module(name, gates, basic_events, submodules)
+    return result
@@ -0,0 +1,215 @@
+"""Bit-parallel Monte Carlo estimation of the top event probability.
+
+Every node gets a bit-plane: a ``uint64`` array whose bit ``j`` of word ``w``
+is the value of the node in trial ``64 * w + j``. Basic events are sampled from
+their probabilities into packed planes, and the compiled program of the top
+gate (:mod:`fault_tree.analysis.program`) evaluates the gates with whole-array
+bitwise operations, so one NumPy call handles 64 trials per machine word of
+many gates at once.
+
+Trials run in batches until the estimate reaches the target relative error
+at the requested confidence, or the sample limit is hit.
+"""
+import math
+from collections import namedtuple
+from statistics import NormalDist
+from typing import Optional
+
+import numpy as np
+
+from fault_tree import FaultTree
+from fault_tree.analysis.program import Program
+from fault_tree.io.tables import FaultTreeTables
+
+MonteCarloResult = namedtuple('MonteCarloResult', ['probability', 'lower', 'upper', 'relative_error',
+                                                   'num_samples', 'num_hits'])
+
+# Uniform draws held in memory at once while sampling basic events.
+_MAX_DRAWS = 1 << 22
+
+# Events less likely than this are sampled by the gaps between occurrences.
+_RARE_PROBABILITY = 0.125
+
+_ALL_ONES = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+def _num_gaps(num_trials: int, probability: float) -> int:
+    """Returns the number of geometric gaps that almost surely cover the trials."""
+    expected = num_trials * probability
+    return int(expected + 6 * math.sqrt(expected) + 16)
+
+
+def popcount(plane: np.ndarray) -> int:
+    """Returns the number of set bits in a bit-plane."""
+    if hasattr(np, 'bitwise_count'):
+        return int(np.bitwise_count(plane).sum())
+    return int(np.unpackbits(plane.view(np.uint8)).sum())
+
+
+class BitParallelSimulator:
+    """Evaluates the top gate of a fault tree on packed bit-planes of trials.
+
+    CCF groups are not expanded; basic events are sampled independently.
+
+    Attributes:
+        tables (FaultTreeTables): The indexed fault tree.
+        program (Program): The compiled top gate.
+        probabilities (np.ndarray): The probabilities of the basic events.
+    """
+
+    def __init__(self, fault_tree: FaultTree):
+        """Indexes the fault tree and plans the evaluation.
+
+        Args:
+            fault_tree (FaultTree): The fault tree with basic event probabilities.
+
+        Raises:
+            ValueError: If there is no top gate, a gate is malformed, or a basic event has no probability.
+        """
+        self.tables = tables = FaultTreeTables.from_fault_tree(fault_tree)
+        self.program = program = Program(tables)
+        self.probabilities = np.frombuffer(tables.probabilities, dtype=np.float64).copy()
+        self._needed = np.zeros(len(tables.basic_events), dtype=bool)
+        self._needed[program.args[program.args < program.num_basic]] = True
+        if program.output < program.num_basic:
+            self._needed[program.output] = True
+        missing = np.flatnonzero(self._needed & np.isnan(self.probabilities))
+        if len(missing):
+            raise ValueError(f"Basic event {tables.basic_events[missing[0]].name} has no probability")
+
+    def sample(self, num_words: int, rng: np.random.Generator) -> np.ndarray:
+        """Samples the basic events into bit-planes.
+
+        Likely events compare uniform draws with their probabilities. Rare events
+        draw only the geometric gaps between their occurrences, which costs time
+        in proportion to the number of occurrences rather than of trials.
+
+        Args:
+            num_words (int): The number of 64-trial words per plane.
+            rng (np.random.Generator): The source of randomness.
+
+        Returns:
+            np.ndarray: The ``(num_basic, num_words)`` planes of the basic events; unused events are zero.
+        """
+        num_trials = 64 * num_words
+        probabilities = self.probabilities
+        planes = np.zeros((len(probabilities), num_words), dtype=np.uint64)
+        events = np.flatnonzero(self._needed & (probabilities > 0))
+        planes[events[probabilities[events] >= 1]] = _ALL_ONES
+        events = events[probabilities[events] < 1]
+        likely = events[probabilities[events] >= _RARE_PROBABILITY]
+        rows = max(1, _MAX_DRAWS // num_trials)
+        for start in range(0, len(likely), rows):
+            chunk = likely[start:start + rows]
+            bits = rng.random((len(chunk), num_trials)) < probabilities[chunk, None]
+            planes[chunk] = np.packbits(bits, axis=1, bitorder='little').view(np.uint64)
+        rare = events[probabilities[events] < _RARE_PROBABILITY]
+        rare = rare[np.argsort(probabilities[rare], kind='stable')]
+        rare_probabilities = probabilities[rare]
+        start = 0
+        while start < len(rare):
+            # Chunks of events within a factor of two in probability waste few gaps
+            stop = min(int(np.searchsorted(rare_probabilities, 2 * rare_probabilities[start], side='right')),
+                       start + max(1, _MAX_DRAWS // _num_gaps(num_trials, 2 * rare_probabilities[start])),
+                       start + rows)
+            chunk = rare[start:stop]
+            # Enough gaps to pass the end of the planes in all but rare cases, for the likeliest event of the chunk
+            num_gaps = _num_gaps(num_trials, rare_probabilities[stop - 1])
+            scales = -1 / np.log1p(-rare_probabilities[start:stop, None])
+            # floor(E / -log(1 - p)) + 1 of a standard exponential E is geometric with success probability p.
+            positions = np.floor(rng.standard_exponential((len(chunk), num_gaps)) * scales)
+            positions = np.cumsum(positions, axis=1) + np.arange(num_gaps)  # the sums of the gaps minus one
+            positions += (np.arange(len(chunk)) * num_trials)[:, None]
+            ends = (np.arange(1, len(chunk) + 1) * num_trials)[:, None]
+            flat_positions = [positions[positions < ends].astype(np.int64)]
+            for row in np.flatnonzero(positions[:, -1] < ends[:, 0]):  # continue the unfinished rows
+                position = positions[row, -1]
+                while True:
+                    position += np.floor(rng.standard_exponential() * scales[row, 0]) + 1
+                    if position >= ends[row, 0]:
+                        break
+                    flat_positions.append(np.array([position], dtype=np.int64))
+            bits = np.zeros(len(chunk) * num_trials, dtype=bool)
+            bits[np.concatenate(flat_positions)] = True
+            planes[chunk] = np.packbits(bits.reshape(len(chunk), num_trials), axis=1,
+                                        bitorder='little').view(np.uint64)
+            start = stop
+        return planes
+
+    def evaluate(self, basic_planes: np.ndarray) -> np.ndarray:
+        """Evaluates the top gate on the planes of the basic events.
+
+        Args:
+            basic_planes (np.ndarray): The ``(num_basic, num_words)`` planes of the basic events.
+
+        Returns:
+            np.ndarray: The plane of the top gate.
+        """
+        return self.program.run(basic_planes)
+
+    def run(self, relative_error: float = 0.01, confidence: float = 0.95, max_samples: int = 100_000_000,
+            batch_words: int = 1024, seed: Optional[int] = None) -> MonteCarloResult:
+        """Samples batches of trials until the estimate is precise enough.
+
+        Args:
+            relative_error (float): The target half-width of the confidence interval relative to the estimate.
+            confidence (float): The confidence level of the interval.
+            max_samples (int): The largest number of trials.
+            batch_words (int): The number of 64-trial words per batch.
+            seed (Optional[int]): The seed of the random generator.
+
+        Returns:
+            MonteCarloResult: The estimate, the Wilson score interval, the achieved relative error,
+            and the numbers of trials and top event occurrences.
+        """
+        rng = np.random.default_rng(seed)
+        z_score = NormalDist().inv_cdf(0.5 + confidence / 2)
+        num_samples = num_hits = 0
+        while True:
+            num_hits += popcount(self.evaluate(self.sample(batch_words, rng)))
+            num_samples += 64 * batch_words
+            result = estimate(num_hits, num_samples, z_score)
+            if result.relative_error <= relative_error or num_samples + 64 * batch_words > max_samples:
+                return result
+
+
+def estimate(num_hits: int, num_samples: int, z_score: float) -> MonteCarloResult:
+    """Computes the estimate and the Wilson score interval from the trial counts.
+
+    Args:
+        num_hits (int): The number of trials with the top event.
+        num_samples (int): The number of trials.
+        z_score (float): The standard normal quantile of the confidence level.
+
+    Returns:
+        MonteCarloResult: The estimate with its interval; the relative error is infinite without hits.
+    """
+    p = num_hits / num_samples
+    z2 = z_score * z_score
+    center = (p + z2 / (2 * num_samples)) / (1 + z2 / num_samples)
+    half_width = z_score * math.sqrt(p * (1 - p) / num_samples + z2 / (4 * num_samples ** 2)) / (1 + z2 / num_samples)
+    relative_error = z_score * math.sqrt(p * (1 - p) / num_samples) / p if num_hits else math.inf
+    return MonteCarloResult(p, max(0.0, center - half_width), min(1.0, center + half_width), relative_error,
+                            num_samples, num_hits)
+
+
+def monte_carlo(fault_tree: FaultTree, relative_error: float = 0.01, confidence: float = 0.95,
+                max_samples: int = 100_000_000, batch_words: int = 1024,
+                seed: Optional[int] = None) -> MonteCarloResult:
+    """Estimates the top event probability of a fault tree with bit-parallel Monte Carlo.
+
+    Args:
+        fault_tree (FaultTree): The fault tree with basic event probabilities.
+        relative_error (float): The target half-width of the confidence interval relative to the estimate.
+        confidence (float): The confidence level of the interval.
+        max_samples (int): The largest number of trials.
+        batch_words (int): The number of 64-trial words per batch.
+        seed (Optional[int]): The seed of the random generator.
+
+    Returns:
+        MonteCarloResult: The estimate with its confidence interval.
+
+    Raises:
+        ValueError: If there is no top gate, a gate is malformed, or a basic event has no probability.
+    """
+    return BitParallelSimulator(fault_tree).run(relative_error, confidence, max_samples, batch_words, seed)
@@ -0,0 +1,254 @@
+"""Flat register programs compiled from fault trees.
+
+A program evaluates the top gate over whole vectors of inputs at once. Its
+registers are rows of one array: registers ``0..num_basic-1`` hold the basic
+events, the next two the constants FALSE and TRUE (house events and folded
+gates refer to them), and the rest the gate values. Every instruction has an
+integer opcode (the codes of ``OPERATORS``), a target register, a CSR slice
+of argument registers, and a precomputed threshold for AT-LEAST gates.
+
+Compilation folds degenerate gates into constants (empty arguments,
+impossible or trivial AT-LEAST thresholds, NOT of a constant), lets
+single-argument AND/OR/XOR gates pass their argument through, and turns
+AT-LEAST gates with ``k = 1`` or ``k = n`` into OR and AND gates. The
+instructions are then grouped by their depth in the DAG, and within a depth by
+opcode, arity, and threshold, so that every block of instructions runs as one
+NumPy gather of a ``(gates, arity, ...)`` argument array and one reduction
+over its arity axis. Registers are reused once the values in them are dead.
+
+Programs run over boolean arrays or packed ``uint64`` bit-planes with bitwise
+kernels, and over probability arrays under the assumption that the arguments
+of every gate are independent.
+"""
+import heapq
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from fault_tree import FaultTree
+from fault_tree.io.tables import FaultTreeTables, OPERATOR_CODES
+
+AND = OPERATOR_CODES["and"]
+OR = OPERATOR_CODES["or"]
+ATLEAST = OPERATOR_CODES["atleast"]
+NOT = OPERATOR_CODES["not"]
+XOR = OPERATOR_CODES["xor"]
+
+
+class Program:
+    """A flat register program of the top gate of a fault tree.
+
+    Attributes:
+        tables (FaultTreeTables): The indexed fault tree; the inputs follow its basic event order.
+        num_basic (int): The number of input registers, one per basic event.
+        num_registers (int): The number of registers.
+        output (int): The register of the top gate.
+        opcodes (np.ndarray): The operator code of every instruction.
+        targets (np.ndarray): The target register of every instruction.
+        thresholds (np.ndarray): The k number of every AT-LEAST instruction, 0 for other instructions.
+        arg_offsets (np.ndarray): The CSR offsets of the instruction arguments.
+        args (np.ndarray): The argument registers of the instructions.
+        blocks (List[Tuple[int, int]]): The ranges of instructions with equal depth, opcode, arity,
+            and threshold, each executed as one vectorized step.
+    """
+
+    def __init__(self, tables: FaultTreeTables):
+        """Compiles the top gate of indexed fault tree tables.
+
+        Args:
+            tables (FaultTreeTables): The indexed fault tree.
+
+        Raises:
+            ValueError: If there is no top gate, a NOT gate does not have exactly one argument,
+                or the gates form a cycle.
+        """
+        if tables.top_index < 0:
+            raise ValueError("The fault tree has no top gate")
+        self.tables = tables
+        self.num_basic = num_basic = len(tables.basic_events)
+        false, true = num_basic, num_basic + 1
+        gate_offset = tables.gate_offset
+        offsets, children = tables.child_offsets, tables.children
+
+        # The register of every node value, with temporary registers for the instructions.
+        sources: List[int] = list(range(num_basic)) + [true if x else false for x in tables.house_states]
+        sources.extend([-1] * len(tables.gates))
+        depths: Dict[int, int] = {}  # the depth of the value in every register of an instruction
+        instructions: List[Tuple[int, int, int, Tuple[int, ...], int]] = []  # depth, opcode, k, args, target
+        next_register = num_basic + 2
+        for gate_number in tables.topological_order([tables.top_index - gate_offset]):
+            arguments = tuple(sources[x] for x in children[offsets[gate_number]:offsets[gate_number + 1]])
+            opcode = tables.operators[gate_number]
+            num_arguments = len(arguments)
+            k_num = tables.k_nums[gate_number]
+            if opcode == NOT:
+                if num_arguments != 1:
+                    raise ValueError(f"NOT gate {tables.gates[gate_number].name} must have exactly one argument")
+                if arguments[0] in (false, true):
+                    sources[gate_offset + gate_number] = false + true - arguments[0]
+                    continue
+            elif opcode == ATLEAST:
+                if k_num <= 0:
+                    sources[gate_offset + gate_number] = true
+                    continue
+                if k_num > num_arguments:
+                    sources[gate_offset + gate_number] = false
+                    continue
+                opcode = OR if k_num == 1 else AND if k_num == num_arguments else ATLEAST
+            if opcode != ATLEAST:
+                k_num = 0
+                if not num_arguments:
+                    sources[gate_offset + gate_number] = true if opcode == AND else false
+                    continue
+                if num_arguments == 1 and opcode != NOT:
+                    sources[gate_offset + gate_number] = arguments[0]
+                    continue
+            depth = 1 + max(depths.get(x, 0) for x in arguments)
+            register = next_register
+            next_register += 1
+            depths[register] = depth
+            sources[gate_offset + gate_number] = register
+            instructions.append((depth, opcode, k_num, arguments, register))
+        instructions.sort(key=lambda x: (x[0], x[1], len(x[3]), x[2]))
+
+        # The temporary registers are renamed so that values share registers once they are dead,
+        # which is after all instructions of the depth of their last use have run.
+        top = sources[tables.top_index]
+        expiring: Dict[int, List[int]] = {}
+        last_use: Dict[int, int] = {}
+        for depth, _, _, arguments, _ in instructions:
+            for argument in arguments:
+                if argument in depths:
+                    last_use[argument] = depth
+        for register, depth in last_use.items():
+            if register != top:
+                expiring.setdefault(depth, []).append(register)
+        names: Dict[int, int] = {x: x for x in range(num_basic + 2)}
+        free: List[int] = []
+        num_registers = num_basic + 2
+        for depth, _, _, _, register in instructions:
+            for dead in expiring.pop(depth - 1, []):
+                heapq.heappush(free, names[dead])
+            if free:
+                names[register] = heapq.heappop(free)
+            else:
+                names[register] = num_registers
+                num_registers += 1
+        self.num_registers = num_registers
+        self.output = names[top]
+
+        self.opcodes = np.array([x[1] for x in instructions], dtype=np.int8)
+        self.thresholds = np.array([x[2] for x in instructions], dtype=np.int64)
+        self.targets = np.array([names[x[4]] for x in instructions], dtype=np.int64)
+        self.arg_offsets = np.zeros(len(instructions) + 1, dtype=np.int64)
+        np.cumsum([len(x[3]) for x in instructions], out=self.arg_offsets[1:])
+        self.args = np.array([names[a] for x in instructions for a in x[3]], dtype=np.int64)
+        self.blocks: List[Tuple[int, int]] = []
+        for i, instruction in enumerate(instructions):
+            if not i or (instruction[:3] + (len(instruction[3]),)
+                         != instructions[i - 1][:3] + (len(instructions[i - 1][3]),)):
+                self.blocks.append((i, i + 1))
+            else:
+                self.blocks[-1] = (self.blocks[-1][0], i + 1)
+
+    @staticmethod
+    def from_fault_tree(fault_tree: FaultTree) -> 'Program':
+        """Indexes and compiles the top gate of a fault tree.
+
+        Args:
+            fault_tree (FaultTree): The fault tree.
+
+        Returns:
+            Program: The compiled program.
+
+        Raises:
+            ValueError: If there is no top gate, a gate is malformed, or the gates form a cycle.
+        """
+        return Program(FaultTreeTables.from_fault_tree(fault_tree))
+
+    @property
+    def num_instructions(self) -> int:
+        """The number of instructions."""
+        return len(self.opcodes)
+
+    def _block(self, registers: np.ndarray, start: int, stop: int) -> Tuple[int, int, np.ndarray]:
+        """Gathers the ``(gates, arity, ...)`` arguments of a block of instructions."""
+        first, last = self.arg_offsets[start], self.arg_offsets[stop]
+        arguments = self.args[first:last].reshape(stop - start, -1)
+        return int(self.opcodes[start]), int(self.thresholds[start]), registers[arguments]
+
+    def run(self, inputs: np.ndarray) -> np.ndarray:
+        """Evaluates the top gate on boolean or packed bit-plane inputs.
+
+        Args:
+            inputs (np.ndarray): The ``(num_basic, ...)`` values of the basic events,
+                booleans or unsigned integer bit-planes.
+
+        Returns:
+            np.ndarray: The values of the top gate.
+        """
+        inputs = np.asarray(inputs)
+        registers = np.empty((self.num_registers,) + inputs.shape[1:], dtype=inputs.dtype)
+        registers[:self.num_basic] = inputs
+        registers[self.num_basic] = 0
+        registers[self.num_basic + 1] = ~registers[self.num_basic]
+        for start, stop in self.blocks:
+            opcode, k_num, arguments = self._block(registers, start, stop)
+            if opcode == NOT:
+                result = ~arguments[:, 0]
+            elif opcode == AND:
+                result = np.bitwise_and.reduce(arguments, axis=1)
+            elif opcode == OR:
+                result = np.bitwise_or.reduce(arguments, axis=1)
+            elif opcode == XOR:
+                result = np.bitwise_xor.reduce(arguments, axis=1)
+            else:
+                # counts[j] holds the values where at least j of the arguments seen so far hold.
+                counts = [~np.zeros_like(arguments[:, 0])] + [np.zeros_like(arguments[:, 0])] * k_num
+                num_arguments = arguments.shape[1]
+                for i in range(1, num_arguments + 1):
+                    low = max(1, k_num - (num_arguments - i))  # cells that can no longer reach k are dropped
+                    for j in range(min(i, k_num), low - 1, -1):
+                        counts[j] = counts[j] | (counts[j - 1] & arguments[:, i - 1])
+                result = counts[k_num]
+            registers[self.targets[start:stop]] = result
+        return registers[self.output].copy()
+
+    def probability(self, probabilities: np.ndarray) -> np.ndarray:
+        """Propagates probabilities through the gates, taking the arguments of every gate as independent.
+
+        The result is exact when no event or gate is shared between the arguments of a gate,
+        and an approximation otherwise; the BDD gives exact probabilities of any structure.
+
+        Args:
+            probabilities (np.ndarray): The ``(num_basic, ...)`` probabilities of the basic events,
+                e.g., one column per sample.
+
+        Returns:
+            np.ndarray: The probabilities of the top gate.
+        """
+        probabilities = np.asarray(probabilities, dtype=np.float64)
+        registers = np.empty((self.num_registers,) + probabilities.shape[1:], dtype=np.float64)
+        registers[:self.num_basic] = probabilities
+        registers[self.num_basic] = 0.0
+        registers[self.num_basic + 1] = 1.0
+        for start, stop in self.blocks:
+            opcode, k_num, arguments = self._block(registers, start, stop)
+            if opcode == NOT:
+                result = 1 - arguments[:, 0]
+            elif opcode == AND:
+                result = np.prod(arguments, axis=1)
+            elif opcode == OR:
+                result = 1 - np.prod(1 - arguments, axis=1)
+            elif opcode == XOR:
+                result = (1 - np.prod(1 - 2 * arguments, axis=1)) / 2
+            else:
+                # counts[j] is the probability that at least j of the arguments seen so far hold.
+                counts = [np.ones_like(arguments[:, 0])] + [np.zeros_like(arguments[:, 0])] * k_num
+                for i in range(1, arguments.shape[1] + 1):
+                    p = arguments[:, i - 1]
+                    for j in range(min(i, k_num), 0, -1):
+                        counts[j] = counts[j] * (1 - p) + counts[j - 1] * p
+                result = counts[k_num]
+            registers[self.targets[start:stop]] = result
+        return registers[self.output].copy()
@@ -0,0 +1,156 @@
+"""Mergeable streaming quantile sketches (t-digest).
+
+A t-digest summarizes a stream of values by weighted centroids, small near
+the tails and larger in the middle of the distribution. Centroids are formed
+by binning the sorted values on the ``k1`` scale function
+
+    k(q) = delta / (2 * pi) * asin(2 * q - 1),
+
+so that every centroid (other than single values) spans at most one unit of
+``k``. Since ``dq/dk = 2 * pi * sqrt(q * (1 - q)) / delta``, a centroid around the
+quantile ``q`` holds at most ``2 * pi * sqrt(q * (1 - q)) / delta + 2 * pi^2 / delta^2``
+of all values, and interpolating between centroid centers bounds the rank error
+of a quantile estimate by half of that:
+
+    |rank error| / n <= pi * sqrt(q * (1 - q)) / delta + (pi / delta)^2,
+
+e.g., 0.8% of the values at the median and 0.18% at the 1st and 99th percentiles
+with the default ``delta = 200``; the typical error is several times smaller.
+The digest keeps about ``delta / 2`` centroids regardless of the number of values,
+and merging digests obeys the same bound.
+
+Values are buffered and compressed in vectorized batches.
+"""
+import math
+from typing import Optional, Sequence, Union
+
+import numpy as np
+
+
+class TDigest:
+    """Streaming quantile sketch with bounded memory.
+
+    Attributes:
+        compression (float): The ``delta`` parameter; larger values keep more centroids and are more accurate.
+        means (np.ndarray): The means of the centroids in ascending order.
+        weights (np.ndarray): The weights of the centroids.
+        minimum (float): The smallest value seen.
+        maximum (float): The largest value seen.
+    """
+
+    def __init__(self, compression: float = 200, buffer_size: Optional[int] = None):
+        """Initializes an empty digest.
+
+        Args:
+            compression (float): The ``delta`` parameter of the scale function.
+            buffer_size (Optional[int]): The number of values buffered before compression.
+                Defaults to ``50 * compression``.
+
+        Raises:
+            ValueError: If the compression is not positive.
+        """
+        if compression <= 0:
+            raise ValueError("The compression of a t-digest must be positive")
+        self.compression = compression
+        self.buffer_size = buffer_size or int(50 * compression)
+        self.means = np.empty(0, dtype=np.float64)
+        self.weights = np.empty(0, dtype=np.float64)
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self._buffer = []
+        self._buffered = 0
+
+    @property
+    def count(self) -> float:
+        """The total weight of the values added."""
+        return float(self.weights.sum()) + self._buffered
+
+    def __len__(self) -> int:
+        return int(self.count)
+
+    def add(self, values: Union[float, Sequence[float], np.ndarray], weights: Optional[np.ndarray] = None):
+        """Adds values to the digest.
+
+        Args:
+            values (Union[float, Sequence[float], np.ndarray]): The values; NaNs are ignored.
+            weights (Optional[np.ndarray]): The weights of the values; defaults to one each.
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        weights = np.ones_like(values) if weights is None else np.asarray(weights, dtype=np.float64).ravel()
+        valid = ~np.isnan(values)
+        values, weights = values[valid], weights[valid]
+        if not len(values):
+            return
+        self.minimum = min(self.minimum, float(values.min()))
+        self.maximum = max(self.maximum, float(values.max()))
+        self._buffer.append((values, weights))
+        self._buffered += float(weights.sum())
+        if sum(len(x) for x, _ in self._buffer) >= self.buffer_size:
+            self.compress()
+
+    def merge(self, other: 'TDigest') -> 'TDigest':
+        """Merges another digest into this one.
+
+        Args:
+            other (TDigest): The digest to merge; it is not modified.
+
+        Returns:
+            TDigest: This digest.
+        """
+        other.compress()
+        if len(other.means):
+            self.minimum = min(self.minimum, other.minimum)
+            self.maximum = max(self.maximum, other.maximum)
+            self._buffer.append((other.means, other.weights))
+            self._buffered += float(other.weights.sum())
+        self.compress()
+        return self
+
+    def compress(self):
+        """Merges the buffered values into the centroids."""
+        if not self._buffer:
+            return
+        means = np.concatenate([self.means] + [x for x, _ in self._buffer])
+        weights = np.concatenate([self.weights] + [w for _, w in self._buffer])
+        self._buffer = []
+        self._buffered = 0
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+        total = weights.sum()
+        cumulative = np.cumsum(weights)
+        # Every centroid gets the k bin of the midpoint of its quantile range.
+        q = np.clip((cumulative - weights / 2) / total, 0.0, 1.0)
+        bins = np.floor(self.compression / (2 * math.pi) * np.arcsin(2 * q - 1))
+        starts = np.flatnonzero(np.concatenate(([True], bins[1:] != bins[:-1])))
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+
+    def quantile(self, q: Union[float, Sequence[float], np.ndarray]) -> Union[float, np.ndarray]:
+        """Estimates quantiles by interpolating between the centroid centers.
+
+        Args:
+            q (Union[float, Sequence[float], np.ndarray]): Quantile levels in ``[0, 1]``.
+
+        Returns:
+            Union[float, np.ndarray]: The estimates, NaN for an empty digest.
+        """
+        self.compress()
+        levels = np.asarray(q, dtype=np.float64)
+        if not len(self.means):
+            result = np.full_like(levels, math.nan)
+        else:
+            total = self.weights.sum()
+            centers = np.cumsum(self.weights) - self.weights / 2
+            positions = np.concatenate(([0.0], centers, [total]))
+            values = np.concatenate(([self.minimum], self.means, [self.maximum]))
+            result = np.interp(levels * total, positions, values)
+        return float(result) if result.ndim == 0 else result
+
+    def percentile(self, p: Union[float, Sequence[float], np.ndarray]) -> Union[float, np.ndarray]:
+        """Estimates percentiles, i.e., quantiles of levels in percent."""
+        return self.quantile(np.asarray(p, dtype=np.float64) / 100)
+
+    def mean(self) -> float:
+        """Returns the exact mean of the values added."""
+        self.compress()
+        return float(np.dot(self.means, self.weights) / self.weights.sum()) if len(self.means) else math.nan
@@ -0,0 +1,147 @@
+"""Exhaustive truth tables of small fault trees.
+
+Assignment ``m`` of the ``n`` basic events under the top gate sets event ``i``
+iff bit ``i`` of ``m`` is set. Every event gets the packed ``uint64`` truth
+table of its variable over all ``2^n`` assignments: a constant word pattern for
+the first six variables and whole words of ones and zeros for the others. The
+compiled program of the top gate (:mod:`fault_tree.analysis.program`)
+evaluates the gates bitwise over the tables, in chunks of words that keep the
+registers in bounded memory.
+
+The exact probability sums the weights of the true assignments, with the
+weights of the low and the high variables of an assignment tabulated separately.
+The minimal cut sets are the true assignments without a true proper subset; a
+subset-closure (zeta) transform marks the assignments above a true one with one
+pass per variable. For non-coherent trees they are the minimal failure states:
+the minimal sets of failed events that cause the top event when all other
+events work.
+
+Tables take ``2^n / 8`` bytes, so the engine is meant for trees of about 25
+events, where it is an exact oracle for the other engines.
+"""
+import math
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from fault_tree import FaultTree
+from fault_tree.analysis.program import Program
+
+# The truth tables of the first six variables within a word
+_PATTERNS = tuple(np.uint64(sum(1 << m for m in range(64) if m >> i & 1)) for i in range(6))
+
+# Register words held in memory at once while evaluating the gates.
+_MAX_WORDS = 1 << 23
+
+# Variables whose assignment weights are tabulated together.
+_LOW_VARIABLES = 16
+
+
+class TruthTable:
+    """The truth table of the top gate over all assignments of its basic events.
+
+    Attributes:
+        program (Program): The compiled top gate.
+        variables (List[int]): The basic event indices of the variables, one per assignment bit.
+        table (np.ndarray): The packed ``uint64`` truth table of the top gate.
+    """
+
+    def __init__(self, fault_tree: FaultTree, max_events: int = 25):
+        """Evaluates the top gate over all assignments of its basic events.
+
+        Args:
+            fault_tree (FaultTree): The fault tree.
+            max_events (int): The largest number of basic events under the top gate.
+
+        Raises:
+            ValueError: If there is no top gate, a gate is malformed, or there are too many basic events.
+        """
+        self.program = program = Program.from_fault_tree(fault_tree)
+        inputs = np.concatenate([program.args, [program.output]])
+        self.variables: List[int] = sorted(set(int(x) for x in inputs[inputs < program.num_basic]))
+        num_vars = len(self.variables)
+        if num_vars > max_events:
+            raise ValueError(f"The top gate has {num_vars} basic events; truth tables are limited to {max_events}")
+        num_words = max(1, (1 << num_vars) >> 6)
+        chunk = 1 << max(0, (_MAX_WORDS // program.num_registers).bit_length() - 1)
+        self.table = np.empty(num_words, dtype=np.uint64)
+        for start in range(0, num_words, chunk):
+            words = np.arange(start, min(num_words, start + chunk), dtype=np.uint64)
+            planes = np.zeros((program.num_basic, len(words)), dtype=np.uint64)
+            for i, event in enumerate(self.variables):
+                planes[event] = _PATTERNS[i] if i < 6 else (words >> np.uint64(i - 6) & np.uint64(1)) * ~np.uint64(0)
+            self.table[start:start + len(words)] = program.run(planes)
+        if num_vars < 6:
+            self.table &= np.uint64((1 << (1 << num_vars)) - 1)
+
+    @property
+    def num_vars(self) -> int:
+        """The number of variables."""
+        return len(self.variables)
+
+    def bits(self, table: Optional[np.ndarray] = None) -> np.ndarray:
+        """Unpacks a packed table into one boolean per assignment; defaults to the top gate table."""
+        table = self.table if table is None else table
+        return np.unpackbits(table.view(np.uint8), bitorder='little')[:1 << self.num_vars].astype(bool)
+
+    def count(self) -> int:
+        """Returns the number of assignments where the top event occurs."""
+        return int(self.bits().sum())
+
+    def probability(self, probabilities: Optional[Sequence[float]] = None) -> float:
+        """Computes the exact top event probability.
+
+        Args:
+            probabilities (Optional[Sequence[float]]): The probability of every variable;
+                defaults to the basic event probabilities (lognormal means).
+
+        Returns:
+            float: The top event probability.
+
+        Raises:
+            ValueError: If a basic event has no probability.
+        """
+        if probabilities is None:
+            probabilities = [self.program.tables.probabilities[x] for x in self.variables]
+            for event, value in zip(self.variables, probabilities):
+                if math.isnan(value):
+                    raise ValueError(f"Basic event {self.program.tables.basic_events[event].name} has no probability")
+        num_low = min(self.num_vars, _LOW_VARIABLES)
+        low = _weights(probabilities[:num_low])
+        high = _weights(probabilities[num_low:])
+        bits = self.bits().reshape(len(high), len(low))
+        rows = max(1, (1 << 22) // len(low))
+        return float(sum(high[i:i + rows] @ (bits[i:i + rows] @ low) for i in range(0, len(high), rows)))
+
+    def minimal_cut_sets(self) -> List[Tuple[str, ...]]:
+        """Returns the true assignments without a true proper subset as tuples of basic event names.
+
+        Returns:
+            List[Tuple[str, ...]]: The minimal cut sets by order, then by assignment.
+        """
+        closure = self.table.copy()
+        above = np.zeros_like(closure)  # the assignments with a true proper subset
+        # After variable i, the closure of an assignment covers its subsets that differ in variables up to i.
+        for i in range(self.num_vars):
+            if i < 6:
+                shift = np.uint64(1 << i)
+                up = (closure & ~_PATTERNS[i]) << shift
+                closure |= up
+                above |= up
+            else:
+                stride = 1 << (i - 6)
+                blocks = closure.reshape(-1, 2, stride)
+                blocks[:, 1] |= blocks[:, 0]
+                above.reshape(-1, 2, stride)[:, 1] |= blocks[:, 0]
+        assignments = np.flatnonzero(self.bits(self.table & ~above))
+        names = [self.program.tables.basic_events[x].name for x in self.variables]
+        cut_sets = [tuple(names[i] for i in range(self.num_vars) if m >> i & 1) for m in assignments.tolist()]
+        return sorted(cut_sets, key=len)
+
+
+def _weights(probabilities: Sequence[float]) -> np.ndarray:
+    """Returns the probability of every assignment of independent variables, the first variable lowest."""
+    weights = np.ones(1)
+    for p in probabilities:
+        weights = np.concatenate([weights * (1 - p), weights * p])
+    return weights
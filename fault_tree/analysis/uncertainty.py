@@ -0,0 +1,375 @@
+"""Uncertainty propagation of lognormal basic event probabilities.
+
+A lognormal probability with mean ``m`` and error factor ``EF`` at the
+percentile ``q`` has the parameters of the underlying normal distribution
+
+    sigma = ln(EF) / z(q),    mu = ln(m) - sigma^2 / 2,
+
+where ``z`` is the standard normal quantile. The parameters are converted once,
+and every batch draws a whole ``(num_events, batch_size)`` matrix of
+probabilities, clipped to ``[0, 1]``. Point estimates stay constant.
+
+Batches are either simple random samples or Latin hypercube samples: every
+event gets one draw from each of the ``batch_size`` equiprobable strata of its
+distribution, and the strata of different events are paired by independent
+random permutations. The stratified marginals make percentile estimates
+converge with far fewer top event evaluations.
+
+The top event is quantified exactly for all samples of a batch in one pass
+over the nodes of its BDD, with every node probability an array over the samples.
+
+Runs may be split over a pool of processes with independent random streams.
+Every part streams its samples into a mergeable t-digest and running moments,
+so huge runs can drop the samples and report percentiles in bounded memory.
+"""
+import concurrent.futures
+import math
+import os
+from collections import namedtuple
+from statistics import NormalDist
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from fault_tree import FaultTree
+from fault_tree.analysis.bdd import FaultTreeBdd
+from fault_tree.analysis.tdigest import TDigest
+from fault_tree.probability import LogNormal
+from fault_tree.probability.lognormal import MeanErrorFactor
+
+SAMPLING_METHODS = ("random", "lhs")
+
+# Coefficients of the rational approximations of the standard normal quantile (P. J. Acklam)
+_A = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+      1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00)
+_B = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+      6.680131188771972e+01, -1.328068155288572e+01)
+_C = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+      -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00)
+_D = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00, 3.754408661907416e+00)
+_TAIL = 0.02425
+
+UncertaintyResult = namedtuple('UncertaintyResult', ['mean', 'std', 'percentiles', 'error_factor', 'samples', 'digest'])
+# The number of samples, their mean, and the sum of their squared deviations from the mean
+Moments = Tuple[int, float, float]
+
+
+def lognormal_parameters(mean: Union[float, np.ndarray], error_factor: Union[float, np.ndarray],
+                         percentile: Union[float, np.ndarray] = 0.95) -> Tuple[np.ndarray, np.ndarray]:
+    """Converts lognormal mean and error factor parameters into the normal (mu, sigma) parameters.
+
+    Args:
+        mean (Union[float, np.ndarray]): The means of the lognormal distributions.
+        error_factor (Union[float, np.ndarray]): The ratios of the percentiles to the medians.
+        percentile (Union[float, np.ndarray]): The levels of the error factors, e.g., 0.95.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The means and the standard deviations of the logarithms.
+
+    Raises:
+        ValueError: If a mean is not positive, an error factor is not above 1, or a level is not in (0.5, 1).
+    """
+    mean, error_factor, percentile = (np.asarray(x, dtype=np.float64) for x in (mean, error_factor, percentile))
+    if np.any(mean <= 0):
+        raise ValueError("The mean of a lognormal distribution must be positive")
+    if np.any(error_factor <= 1):
+        raise ValueError("The error factor of a lognormal distribution must be greater than 1")
+    if np.any((percentile <= 0.5) | (percentile >= 1)):
+        raise ValueError("The percentile of a lognormal error factor must be in (0.5, 1)")
+    z_score = np.vectorize(NormalDist().inv_cdf, otypes=[np.float64])(percentile)
+    sigma = np.log(error_factor) / z_score
+    return np.log(mean) - sigma ** 2 / 2, sigma
+
+
+def _polynomial(coefficients: Sequence[float], x: np.ndarray) -> np.ndarray:
+    result = np.full_like(x, coefficients[0])
+    for coefficient in coefficients[1:]:
+        result = result * x + coefficient
+    return result
+
+
+def normal_quantile(u: np.ndarray) -> np.ndarray:
+    """Computes the standard normal quantiles of probabilities in ``(0, 1)`` elementwise.
+
+    Acklam's rational approximation is refined by one Halley step,
+    which brings the relative error close to machine precision.
+
+    Args:
+        u (np.ndarray): The probabilities.
+
+    Returns:
+        np.ndarray: The quantiles.
+    """
+    u = np.asarray(u, dtype=np.float64)
+    z = np.empty_like(u)
+    lower = u < _TAIL
+    upper = u > 1 - _TAIL
+    central = ~(lower | upper)
+    q = u[central] - 0.5
+    r = q * q
+    z[central] = q * _polynomial(_A, r) / (r * _polynomial(_B, r) + 1)
+    for tail, sign, p in ((lower, 1, u[lower]), (upper, -1, 1 - u[upper])):
+        q = np.sqrt(-2 * np.log(p))
+        z[tail] = sign * _polynomial(_C, q) / (q * _polynomial(_D, q) + 1)
+    # The error of the normal CDF at z, taken in the tail of z to avoid cancellation
+    tail = 0.5 * np.vectorize(math.erfc, otypes=[np.float64])(np.abs(z) / math.sqrt(2))
+    error = np.where(z > 0, (1 - u) - tail, tail - u)
+    step = error * math.sqrt(2 * math.pi) * np.exp(z * z / 2)
+    return z - step / (1 + z * step / 2)
+
+
+def latin_hypercube(num_dimensions: int, num_samples: int, rng: np.random.Generator) -> np.ndarray:
+    """Draws a Latin hypercube sample of the unit hypercube.
+
+    Args:
+        num_dimensions (int): The number of independent dimensions.
+        num_samples (int): The number of samples, i.e., of strata per dimension.
+        rng (np.random.Generator): The source of randomness.
+
+    Returns:
+        np.ndarray: The ``(num_dimensions, num_samples)`` uniform sample with exactly one value
+        in every stratum ``[j / num_samples, (j + 1) / num_samples)`` of every dimension.
+    """
+    strata = rng.permuted(np.broadcast_to(np.arange(num_samples), (num_dimensions, num_samples)), axis=1)
+    return (strata + rng.random((num_dimensions, num_samples))) / num_samples
+
+
+class UncertaintyAnalysis:
+    """Samples basic event probabilities and quantifies the top event for every sample.
+
+    CCF groups are not expanded; basic events are taken as independent.
+
+    Attributes:
+        diagram (Bdd): The BDD manager with the diagram of the top gate.
+        root (int): The edge of the top gate.
+        values (np.ndarray): The point values (lognormal means) of the BDD variables.
+        uncertain (np.ndarray): The BDD variables with lognormal probabilities.
+        mu (np.ndarray): The normal means of the uncertain variables.
+        sigma (np.ndarray): The normal standard deviations of the uncertain variables.
+    """
+
+    def __init__(self, fault_tree: FaultTree, max_nodes: Optional[int] = 1_000_000):
+        """Builds the BDD and converts the lognormal parameters.
+
+        Args:
+            fault_tree (FaultTree): The fault tree with basic event probabilities.
+            max_nodes (Optional[int]): The node budget of the BDD, or None for no limit.
+
+        Raises:
+            ValueError: If there is no top gate, a gate is malformed, a basic event has no probability,
+                or lognormal parameters are invalid.
+            BddNodeBudgetError: If the BDD exceeds the node budget.
+        """
+        bdd = FaultTreeBdd(fault_tree, max_nodes)
+        # Only the diagram is kept, so that the analysis can be sent to worker processes.
+        bdd.bdd.clear_cache()
+        self.diagram, self.root = bdd.bdd, bdd.root
+        self.values = np.array(bdd.probabilities(), dtype=np.float64)
+        basic_events = bdd.tables.basic_events
+        distributions = [basic_events[x].probability for x in bdd.order]
+        # Lognormal events with a zero mean never occur and stay constant.
+        self.uncertain = np.array([i for i, x in enumerate(distributions)
+                                   if isinstance(x, LogNormal) and self.values[i] > 0], dtype=np.int64)
+        parameters = [[distributions[i].value[key] for i in self.uncertain]
+                      for key in (MeanErrorFactor.mean, MeanErrorFactor.error_factor, MeanErrorFactor.percentile)]
+        self.mu, self.sigma = lognormal_parameters(*parameters)
+
+    def sample(self, batch_size: int, rng: np.random.Generator, sampling: str = "random") -> np.ndarray:
+        """Draws the probabilities of the BDD variables for a batch of samples.
+
+        Args:
+            batch_size (int): The number of samples.
+            rng (np.random.Generator): The source of randomness.
+            sampling (str): Simple random ("random") or Latin hypercube ("lhs") sampling.
+
+        Returns:
+            np.ndarray: The ``(num_vars, batch_size)`` probabilities.
+
+        Raises:
+            ValueError: If the sampling method is unknown.
+        """
+        if sampling not in SAMPLING_METHODS:
+            raise ValueError(f"Unknown sampling method: {sampling}")
+        probabilities = np.repeat(self.values[:, None], batch_size, axis=1)
+        if sampling == "lhs":
+            normal = normal_quantile(latin_hypercube(len(self.uncertain), batch_size, rng))
+        else:
+            normal = rng.standard_normal((len(self.uncertain), batch_size))
+        probabilities[self.uncertain] = np.minimum(np.exp(self.mu[:, None] + self.sigma[:, None] * normal), 1.0)
+        return probabilities
+
+    def quantify(self, probabilities: np.ndarray) -> np.ndarray:
+        """Computes the exact top event probability for every sample column.
+
+        Args:
+            probabilities (np.ndarray): The ``(num_vars, batch_size)`` probabilities of the BDD variables.
+
+        Returns:
+            np.ndarray: The top event probabilities of the samples.
+        """
+        result = self.diagram.probability(self.root, probabilities)
+        return np.broadcast_to(np.asarray(result, dtype=np.float64), probabilities.shape[1:]).copy()
+
+    def run_part(self, num_samples: int, batch_size: int, seed: Union[None, int, np.random.SeedSequence],
+                 sampling: str = "random", keep_samples: bool = True,
+                 compression: float = 200) -> Tuple[Moments, TDigest, Optional[np.ndarray]]:
+        """Samples a part of a run in one process.
+
+        Args:
+            num_samples (int): The number of samples.
+            batch_size (int): The number of samples drawn and quantified at once.
+            seed (Union[None, int, np.random.SeedSequence]): The seed of the random generator.
+            sampling (str): Simple random ("random") or Latin hypercube ("lhs") sampling.
+            keep_samples (bool): Whether to return the samples.
+            compression (float): The compression of the t-digest.
+
+        Returns:
+            Tuple[Moments, TDigest, Optional[np.ndarray]]: The moments and the digest of the samples,
+            and the samples if kept.
+        """
+        rng = np.random.default_rng(seed)
+        moments, digest, batches = (0, 0.0, 0.0), TDigest(compression), []
+        for start in range(0, num_samples, batch_size):
+            batch = self.quantify(self.sample(min(batch_size, num_samples - start), rng, sampling))
+            moments = combine_moments(moments, (len(batch), float(batch.mean()),
+                                                float(np.square(batch - batch.mean()).sum())))
+            digest.add(batch)
+            if keep_samples:
+                batches.append(batch)
+        return moments, digest, np.concatenate(batches) if keep_samples else None
+
+    def run(self, num_samples: int = 10_000, batch_size: int = 10_000, seed: Optional[int] = None,
+            percentiles: Sequence[float] = (5, 50, 95), sampling: str = "random", max_workers: Optional[int] = 1,
+            keep_samples: bool = True, compression: float = 200) -> UncertaintyResult:
+        """Samples the top event probability distribution.
+
+        Args:
+            num_samples (int): The number of samples.
+            batch_size (int): The number of samples drawn and quantified at once;
+                every batch is a separate Latin hypercube.
+            seed (Optional[int]): The seed of the random generator.
+            percentiles (Sequence[float]): The percentiles to report, in percent.
+            sampling (str): Simple random ("random") or Latin hypercube ("lhs") sampling.
+            max_workers (Optional[int]): The number of worker processes, or None for the number of CPUs.
+                The parts of the run use independent streams spawned from the seed.
+            keep_samples (bool): Whether to keep the samples and report exact sample percentiles.
+                Otherwise, the percentiles are estimated from the merged t-digest in bounded memory.
+            compression (float): The compression of the t-digest.
+
+        Returns:
+            UncertaintyResult: The mean and standard deviation, the requested percentiles,
+            the error factor (the 95th percentile over the median), the samples if kept, and the t-digest.
+
+        Raises:
+            ValueError: If the sampling method is unknown.
+        """
+        if sampling not in SAMPLING_METHODS:
+            raise ValueError(f"Unknown sampling method: {sampling}")
+        max_workers = min(max_workers or os.cpu_count() or 1, max(num_samples, 1))
+        if max_workers == 1:
+            parts = [self.run_part(num_samples, batch_size, seed, sampling, keep_samples, compression)]
+        else:
+            seeds = np.random.SeedSequence(seed).spawn(max_workers)
+            sizes = [num_samples // max_workers + (i < num_samples % max_workers) for i in range(max_workers)]
+            with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(_run_part, self, size, batch_size, part_seed, sampling, keep_samples,
+                                           compression) for size, part_seed in zip(sizes, seeds)]
+                parts = [future.result() for future in futures]
+        moments, digest = parts[0][0], parts[0][1]
+        for part_moments, part_digest, _ in parts[1:]:
+            moments = combine_moments(moments, part_moments)
+            digest.merge(part_digest)
+        if keep_samples:
+            return summarize(np.concatenate([samples for _, _, samples in parts]), percentiles, digest)
+        return summarize_digest(moments, digest, percentiles)
+
+
+def _run_part(analysis: UncertaintyAnalysis, *args) -> Tuple[Moments, TDigest, Optional[np.ndarray]]:
+    """Samples one part of a run in a worker process."""
+    return analysis.run_part(*args)
+
+
+def combine_moments(a: Moments, b: Moments) -> Moments:
+    """Combines the moments of two disjoint sets of samples (Chan et al.).
+
+    Args:
+        a (Moments): The count, mean, and sum of squared deviations of the first set.
+        b (Moments): The count, mean, and sum of squared deviations of the second set.
+
+    Returns:
+        Moments: The moments of the union.
+    """
+    count = a[0] + b[0]
+    if not count:
+        return 0, 0.0, 0.0
+    delta = b[1] - a[1]
+    return count, a[1] + delta * b[0] / count, a[2] + b[2] + delta * delta * a[0] * b[0] / count
+
+
+def _result(mean: float, std: float, values: np.ndarray, percentiles: Sequence[float],
+            samples: Optional[np.ndarray], digest: Optional[TDigest]) -> UncertaintyResult:
+    """Packs the statistics; ``values`` are the percentiles followed by the median and the 95th percentile."""
+    table: Dict[float, float] = {x: float(v) for x, v in zip(percentiles, values)}
+    median, upper = values[-2], values[-1]
+    error_factor = float(upper / median) if median > 0 else math.inf
+    return UncertaintyResult(mean, std, table, error_factor, samples, digest)
+
+
+def summarize(samples: np.ndarray, percentiles: Sequence[float] = (5, 50, 95),
+              digest: Optional[TDigest] = None) -> UncertaintyResult:
+    """Summarizes samples of the top event probability.
+
+    Args:
+        samples (np.ndarray): The top event probabilities.
+        percentiles (Sequence[float]): The percentiles to report, in percent.
+        digest (Optional[TDigest]): The t-digest of the samples to attach to the result.
+
+    Returns:
+        UncertaintyResult: The summary statistics with the samples.
+    """
+    values = np.percentile(samples, list(percentiles) + [50, 95])
+    return _result(float(samples.mean()), float(samples.std(ddof=1)) if len(samples) > 1 else 0.0,
+                   values, percentiles, samples, digest)
+
+
+def summarize_digest(moments: Moments, digest: TDigest,
+                     percentiles: Sequence[float] = (5, 50, 95)) -> UncertaintyResult:
+    """Summarizes streamed samples of the top event probability by their moments and t-digest.
+
+    Args:
+        moments (Moments): The count, mean, and sum of squared deviations of the samples.
+        digest (TDigest): The t-digest of the samples.
+        percentiles (Sequence[float]): The percentiles to report, in percent.
+
+    Returns:
+        UncertaintyResult: The summary statistics with estimated percentiles and without samples.
+    """
+    count, mean, squares = moments
+    values = digest.percentile(list(percentiles) + [50, 95])
+    return _result(mean, math.sqrt(squares / (count - 1)) if count > 1 else 0.0, values, percentiles, None, digest)
+
+
+def propagate_uncertainty(fault_tree: FaultTree, num_samples: int = 10_000, seed: Optional[int] = None,
+                          percentiles: Sequence[float] = (5, 50, 95), sampling: str = "random",
+                          max_workers: Optional[int] = 1, keep_samples: bool = True) -> UncertaintyResult:
+    """Propagates lognormal basic event uncertainty to the top event probability.
+
+    Args:
+        fault_tree (FaultTree): The fault tree with basic event probabilities.
+        num_samples (int): The number of samples.
+        seed (Optional[int]): The seed of the random generator.
+        percentiles (Sequence[float]): The percentiles to report, in percent.
+        sampling (str): Simple random ("random") or Latin hypercube ("lhs") sampling.
+        max_workers (Optional[int]): The number of worker processes, or None for the number of CPUs.
+        keep_samples (bool): Whether to keep the samples; otherwise percentiles are t-digest estimates.
+
+    Returns:
+        UncertaintyResult: The mean, standard deviation, percentiles, and error factor of the top event probability.
+
+    Raises:
+        ValueError: If there is no top gate, a gate is malformed, a basic event has no probability,
+            lognormal parameters are invalid, or the sampling method is unknown.
+        BddNodeBudgetError: If the BDD exceeds the node budget.
+    """
+    return UncertaintyAnalysis(fault_tree).run(num_samples, seed=seed, percentiles=percentiles, sampling=sampling,
+                                               max_workers=max_workers, keep_samples=keep_samples)
@@ -0,0 +1,507 @@
+"""Minimal cut sets with zero-suppressed BDDs (ZBDD).
+
+A ZBDD node ``(v, low, high)`` is the family of sets ``low | {s + {v} : s in high}``,
+and nodes whose high edge is the empty family are never built. Node 0 is the
+empty family and node 1 the family of only the empty set.
+
+Every basic event at level ``i`` of the variable order gets two variables:
+``2 * i`` for its occurrence and ``2 * i + 1`` for its complement, so
+non-coherent gates (NOT, XOR) give cut sets with negated literals. Products
+drop sets with both literals of an event, which is cheap because the two
+variables are neighbours in the order.
+
+The cut sets of gates are built bottom-up in topological order: unions for OR
+gates, products for AND gates, sequential counters for AT-LEAST gates, and
+the parity of positive and negative families for XOR gates; NOT gates swap
+the families. Every gate family is truncated by the order limit and the
+probability cut-off, and minimized by subsumption. Truncation per gate is
+exact: a set below a limit only has supersets below it.
+
+All operations use explicit stacks, so deep diagrams do not hit the recursion limit.
+"""
+import math
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from fault_tree import FaultTree
+from fault_tree.analysis.bdd import BddNodeBudgetError, variable_order
+from fault_tree.io.tables import FaultTreeTables, OPERATORS
+
+EMPTY = 0
+BASE = 1
+
+_POSITIVE = 1
+_NEGATIVE = 2
+
+
+class Zbdd:
+    """Manager of ZBDD nodes over variables ``0..num_vars-1``; lower variables are closer to the root.
+
+    Attributes:
+        num_vars (int): The number of variables.
+        max_nodes (Optional[int]): The node budget, or None for no limit.
+        variables (List[int]): The variable of every node; ``num_vars`` for the terminals.
+        lows (List[int]): The low (without the variable) child of every node.
+        highs (List[int]): The high (with the variable) child of every node.
+    """
+
+    def __init__(self, num_vars: int, max_nodes: Optional[int] = 1_000_000):
+        """Initializes a manager with only the two terminals.
+
+        Args:
+            num_vars (int): The number of variables.
+            max_nodes (Optional[int]): The node budget, or None for no limit.
+        """
+        self.num_vars = num_vars
+        self.max_nodes = max_nodes
+        self.variables: List[int] = [num_vars, num_vars]
+        self.lows: List[int] = [EMPTY, BASE]
+        self.highs: List[int] = [EMPTY, BASE]
+        self._unique: Dict[Tuple[int, int, int], int] = {}
+        self._computed: Dict[tuple, int] = {}
+        self._counts: List[int] = [0, 1]
+        self._pruning: tuple = (None, [0.0, 1.0], {})  # probabilities, largest set probabilities, cache
+
+    @property
+    def num_nodes(self) -> int:
+        """The number of nodes, the terminals included."""
+        return len(self.variables)
+
+    def clear_cache(self):
+        """Empties the computed tables."""
+        self._computed.clear()
+        self._pruning = (None, [0.0, 1.0], {})
+
+    def make_node(self, variable: int, low: int, high: int) -> int:
+        """Returns the zero-suppressed node of ``low | high * {variable}``.
+
+        Raises:
+            BddNodeBudgetError: If a new node would exceed the budget.
+        """
+        if high == EMPTY:
+            return low
+        key = (variable, low, high)
+        node = self._unique.get(key)
+        if node is None:
+            node = len(self.variables)
+            if self.max_nodes is not None and node >= self.max_nodes:
+                raise BddNodeBudgetError(f"The ZBDD exceeds the budget of {self.max_nodes} nodes")
+            self._unique[key] = node
+            self.variables.append(variable)
+            self.lows.append(low)
+            self.highs.append(high)
+        return node
+
+    def singleton(self, variable: int) -> int:
+        """Returns the family of the single set ``{variable}``."""
+        return self.make_node(variable, EMPTY, BASE)
+
+    def cofactors(self, node: int, variable: int) -> Tuple[int, int]:
+        """Returns the families of sets without and with a variable at or above the node."""
+        if self.variables[node] != variable:
+            return node, EMPTY
+        return self.lows[node], self.highs[node]
+
+    def has_empty_set(self, node: int) -> bool:
+        """Returns whether the family contains the empty set."""
+        lows = self.lows
+        while node > BASE:
+            node = lows[node]
+        return node == BASE
+
+    def _evaluate(self, task: tuple, expand: Callable, computed: Optional[dict] = None) -> int:
+        """Evaluates a memoized operation without recursion.
+
+        ``expand(task)`` returns ``(result, None, None)`` for terminal cases,
+        or ``(None, subtasks, combine)`` where ``combine`` builds the result from the subtask results.
+        """
+        computed = self._computed if computed is None else computed
+        results: List[int] = []
+        stack: List[tuple] = [(task, None, 0)]
+        while stack:
+            task, combine, count = stack.pop()
+            if combine is not None:
+                values = results[-count:]
+                del results[-count:]
+                result = computed[task] = combine(*values)
+                results.append(result)
+                continue
+            result = computed.get(task)
+            if result is None:
+                result, subtasks, combine = expand(task)
+                if result is None:
+                    stack.append((task, combine, len(subtasks)))
+                    stack.extend((x, None, 0) for x in reversed(subtasks))
+                    continue
+            results.append(result)
+        return results[0]
+
+    def union(self, f: int, g: int) -> int:
+        """Returns the union of two families."""
+        variables = self.variables
+
+        def expand(task):
+            _, f, g = task
+            if f == EMPTY or f == g:
+                return g, None, None
+            if g == EMPTY:
+                return f, None, None
+            variable = min(variables[f], variables[g])
+            f_low, f_high = self.cofactors(f, variable)
+            g_low, g_high = self.cofactors(g, variable)
+            return None, [("u", *sorted((f_low, g_low))), ("u", *sorted((f_high, g_high)))], \
+                lambda low, high: self.make_node(variable, low, high)
+
+        return self._evaluate(("u", *sorted((f, g))), expand)
+
+    def product(self, f: int, g: int, limit_order: Optional[int] = None) -> int:
+        """Returns the family of the unions of a set from each family without complementary literals.
+
+        Args:
+            f (int): The first family.
+            g (int): The second family.
+            limit_order (Optional[int]): The largest size of the sets to keep, or None for no limit.
+
+        Returns:
+            int: The product family.
+        """
+        variables = self.variables
+        if limit_order is None:
+            limit_order = self.num_vars
+
+        def make_node(variable, low, high):
+            if not variable & 1 and variables[high] == variable + 1:
+                high = self.lows[high]  # drop sets with both literals of an event
+            return self.make_node(variable, low, high)
+
+        def expand(task):
+            _, f, g, limit = task
+            if f == EMPTY or g == EMPTY or limit < 0:
+                return EMPTY, None, None
+            if f == BASE:
+                return self.limit_order(g, limit), None, None
+            variable = variables[f]
+            f_low, f_high = self.lows[f], self.highs[f]
+            if variables[g] > variable:
+                return None, [("p", *sorted((f_low, g)), limit), ("p", *sorted((f_high, g)), limit - 1)], \
+                    lambda low, high: make_node(variable, low, high)
+            if variables[g] < variable:
+                return expand(("p", g, f, limit))
+            g_low, g_high = self.lows[g], self.highs[g]
+            subtasks = [("p", *sorted((f_low, g_low)), limit), ("p", *sorted((f_high, g_high)), limit - 1),
+                        ("p", *sorted((f_high, g_low)), limit - 1), ("p", *sorted((f_low, g_high)), limit - 1)]
+            return None, subtasks, \
+                lambda low, both, f_only, g_only: make_node(variable, low,
+                                                            self.union(self.union(both, f_only), g_only))
+
+        return self._evaluate(("p", *sorted((f, g)), limit_order), expand)
+
+    def limit_order(self, f: int, limit_order: int) -> int:
+        """Returns the sets of a family with at most ``limit_order`` elements."""
+        if limit_order >= self.num_vars:
+            return f
+
+        def expand(task):
+            _, f, limit = task
+            if f <= BASE:
+                return f, None, None
+            if limit <= 0:
+                return BASE if limit == 0 and self.has_empty_set(f) else EMPTY, None, None
+            variable = self.variables[f]
+            return None, [("l", self.lows[f], limit), ("l", self.highs[f], limit - 1)], \
+                lambda low, high: self.make_node(variable, low, high)
+
+        return self._evaluate(("l", f, limit_order), expand)
+
+    def without(self, f: int, g: int) -> int:
+        """Returns the sets of ``f`` that are not supersets of any set of ``g``."""
+        variables = self.variables
+
+        def expand(task):
+            _, f, g = task
+            if g == EMPTY or f == EMPTY:
+                return f, None, None
+            if f == g or self.has_empty_set(g):
+                return EMPTY, None, None
+            if f == BASE:
+                return BASE, None, None
+            variable = variables[f]
+            if variables[g] < variable:  # sets with the variable of g cannot be subsets
+                return None, [("w", f, self.lows[g])], lambda result: result
+            f_low, f_high = self.lows[f], self.highs[f]
+            g_low, g_high = self.cofactors(g, variable)
+            return None, [("w", f_low, g_low), ("w", f_high, self.union(g_low, g_high))], \
+                lambda low, high: self.make_node(variable, low, high)
+
+        return self._evaluate(("w", f, g), expand)
+
+    def minimize(self, f: int) -> int:
+        """Returns the minimal sets of a family, removing every set that has a proper subset in it."""
+
+        def expand(task):
+            _, f = task
+            if f <= BASE:
+                return f, None, None
+            variable = self.variables[f]
+            return None, [("m", self.lows[f]), ("m", self.highs[f])], \
+                lambda low, high: self.make_node(variable, low, self.without(high, low))
+
+        return self._evaluate(("m", f), expand)
+
+    def prune(self, f: int, cut_off: float, probabilities: Sequence[float]) -> int:
+        """Returns the sets of a family whose probability is at least the cut-off.
+
+        Args:
+            f (int): The family.
+            cut_off (float): The smallest probability of the sets to keep.
+            probabilities (Sequence[float]): The probability of every variable.
+
+        Returns:
+            int: The sets with the product of probabilities of their variables at or above the cut-off.
+        """
+        if probabilities is not self._pruning[0]:
+            self._pruning = (probabilities, [0.0, 1.0], {})
+        _, largest, computed = self._pruning
+        variables, lows, highs = self.variables, self.lows, self.highs
+        # The largest set probability of every node, in node order (children come first).
+        for node in range(len(largest), f + 1):
+            largest.append(max(largest[lows[node]], probabilities[variables[node]] * largest[highs[node]]))
+
+        def expand(task):
+            _, f, threshold = task
+            if largest[f] < threshold:
+                return EMPTY, None, None
+            if f <= BASE or threshold <= 0:
+                return f, None, None
+            p = probabilities[variables[f]]
+            return None, [("c", lows[f], threshold), ("c", highs[f], threshold / p if p else math.inf)], \
+                lambda low, high: self.make_node(variables[f], low, high)
+
+        return self._evaluate(("c", f, cut_off), expand, computed)
+
+    def count(self, f: int) -> int:
+        """Returns the number of sets in a family without enumerating them."""
+        counts, lows, highs = self._counts, self.lows, self.highs
+        for node in range(len(counts), f + 1):
+            counts.append(counts[lows[node]] + counts[highs[node]])
+        return counts[f]
+
+    def sets(self, f: int) -> Iterator[Tuple[int, ...]]:
+        """Enumerates the sets of a family as ascending tuples of variables."""
+        path: List[int] = []
+        stack: List[Tuple[int, int]] = [(f, 0)]  # the node and the path length to restore
+        variables, lows, highs = self.variables, self.lows, self.highs
+        while stack:
+            node, depth = stack.pop()
+            del path[depth:]
+            while node > BASE:
+                stack.append((lows[node], len(path)))
+                path.append(variables[node])
+                node = highs[node]
+            if node == BASE:
+                yield tuple(path)
+
+
+class FaultTreeZbdd:
+    """The minimal cut sets of the top gate of a fault tree.
+
+    CCF groups are not expanded; basic events are taken as independent.
+
+    Attributes:
+        tables (FaultTreeTables): The indexed fault tree.
+        zbdd (Zbdd): The node manager.
+        order (List[int]): The node indices of the basic events in variable order.
+        limit_order (Optional[int]): The largest order of the cut sets, or None for no limit.
+        cut_off (Optional[float]): The smallest probability of the cut sets, or None for no cut-off.
+        root (int): The family of the minimal cut sets of the top gate.
+    """
+
+    def __init__(self, fault_tree: FaultTree, limit_order: Optional[int] = None,
+                 cut_off: Optional[float] = None, max_nodes: Optional[int] = 1_000_000):
+        """Builds the minimal cut sets gate by gate in topological order.
+
+        Args:
+            fault_tree (FaultTree): The fault tree.
+            limit_order (Optional[int]): The largest order of the cut sets, as SCRAM ``--limit-order``.
+            cut_off (Optional[float]): The smallest probability of the cut sets, as SCRAM ``--cut-off``.
+            max_nodes (Optional[int]): The node budget, or None for no limit.
+
+        Raises:
+            ValueError: If there is no top gate, a gate is malformed,
+                or a basic event has no probability with a cut-off.
+            BddNodeBudgetError: If the ZBDD exceeds the node budget.
+        """
+        self.tables = tables = FaultTreeTables.from_fault_tree(fault_tree)
+        if tables.top_index < 0:
+            raise ValueError("The fault tree has no top gate")
+        if limit_order is not None and limit_order < 0:
+            raise ValueError("The limit on the cut set order must be non-negative")
+        self.order = variable_order(tables)
+        self.limit_order = limit_order
+        self.cut_off = cut_off
+        self.zbdd = zbdd = Zbdd(2 * len(self.order), max_nodes)
+        self._probabilities = self._literal_probabilities() if cut_off else None
+
+        gate_offset = tables.gate_offset
+        offsets, children = tables.child_offsets, tables.children
+        top_gate = tables.top_index - gate_offset
+        gate_order = tables.topological_order([top_gate])
+
+        # The polarities of the gates needed by their parents, top-down.
+        needed = bytearray(len(tables.gates))
+        needed[top_gate] = _POSITIVE
+        for gate_number in reversed(gate_order):
+            operator = OPERATORS[tables.operators[gate_number]]
+            polarity = needed[gate_number]
+            if operator == "not":
+                polarity = (polarity & _POSITIVE) << 1 | (polarity & _NEGATIVE) >> 1
+            elif operator == "xor":
+                polarity = _POSITIVE | _NEGATIVE
+            for child in children[offsets[gate_number]:offsets[gate_number + 1]]:
+                if child >= gate_offset:
+                    needed[child - gate_offset] |= polarity
+
+        levels = {node: level for level, node in enumerate(self.order)}
+        positive: List[int] = [zbdd.singleton(2 * levels[i]) if i in levels else EMPTY
+                               for i in range(len(tables.basic_events))]
+        negative: List[int] = [zbdd.singleton(2 * levels[i] + 1) if i in levels else EMPTY
+                               for i in range(len(tables.basic_events))]
+        positive.extend(BASE if x else EMPTY for x in tables.house_states)
+        negative.extend(EMPTY if x else BASE for x in tables.house_states)
+        positive.extend([EMPTY] * len(tables.gates))
+        negative.extend([EMPTY] * len(tables.gates))
+        for gate_number in gate_order:
+            arguments = children[offsets[gate_number]:offsets[gate_number + 1]]
+            operator = OPERATORS[tables.operators[gate_number]]
+            node = gate_offset + gate_number
+            if operator == "not":
+                if len(arguments) != 1:
+                    raise ValueError(f"NOT gate {tables.gates[gate_number].name} must have exactly one argument")
+                positive[node], negative[node] = negative[arguments[0]], positive[arguments[0]]
+                continue
+            if operator == "xor":
+                positive[node], negative[node] = self._parity([(positive[x], negative[x]) for x in arguments])
+                continue
+            k_num, num_arguments = tables.k_nums[gate_number], len(arguments)
+            if operator == "and":
+                k_num = num_arguments
+            elif operator == "or":
+                k_num = 1
+            if needed[gate_number] & _POSITIVE:
+                positive[node] = self._atleast(k_num, [positive[x] for x in arguments])
+            if needed[gate_number] & _NEGATIVE:
+                negative[node] = self._atleast(num_arguments - k_num + 1, [negative[x] for x in arguments])
+        self.root = positive[tables.top_index]
+        zbdd.clear_cache()
+
+    def _literal_probabilities(self) -> List[float]:
+        probabilities = []
+        for node in self.order:
+            value = self.tables.probabilities[node]
+            if math.isnan(value):
+                raise ValueError(f"Basic event {self.tables.basic_events[node].name} has no probability")
+            probabilities.extend((value, 1 - value))
+        return probabilities
+
+    def _truncate(self, family: int) -> int:
+        """Applies the order limit and the probability cut-off, and minimizes a family."""
+        if self.limit_order is not None:
+            family = self.zbdd.limit_order(family, self.limit_order)
+        if self.cut_off:
+            family = self.zbdd.prune(family, self.cut_off, self._probabilities)
+        return self.zbdd.minimize(family)
+
+    def _product(self, f: int, g: int) -> int:
+        return self._truncate(self.zbdd.product(f, g, self.limit_order))
+
+    def _union(self, f: int, g: int) -> int:
+        return self.zbdd.minimize(self.zbdd.union(f, g))  # both families are already truncated
+
+    def _atleast(self, k_num: int, families: Sequence[int]) -> int:
+        """Returns the minimal sets of at least ``k_num`` of the families with a sequential counter."""
+        num_families = len(families)
+        if k_num <= 0:
+            return BASE
+        if k_num > num_families:
+            return EMPTY
+        if k_num == 1:
+            result = EMPTY
+            for family in families:
+                result = self.zbdd.union(result, family)
+            return self._truncate(result)
+        if k_num == num_families:
+            result = self._truncate(BASE)
+            for family in families:
+                result = self._product(result, family)
+            return result
+        # counts[j] holds the sets of at least j of the families seen so far.
+        counts = [BASE] + [EMPTY] * k_num
+        for i, family in enumerate(families, start=1):
+            low = max(1, k_num - (num_families - i))  # cells that can no longer reach k are dropped
+            for j in range(min(i, k_num), low - 1, -1):
+                counts[j] = self._union(counts[j], self._product(counts[j - 1], family))
+        return counts[k_num]
+
+    def _parity(self, families: Sequence[Tuple[int, int]]) -> Tuple[int, int]:
+        """Returns the positive and negative minimal sets of the parity of the families."""
+        if not families:
+            return EMPTY, BASE
+        odd, even = families[0]
+        for positive, negative in families[1:]:
+            odd, even = (self._union(self._product(odd, negative), self._product(even, positive)),
+                         self._union(self._product(odd, positive), self._product(even, negative)))
+        return odd, even
+
+    def count(self) -> int:
+        """Returns the number of minimal cut sets without enumerating them."""
+        return self.zbdd.count(self.root)
+
+    def literal_name(self, variable: int) -> str:
+        """Returns the basic event name of a variable, with ``'`` for the complement."""
+        name = self.tables.basic_events[self.order[variable >> 1]].name
+        return name + "'" if variable & 1 else name
+
+    def cut_sets(self) -> Iterator[Tuple[str, ...]]:
+        """Enumerates the minimal cut sets as tuples of literal names in variable order."""
+        literal_names = [self.literal_name(x) for x in range(self.zbdd.num_vars)]
+        for cut_set in self.zbdd.sets(self.root):
+            yield tuple(literal_names[x] for x in cut_set)
+
+
+def minimal_cut_sets(fault_tree: FaultTree, limit_order: Optional[int] = None,
+                     cut_off: Optional[float] = None) -> List[Tuple[str, ...]]:
+    """Computes the minimal cut sets of a fault tree.
+
+    Args:
+        fault_tree (FaultTree): The fault tree.
+        limit_order (Optional[int]): The largest order of the cut sets, or None for no limit.
+        cut_off (Optional[float]): The smallest probability of the cut sets, or None for no cut-off.
+
+    Returns:
+        List[Tuple[str, ...]]: The cut sets as tuples of basic event names; complements end with ``'``.
+
+    Raises:
+        ValueError: If there is no top gate, a gate is malformed,
+            or a basic event has no probability with a cut-off.
+        BddNodeBudgetError: If the ZBDD exceeds the node budget.
+    """
+    return list(FaultTreeZbdd(fault_tree, limit_order, cut_off).cut_sets())
+
+
+def count_cut_sets(fault_tree: FaultTree, limit_order: Optional[int] = None,
+                   cut_off: Optional[float] = None) -> int:
+    """Counts the minimal cut sets of a fault tree without enumerating them.
+
+    Args:
+        fault_tree (FaultTree): The fault tree.
+        limit_order (Optional[int]): The largest order of the cut sets, or None for no limit.
+        cut_off (Optional[float]): The smallest probability of the cut sets, or None for no cut-off.
+
+    Returns:
+        int: The number of minimal cut sets.
+
+    Raises:
+        ValueError: If there is no top gate, a gate is malformed,
+            or a basic event has no probability with a cut-off.
+        BddNodeBudgetError: If the ZBDD exceeds the node budget.
+    """
+    return FaultTreeZbdd(fault_tree, limit_order, cut_off).count()
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from ordered_set import OrderedSet
 
 from fault_tree.event import BasicEvent
@@ -15,7 +15,8 @@ class CCFGroup:
         members (OrderedSet[BasicEvent]): A list of basic events that are members of the CCF group.
         prob (Optional[Probability]): The probability associated with the CCF group.
         model (Optional[str]): The CCF model used for the group.
-        factors (OrderedSet[float]): The factors associated with the CCF model.
+        factors (List[float]): The factors associated with the CCF model, one per level from 2 on;
+            a list, since the factors of different levels may be equal.
     """
 
     def __init__(self, name: str):
@@ -28,4 +29,4 @@ class CCFGroup:
         self.members: OrderedSet[BasicEvent]
         self.prob: Optional[Probability] = None
         self.model: Optional[str] = None
-        self.factors: OrderedSet[float]
+        self.factors: List[float]
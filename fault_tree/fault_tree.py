@@ -1,10 +1,14 @@
 from collections import deque
-from typing import Optional, Dict, Any, Deque
+from typing import Optional, Dict, Any, Deque, TYPE_CHECKING
 from ordered_set import OrderedSet
 
 from fault_tree.event import BasicEvent, HouseEvent, Gate
 from fault_tree import CCFGroup
 
+# The analysis package imports this module, so the program type is only imported for type hints.
+if TYPE_CHECKING:
+    from fault_tree.analysis.program import Program
+
 
 class FaultTree:
     """Represents a fault tree for reliability and safety analysis.
@@ -133,6 +137,21 @@ class FaultTree:
 
         return self.top_gate.expr()
 
+    def compile(self) -> 'Program':
+        """Compiles the top gate into a flat register program.
+
+        The program evaluates the top gate over boolean arrays, packed bit-planes,
+        or probability arrays of the basic events with vectorized NumPy kernels.
+
+        Returns:
+            Program: The compiled program; its inputs follow the basic event order of ``program.tables``.
+
+        Raises:
+            ValueError: If there is no top gate, a gate is malformed, or the gates form a cycle.
+        """
+        from fault_tree.analysis.program import Program
+        return Program.from_fault_tree(self)
+
     @staticmethod
     def toposort_gates(root_gates: OrderedSet[Gate], gates: OrderedSet[Gate]) -> Deque:
         """Sorts gates topologically starting from the root gate.
@@ -0,0 +1,12 @@
+from .tables import FaultTreeTables
+from .binary import MappedFaultTree, MappedGate, read_binary, write_binary
+from .corpus import CorpusIndexWriter, CorpusReader, CorpusEntry
+from .mef_xml import MefXmlReader, read_mef_xml
+from .expr_parser import ExprParser, parse_expr, parse_expr_file
+from .compression import compression_for, open_input, open_output
+from .jsonl import tree_record, encode_record, record_to_fault_tree, read_jsonl
+from .npz import FaultTreeArrays, fault_tree_arrays, read_npz, write_npz
+from .dimacs import CnfEncoding, encode_cnf, write_dimacs
+from .aiger import AndInverterGraph, lower_fault_tree, write_aiger
+from .fanout import (FanOutWriter, FormatSink, encode_formats, format_for, is_single_document, register_format,
+                     write_formats)
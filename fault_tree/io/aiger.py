@@ -0,0 +1,257 @@
+"""Export of fault trees as binary AIGER and-inverter graphs.
+
+Every gate is lowered to two-input AND nodes and inverted edges:
+OR gates by De Morgan, XOR gates as the parity of their arguments,
+and AT-LEAST gates through a sequential counter, where cell ``j`` is
+``cell[j] | (cell[j - 1] & x)`` over the arguments ``x``. AND nodes are
+structurally hashed and simplified against constants, repeated, and
+complementary inputs, so shared and identical logic is built once.
+House events become the constants of their states.
+
+The binary format follows the AIGER 1.9 specification: the header
+``aig M I L O A``, the output literals in ASCII, and then every AND node as
+two variable-length encoded deltas ``lhs - rhs0`` and ``rhs0 - rhs1``.
+Basic events are the inputs in ``FaultTreeTables`` order, the top gate is the
+only output, and the symbol table holds the event and top gate names.
+"""
+from array import array
+from typing import Dict, IO, List, Sequence, Tuple
+
+from fault_tree import FaultTree
+from fault_tree.io.compression import open_output
+from fault_tree.io.tables import FaultTreeTables, OPERATORS
+
+FALSE = 0
+TRUE = 1
+
+
+class AndInverterGraph:
+    """Structurally hashed and-inverter graph.
+
+    Literals are ``2 * variable`` for positive and ``2 * variable + 1`` for negated edges;
+    variable 0 is the constant false. Inputs take variables ``1..num_inputs``,
+    and AND nodes follow in creation order, so every AND node comes after its inputs.
+
+    Attributes:
+        num_inputs (int): The number of inputs.
+        ands (array): Right-hand side literal pairs of the AND nodes, flattened ('Q').
+    """
+
+    def __init__(self, num_inputs: int):
+        """Initializes a graph of inputs without AND nodes.
+
+        Args:
+            num_inputs (int): The number of inputs.
+        """
+        self.num_inputs = num_inputs
+        self.ands = array('Q')
+        self._hash: Dict[Tuple[int, int], int] = {}
+
+    @property
+    def num_ands(self) -> int:
+        """The number of AND nodes."""
+        return len(self.ands) // 2
+
+    @property
+    def max_variable(self) -> int:
+        """The largest variable index."""
+        return self.num_inputs + self.num_ands
+
+    @staticmethod
+    def input_literal(index: int) -> int:
+        """Returns the positive literal of the zero-based input."""
+        return 2 * (index + 1)
+
+    def add_and(self, left: int, right: int) -> int:
+        """Returns the literal of the conjunction, reusing or simplifying nodes where possible."""
+        if left < right:
+            left, right = right, left
+        if right == FALSE or left == right ^ 1:
+            return FALSE
+        if right == TRUE or left == right:
+            return left
+        key = (left, right)
+        literal = self._hash.get(key)
+        if literal is None:
+            literal = self._hash[key] = 2 * (self.max_variable + 1)
+            self.ands.extend(key)
+        return literal
+
+    def add_or(self, left: int, right: int) -> int:
+        """Returns the literal of the disjunction."""
+        return self.add_and(left ^ 1, right ^ 1) ^ 1
+
+    def add_xor(self, left: int, right: int) -> int:
+        """Returns the literal of the exclusive disjunction."""
+        return self.add_or(self.add_and(left, right ^ 1), self.add_and(left ^ 1, right))
+
+    def add_and_all(self, literals: Sequence[int]) -> int:
+        """Returns the literal of the conjunction of all literals as a balanced tree."""
+        literals = list(literals)
+        if not literals:
+            return TRUE
+        while len(literals) > 1:
+            paired = [self.add_and(literals[i], literals[i + 1]) for i in range(0, len(literals) - 1, 2)]
+            if len(literals) % 2:
+                paired.append(literals[-1])
+            literals = paired
+        return literals[0]
+
+    def add_or_all(self, literals: Sequence[int]) -> int:
+        """Returns the literal of the disjunction of all literals."""
+        return self.add_and_all([x ^ 1 for x in literals]) ^ 1
+
+    def add_parity(self, literals: Sequence[int]) -> int:
+        """Returns the literal of the parity of all literals."""
+        result = FALSE
+        for literal in literals:
+            result = self.add_xor(result, literal) if result != FALSE else literal
+        return result
+
+    def add_atleast(self, k_num: int, literals: Sequence[int]) -> int:
+        """Returns the literal that holds iff at least ``k_num`` of the literals hold.
+
+        The sequential counter takes ``O(n * k)`` AND nodes.
+        """
+        num_literals = len(literals)
+        if k_num <= 0:
+            return TRUE
+        if k_num > num_literals:
+            return FALSE
+        # counts[j] holds iff at least j of the literals seen so far hold.
+        counts = [TRUE] + [FALSE] * k_num
+        for i, literal in enumerate(literals, start=1):
+            # Cells that can no longer reach k are not needed anymore.
+            low = max(1, k_num - (num_literals - i))
+            for j in range(min(i, k_num), low - 1, -1):
+                counts[j] = self.add_or(counts[j], self.add_and(counts[j - 1], literal))
+        return counts[k_num]
+
+    def write(self, out: IO, outputs: Sequence[int], input_names: Sequence[str] = (),
+              output_names: Sequence[str] = (), comment: str = ""):
+        """Writes the graph in the binary AIGER format.
+
+        Args:
+            out (IO): A binary file object.
+            outputs (Sequence[int]): The output literals.
+            input_names (Sequence[str]): Symbols of the inputs; empty to omit them.
+            output_names (Sequence[str]): Symbols of the outputs; empty to omit them.
+            comment (str): Text of the comment section.
+        """
+        out.write(f"aig {self.max_variable} {self.num_inputs} 0 {len(outputs)} {self.num_ands}\n"
+                  .encode('ascii'))
+        out.write("".join(f"{x}\n" for x in outputs).encode('ascii'))
+        data = bytearray()
+        lhs = 2 * self.num_inputs
+        ands = self.ands
+        for position in range(0, len(ands), 2):
+            lhs += 2
+            rhs0 = ands[position]
+            for delta in (lhs - rhs0, rhs0 - ands[position + 1]):
+                while delta & ~0x7f:
+                    data.append(delta & 0x7f | 0x80)
+                    delta >>= 7
+                data.append(delta)
+            if len(data) >= 1 << 20:
+                out.write(data)
+                data.clear()
+        out.write(data)
+        symbols = [f"i{i} {name}\n" for i, name in enumerate(input_names)]
+        symbols.extend(f"o{i} {name}\n" for i, name in enumerate(output_names))
+        if comment:
+            symbols.append(f"c\n{comment}\n")
+        out.write("".join(symbols).encode('utf-8'))
+
+
+def lower_gate(aig: AndInverterGraph, tables: FaultTreeTables, literals: List[int], gate_number: int) -> int:
+    """Lowers one gate whose arguments are already lowered.
+
+    Args:
+        aig (AndInverterGraph): The graph to extend.
+        tables (FaultTreeTables): The indexed fault tree.
+        literals (List[int]): The literal of every node index lowered so far; updated in place.
+        gate_number (int): Zero-based gate number in the tables.
+
+    Returns:
+        int: The literal of the gate.
+
+    Raises:
+        ValueError: If a NOT gate does not have exactly one argument.
+    """
+    offsets = tables.child_offsets
+    arguments = [literals[x] for x in tables.children[offsets[gate_number]:offsets[gate_number + 1]]]
+    operator = OPERATORS[tables.operators[gate_number]]
+    if operator == "and":
+        literal = aig.add_and_all(arguments)
+    elif operator == "or":
+        literal = aig.add_or_all(arguments)
+    elif operator == "not":
+        if len(arguments) != 1:
+            raise ValueError(f"NOT gate {tables.gates[gate_number].name} must have exactly one argument")
+        literal = arguments[0] ^ 1
+    elif operator == "xor":
+        literal = aig.add_parity(arguments)
+    else:
+        literal = aig.add_atleast(tables.k_nums[gate_number], arguments)
+    literals[tables.gate_offset + gate_number] = literal
+    return literal
+
+
+def initial_literals(tables: FaultTreeTables) -> List[int]:
+    """Returns the literals of the events, with placeholders for the gates.
+
+    Args:
+        tables (FaultTreeTables): The indexed fault tree.
+
+    Returns:
+        List[int]: Input literals of basic events, constants of house events, and -1 for gates.
+    """
+    literals = [AndInverterGraph.input_literal(i) for i in range(len(tables.basic_events))]
+    literals.extend(TRUE if x else FALSE for x in tables.house_states)
+    literals.extend([-1] * len(tables.gates))
+    return literals
+
+
+def lower_fault_tree(fault_tree: FaultTree) -> Tuple[AndInverterGraph, FaultTreeTables, int]:
+    """Lowers the gates reachable from the top gate into an and-inverter graph.
+
+    Args:
+        fault_tree (FaultTree): The fault tree to lower.
+
+    Returns:
+        Tuple[AndInverterGraph, FaultTreeTables, int]: The graph, the tables whose basic events
+        are the inputs, and the literal of the top gate.
+
+    Raises:
+        ValueError: If there is no top gate, a gate is malformed, or the gates form a cycle.
+    """
+    tables = FaultTreeTables.from_fault_tree(fault_tree)
+    if tables.top_index < 0:
+        raise ValueError("The fault tree has no top gate")
+    aig = AndInverterGraph(len(tables.basic_events))
+    literals = initial_literals(tables)
+    for gate_number in tables.topological_order([tables.top_index - tables.gate_offset]):
+        lower_gate(aig, tables, literals, gate_number)
+    return aig, tables, literals[tables.top_index]
+
+
+def write_aiger(fault_tree: FaultTree, path: str, symbols: bool = True) -> AndInverterGraph:
+    """Writes the fault tree as a binary AIGER file with the top gate as the only output.
+
+    Args:
+        fault_tree (FaultTree): The fault tree to export.
+        path (str): The destination file path; compressed by the extension.
+        symbols (bool): Whether to write the names of the basic events and the top gate.
+
+    Returns:
+        AndInverterGraph: The graph that was written.
+
+    Raises:
+        ValueError: If there is no top gate or a gate is malformed.
+    """
+    aig, tables, output = lower_fault_tree(fault_tree)
+    input_names = [x.name for x in tables.basic_events] if symbols else []
+    output_names = [fault_tree.top_gate.name] if symbols else []
+    with open_output(path) as out:
+        aig.write(out, [output], input_names, output_names, fault_tree.name or "")
+    return aig
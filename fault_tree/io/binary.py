@@ -0,0 +1,436 @@
+"""Versioned binary fault tree format with a memory-mapped reader.
+
+The file consists of a fixed-size header followed by 8-byte aligned sections:
+
+========================  =========  =============================================
+Section                   Type       Length
+========================  =========  =============================================
+string offsets            uint64     num_nodes + 2 (node names, then the tree name)
+string data               utf-8      variable
+operators                 uint8      num_gates
+k numbers                 uint32     num_gates
+child offsets (CSR)       uint64     num_gates + 1
+children (CSR)            uint32     num_children
+probabilities             float64    num_basic
+house states              uint8      num_house
+========================  =========  =============================================
+
+All numbers are little-endian. Node indices follow ``FaultTreeTables``:
+basic events, then house events, then gates.
+
+The format keeps the structure and one value per basic event only:
+probabilities are stored as ``FaultTreeTables.probabilities`` reduces them,
+so lognormal distributions come back as point estimates of their means, and
+CCF groups are not stored at all. Use the ``.npz`` export for the CCF groups.
+"""
+import math
+import mmap
+import struct
+import sys
+from array import array
+from typing import Dict, IO, List, Optional, Tuple, Union
+
+from ordered_set import OrderedSet
+
+from fault_tree import FaultTree
+from fault_tree.event import Event, BasicEvent, HouseEvent, Gate
+from fault_tree.probability import PointEstimate
+from fault_tree.io.compression import compression_for, open_input, open_output
+from fault_tree.io.tables import FaultTreeTables, OPERATORS, build_fault_tree
+
+MAGIC = b"FTBINARY"
+VERSION = 1
+FLAG_NAMED = 0x1  # The tree name is present in the string table.
+
+# magic, version, flags, top index, num basic, num house, num gates, num children,
+# and the byte offsets of the eight sections plus the end of the file.
+_HEADER = struct.Struct("<8sHHq4Q9Q")
+_ALIGNMENT = 8
+_SECTION_TYPES = ('Q', 'B', 'B', 'I', 'Q', 'I', 'd', 'B')
+_LITTLE_ENDIAN = sys.byteorder == 'little'
+
+
+def _aligned(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def write_binary(fault_tree: FaultTree, path: str) -> FaultTreeTables:
+    """Writes the fault tree into the binary format.
+
+    Args:
+        fault_tree (FaultTree): The fault tree to serialize.
+        path (str): The destination file path.
+
+    Returns:
+        FaultTreeTables: The tables that were written.
+
+    Raises:
+        ValueError: If the fault tree cannot be indexed or is too large for 32-bit children.
+    """
+    tables = FaultTreeTables.from_fault_tree(fault_tree)
+    write_tables(tables, path)
+    return tables
+
+
+def write_tables(tables: FaultTreeTables, path: str):
+    """Writes already indexed fault tree tables into the binary format.
+
+    Args:
+        tables (FaultTreeTables): The indexed fault tree.
+        path (str): The destination file path.
+
+    Raises:
+        ValueError: If there are too many nodes for 32-bit child indices.
+    """
+    with open_output(path) as f:
+        dump_tables(tables, f)
+
+
+def dump_tables(tables: FaultTreeTables, f: IO):
+    """Writes already indexed fault tree tables into a binary stream.
+
+    Args:
+        tables (FaultTreeTables): The indexed fault tree.
+        f (IO): A binary file object; it is written sequentially.
+
+    Raises:
+        ValueError: If there are too many nodes for 32-bit child indices.
+    """
+    if tables.num_nodes >= 2 ** 32:
+        raise ValueError("Too many nodes for the binary fault tree format")
+    string_offsets = array('Q', [0])
+    string_data = bytearray()
+    for name in tables.names() + [tables.name or '']:
+        string_data += name.encode('utf-8')
+        string_offsets.append(len(string_data))
+
+    sections = []
+    for section in [string_offsets, string_data, tables.operators, tables.k_nums,
+                    tables.child_offsets, tables.children, tables.probabilities, tables.house_states]:
+        if isinstance(section, array) and section.itemsize > 1 and not _LITTLE_ENDIAN:
+            section = array(section.typecode, section)
+            section.byteswap()
+        sections.append(memoryview(section).cast('B'))
+    offsets = []
+    position = _HEADER.size
+    for section in sections:
+        position = _aligned(position)
+        offsets.append(position)
+        position += len(section)
+    offsets.append(position)
+
+    # The layout is computed upfront, so the file is written sequentially and may be compressed.
+    f.write(_HEADER.pack(MAGIC, VERSION, FLAG_NAMED if tables.name is not None else 0,
+                         tables.top_index, len(tables.basic_events), len(tables.house_events),
+                         len(tables.gates), len(tables.children), *offsets))
+    position = _HEADER.size
+    for offset, section in zip(offsets, sections):
+        f.write(bytes(offset - position))
+        f.write(section)
+        position = offset + len(section)
+
+
+def read_binary(path: str) -> 'MappedFaultTree':
+    """Opens a binary fault tree file as a read-only memory-mapped view.
+
+    Compressed files are decompressed into memory instead of being mapped.
+
+    Args:
+        path (str): The path to the binary file.
+
+    Returns:
+        MappedFaultTree: The lazily materialized view of the fault tree.
+    """
+    return MappedFaultTree(path)
+
+
+class MappedGate(Gate):
+    """Read-only gate backed by a memory-mapped binary fault tree.
+
+    The arguments are decoded from the file on first access.
+    Parents are not tracked because the format stores only the child direction.
+    """
+
+    def __init__(self, tree: 'MappedFaultTree', index: int):
+        """Initializes the view of the gate with the given node index.
+
+        Args:
+            tree (MappedFaultTree): The owning memory-mapped fault tree.
+            index (int): The node index of the gate.
+        """
+        Event.__init__(self, tree.node_name(index))
+        gate_number = index - tree.gate_offset
+        self.mark: Optional[str] = None
+        self.operator = OPERATORS[tree._operators[gate_number]]
+        self.k_num: Optional[int] = tree._k_nums[gate_number] or None
+        self.index: int = index
+        self._tree = tree
+        self._arguments: Optional[Tuple[OrderedSet, OrderedSet, OrderedSet]] = None
+
+    def _load(self) -> Tuple[OrderedSet, OrderedSet, OrderedSet]:
+        if self._arguments is None:
+            tree = self._tree
+            g_arguments, b_arguments, h_arguments = OrderedSet(), OrderedSet(), OrderedSet()
+            for child in tree.child_indices(self.index):
+                node = tree.node(child)
+                if child >= tree.gate_offset:
+                    g_arguments.add(node)
+                elif child >= tree.num_basic:
+                    h_arguments.add(node)
+                else:
+                    b_arguments.add(node)
+            self._arguments = (g_arguments, b_arguments, h_arguments)
+        return self._arguments
+
+    @property
+    def g_arguments(self) -> OrderedSet:
+        return self._load()[0]
+
+    @property
+    def b_arguments(self) -> OrderedSet:
+        return self._load()[1]
+
+    @property
+    def h_arguments(self) -> OrderedSet:
+        return self._load()[2]
+
+    @property
+    def u_arguments(self) -> OrderedSet:
+        return OrderedSet()
+
+    def num_arguments(self) -> int:
+        """Returns the number of arguments without decoding them."""
+        gate_number = self.index - self._tree.gate_offset
+        return self._tree._child_offsets[gate_number + 1] - self._tree._child_offsets[gate_number]
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Memory-mapped gates are read-only")
+
+    add_basic_event = add_house_event = add_event = add_gate = add_argument = _read_only
+
+
+class MappedNodes:
+    """Lazy sequence of the nodes in one index range of a memory-mapped fault tree."""
+
+    def __init__(self, tree: 'MappedFaultTree', start: int, stop: int):
+        self._tree = tree
+        self._start = start
+        self._stop = stop
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __getitem__(self, item: Union[int, slice]):
+        if isinstance(item, slice):
+            return [self[i] for i in range(*item.indices(len(self)))]
+        if item < 0:
+            item += len(self)
+        if not 0 <= item < len(self):
+            raise IndexError("node index out of range")
+        return self._tree.node(self._start + item)
+
+    def __iter__(self):
+        for index in range(self._start, self._stop):
+            yield self._tree.node(index)
+
+    def __contains__(self, event: object) -> bool:
+        if not isinstance(event, Event):
+            return False
+        index = self._tree.find(event.name)
+        return index is not None and self._start <= index < self._stop
+
+
+class MappedFaultTree:
+    """Read-only, memory-mapped view of a binary fault tree file.
+
+    Opening the file only parses the header; sections are exposed as zero-copy
+    memoryviews, and nodes are materialized on first access and cached.
+    Basic and house events become regular events, while gates are ``MappedGate`` views.
+
+    Attributes:
+        path (str): The path to the binary file.
+        name (Optional[str]): The name of the fault tree.
+        num_basic (int): The number of basic events.
+        num_house (int): The number of house events.
+        num_gates (int): The number of gates.
+        gate_offset (int): The node index of the first gate.
+        basic_events (MappedNodes): Lazy sequence of basic events.
+        house_events (MappedNodes): Lazy sequence of house events.
+        gates (MappedNodes): Lazy sequence of gates.
+    """
+
+    def __init__(self, path: str):
+        """Maps the file and validates its header.
+
+        Args:
+            path (str): The path to the binary file.
+
+        Raises:
+            ValueError: If the file is not a supported binary fault tree.
+        """
+        self.path = path
+        if compression_for(path):
+            with open_input(path) as f:
+                self._mmap = f.read()
+        else:
+            with open(path, 'rb') as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._parse_header()
+        except Exception:
+            self._unmap()
+            raise
+        self._cache: Dict[int, Event] = {}
+        self._name_index: Optional[Dict[str, int]] = None
+        self.top_gates = None
+        self.ccf_groups: OrderedSet = OrderedSet()
+        self.basic_events = MappedNodes(self, 0, self.num_basic)
+        self.house_events = MappedNodes(self, self.num_basic, self.gate_offset)
+        self.gates = MappedNodes(self, self.gate_offset, self.gate_offset + self.num_gates)
+
+    def _parse_header(self):
+        if len(self._mmap) < _HEADER.size:
+            raise ValueError(f"{self.path} is too small to be a binary fault tree")
+        fields = _HEADER.unpack_from(self._mmap, 0)
+        magic, version, flags, top_index, num_basic, num_house, num_gates, num_children = fields[:8]
+        offsets = fields[8:]
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a binary fault tree")
+        if version != VERSION:
+            raise ValueError(f"Unsupported binary fault tree version: {version}")
+        if offsets[-1] > len(self._mmap):
+            raise ValueError(f"{self.path} is truncated")
+        if offsets[-1] < len(self._mmap):
+            raise ValueError(f"{self.path} has data after the fault tree, e.g. a second tree")
+        self.num_basic: int = num_basic
+        self.num_house: int = num_house
+        self.num_gates: int = num_gates
+        self.gate_offset: int = num_basic + num_house
+        self._top_index: int = top_index
+
+        view = memoryview(self._mmap)
+        sections = []
+        for typecode, start, stop in zip(_SECTION_TYPES, offsets, offsets[1:]):
+            itemsize = struct.calcsize(typecode)
+            stop = start + (stop - start) // itemsize * itemsize  # drop the alignment padding
+            sections.append(self._column(view[start:stop], typecode))
+        (self._string_offsets, self._string_data, self._operators, self._k_nums,
+         self._child_offsets, self._children, self._probabilities, self._house_states) = sections
+        num_nodes = self.gate_offset + num_gates
+        self._string_data = self._string_data[:self._string_offsets[num_nodes + 1]]
+        self._child_offsets = self._child_offsets[:num_gates + 1]
+        self._children = self._children[:num_children]
+        self._probabilities = self._probabilities[:num_basic]
+        self._house_states = self._house_states[:num_house]
+        self.name: Optional[str] = self.node_name(num_nodes) if flags & FLAG_NAMED else None
+
+    @staticmethod
+    def _column(buffer: memoryview, typecode: str):
+        if typecode == 'B' or _LITTLE_ENDIAN:
+            return buffer.cast(typecode)
+        column = array(typecode, buffer.tobytes())
+        column.byteswap()
+        return column
+
+    def close(self):
+        """Releases the memory map.
+
+        Nodes materialized so far stay valid, but gates whose arguments
+        have not been decoded yet can no longer be expanded.
+        """
+        for column in (self._string_offsets, self._string_data, self._operators, self._k_nums,
+                       self._child_offsets, self._children, self._probabilities, self._house_states):
+            if isinstance(column, memoryview):
+                column.release()
+        self._unmap()
+
+    def _unmap(self):
+        if isinstance(self._mmap, mmap.mmap):
+            self._mmap.close()
+
+    def __enter__(self) -> 'MappedFaultTree':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def node_name(self, index: int) -> str:
+        """Decodes the name of the node with the given index.
+
+        Args:
+            index (int): The node index.
+
+        Returns:
+            str: The name of the node.
+        """
+        return str(self._string_data[self._string_offsets[index]:self._string_offsets[index + 1]], 'utf-8')
+
+    def child_indices(self, index: int) -> List[int]:
+        """Returns the node indices of the gate arguments without materializing them.
+
+        Args:
+            index (int): The node index of the gate.
+
+        Returns:
+            List[int]: The CSR row with argument node indices.
+        """
+        gate_number = index - self.gate_offset
+        return self._children[self._child_offsets[gate_number]:self._child_offsets[gate_number + 1]].tolist()
+
+    def node(self, index: int) -> Event:
+        """Materializes the node with the given index.
+
+        Args:
+            index (int): The node index.
+
+        Returns:
+            Event: A basic event, a house event, or a mapped gate.
+        """
+        node = self._cache.get(index)
+        if node is None:
+            if index >= self.gate_offset:
+                node = MappedGate(self, index)
+            elif index >= self.num_basic:
+                state = 'true' if self._house_states[index - self.num_basic] else 'false'
+                node = HouseEvent(self.node_name(index), state)
+            else:
+                value = self._probabilities[index]
+                node = BasicEvent(self.node_name(index), None if math.isnan(value) else PointEstimate(value))
+            self._cache[index] = node
+        return node
+
+    def find(self, name: str) -> Optional[int]:
+        """Looks up the node index by name; the name index is built on first use.
+
+        Args:
+            name (str): The name of the node.
+
+        Returns:
+            Optional[int]: The node index or None if there is no such node.
+        """
+        if self._name_index is None:
+            self._name_index = {self.node_name(i): i for i in range(self.gate_offset + self.num_gates)}
+        return self._name_index.get(name)
+
+    @property
+    def top_gate(self) -> Optional[MappedGate]:
+        """The top gate of the fault tree."""
+        return self.node(self._top_index) if self._top_index >= 0 else None
+
+    def expr(self) -> str:
+        """Returns the boolean expression string for the fault tree."""
+        top_gate = self.top_gate
+        return top_gate.expr() if top_gate is not None else ""
+
+    def to_fault_tree(self) -> FaultTree:
+        """Materializes the whole file into a regular, mutable fault tree.
+
+        Returns:
+            FaultTree: A fault tree with the same nodes and structure, without CCF groups,
+            and with point estimate probabilities (see the module documentation).
+        """
+        basic_events = [BasicEvent(x.name, x.probability) for x in self.basic_events]
+        house_events = [HouseEvent(x.name, x.state) for x in self.house_events]
+        gate_names = [self.node_name(i) for i in range(self.gate_offset, self.gate_offset + self.num_gates)]
+        return build_fault_tree(self.name, basic_events, house_events, gate_names, self._operators, self._k_nums,
+                                self._child_offsets, self._children, self._top_index)
@@ -0,0 +1,92 @@
+"""Transparent compression of output files chosen by the file extension.
+
+All supported codecs allow concatenating independently compressed members
+into one valid file, so every record (e.g. one fault tree) can be compressed
+on its own, in parallel, and the results simply appended.
+"""
+import bz2
+import gzip
+import lzma
+from typing import IO, Optional
+
+COMPRESSIONS = {
+    '.gz': gzip,
+    '.xz': lzma,
+    '.bz2': bz2,
+}
+
+
+def compression_for(path: str) -> Optional[str]:
+    """Determines the compression of a file from its extension.
+
+    Args:
+        path (str): The path to the file.
+
+    Returns:
+        Optional[str]: The extension of a supported codec, or None for uncompressed files.
+    """
+    for extension in COMPRESSIONS:
+        if path.endswith(extension):
+            return extension
+    return None
+
+
+def compress(data: bytes, compression: Optional[str]) -> bytes:
+    """Compresses the data into a standalone member.
+
+    Args:
+        data (bytes): The data to compress.
+        compression (Optional[str]): The codec extension from ``compression_for``.
+
+    Returns:
+        bytes: The compressed member, or the data itself if there is no compression.
+    """
+    if compression is None:
+        return data
+    return COMPRESSIONS[compression].compress(data)
+
+
+def decompress(data: bytes, compression: Optional[str]) -> bytes:
+    """Decompresses one or more concatenated members.
+
+    Args:
+        data (bytes): The compressed data.
+        compression (Optional[str]): The codec extension from ``compression_for``.
+
+    Returns:
+        bytes: The decompressed data.
+    """
+    if compression is None:
+        return data
+    return COMPRESSIONS[compression].decompress(data)
+
+
+def open_output(path: str, mode: str = 'wb') -> IO:
+    """Opens a file for writing, compressing the stream if the extension asks for it.
+
+    Args:
+        path (str): The path to the file.
+        mode (str): A binary write or append mode.
+
+    Returns:
+        IO: A binary file object.
+    """
+    compression = compression_for(path)
+    if compression is None:
+        return open(path, mode)
+    return COMPRESSIONS[compression].open(path, mode)
+
+
+def open_input(path: str) -> IO:
+    """Opens a possibly compressed file for binary reading.
+
+    Args:
+        path (str): The path to the file.
+
+    Returns:
+        IO: A binary file object with the decompressed contents.
+    """
+    compression = compression_for(path)
+    if compression is None:
+        return open(path, 'rb')
+    return COMPRESSIONS[compression].open(path, 'rb')
@@ -0,0 +1,249 @@
+"""Sidecar byte-offset index for files with one fault tree expression per line.
+
+The index file has a fixed-size header, one fixed-size record per tree slot,
+and the JSON-encoded generation factors after the last record.
+Records are addressed by their slot, so looking up a tree is O(1)
+regardless of the order in which the trees were appended to the corpus.
+Each record spans the stored bytes of one tree, including its line terminator;
+in compressed corpora it spans the independently compressed member of the tree.
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+from collections import namedtuple
+from typing import Any, Dict, Iterator, List, Optional
+
+from fault_tree.io.compression import compression_for, decompress
+
+MAGIC = b"FTINDEX\0"
+VERSION = 1
+FLAG_PRESENT = 0x1  # The slot holds a tree.
+
+# magic, version, record size, reserved (written as 0; keeps the 64-bit fields and the records 8-byte aligned
+# for the ``Q`` view of the reader), number of slots, factors offset, factors length
+_HEADER = struct.Struct("<8sHHIQQQ")
+# offset, length, seed, flags
+_RECORD = struct.Struct("<QQQQ")
+
+CorpusEntry = namedtuple('CorpusEntry', ['slot', 'offset', 'length', 'seed'])
+
+
+def index_path_for(corpus_path: str) -> str:
+    """Returns the default sidecar index path for a corpus file.
+
+    Args:
+        corpus_path (str): The path to the corpus file.
+
+    Returns:
+        str: The path of the index next to the corpus.
+    """
+    return corpus_path + ".idx"
+
+
+class CorpusIndexWriter:
+    """Writes the sidecar index of a corpus while the trees are being appended.
+
+    Slots may be filled in any order; unfilled slots are marked as absent.
+
+    Attributes:
+        path (str): The path to the index file.
+        num_slots (int): One more than the largest slot written so far.
+    """
+
+    def __init__(self, path: str, num_slots: int = 0):
+        """Creates (or truncates) the index file.
+
+        Args:
+            path (str): The path to the index file.
+            num_slots (int): The expected number of slots, e.g. the number of trees to generate.
+        """
+        self.path = path
+        self.num_slots = num_slots
+        self._file = open(path, 'wb')
+        self._file.write(bytes(_HEADER.size))
+
+    def add(self, slot: int, offset: int, length: int, seed: int = 0):
+        """Records the location of a tree in the corpus.
+
+        Args:
+            slot (int): Zero-based slot of the tree.
+            offset (int): Byte offset of the tree in the corpus.
+            length (int): Byte length of the stored tree.
+            seed (int): The seed the tree was generated with.
+        """
+        if slot < 0:
+            raise ValueError("Index slots cannot be negative")
+        self._file.seek(_HEADER.size + slot * _RECORD.size)
+        self._file.write(_RECORD.pack(offset, length, seed, FLAG_PRESENT))
+        self.num_slots = max(self.num_slots, slot + 1)
+
+    def close(self, factors: Optional[Dict[str, Any]] = None):
+        """Writes the generation factors and the header, then closes the file.
+
+        Args:
+            factors (Optional[Dict[str, Any]]): JSON-serializable factors shared by all trees.
+        """
+        if self._file.closed:
+            return
+        factors_offset = _HEADER.size + self.num_slots * _RECORD.size
+        factors_data = json.dumps(factors if factors is not None else {}).encode('utf-8')
+        self._file.seek(factors_offset)
+        self._file.write(factors_data)
+        self._file.truncate()
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(MAGIC, VERSION, _RECORD.size, 0, self.num_slots,
+                                      factors_offset, len(factors_data)))
+        self._file.close()
+
+    def __enter__(self) -> 'CorpusIndexWriter':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class CorpusReader:
+    """Random access to the trees of an indexed corpus.
+
+    Both the corpus and the index are memory-mapped,
+    so extracting a tree touches only the pages that hold it.
+    Trees of compressed corpora are decompressed member by member.
+
+    Attributes:
+        path (str): The path to the corpus file.
+        index_path (str): The path to the index file.
+        factors (Dict[str, Any]): The generation factors recorded in the index.
+    """
+
+    def __init__(self, path: str, index_path: Optional[str] = None):
+        """Maps the corpus and its index.
+
+        Args:
+            path (str): The path to the corpus file.
+            index_path (Optional[str]): The path to the index. Defaults to the sidecar next to the corpus.
+
+        Raises:
+            ValueError: If the index is not a valid corpus index.
+        """
+        self.path = path
+        self.index_path = index_path or index_path_for(path)
+        self._compression = compression_for(path)
+        self._corpus = self._map(path)
+        self._index = self._map(self.index_path)
+        if self._index is None or len(self._index) < _HEADER.size:
+            raise ValueError(f"{self.index_path} is not a corpus index")
+        magic, version, record_size, _reserved, num_slots, factors_offset, factors_length = \
+            _HEADER.unpack_from(self._index, 0)
+        if magic != MAGIC or record_size != _RECORD.size:
+            raise ValueError(f"{self.index_path} is not a corpus index")
+        if version != VERSION:
+            raise ValueError(f"Unsupported corpus index version: {version}")
+        self._num_slots = num_slots
+        self.factors: Dict[str, Any] = json.loads(
+            bytes(self._index[factors_offset:factors_offset + factors_length]) or b"{}")
+        self._records = memoryview(self._index)[_HEADER.size:factors_offset].cast('Q')
+        if sys.byteorder != 'little':
+            self._records = [int.from_bytes(self._index[i:i + 8], 'little')
+                             for i in range(_HEADER.size, factors_offset, 8)]
+
+    @staticmethod
+    def _map(path: str) -> Optional[mmap.mmap]:
+        if not os.path.getsize(path):
+            return None  # empty files cannot be mapped
+        with open(path, 'rb') as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        """Unmaps the corpus and the index."""
+        if isinstance(self._records, memoryview):
+            self._records.release()
+        for mapped in (self._corpus, self._index):
+            if mapped is not None:
+                mapped.close()
+
+    def __enter__(self) -> 'CorpusReader':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self) -> int:
+        return self._num_slots
+
+    def entry(self, slot: int) -> Optional[CorpusEntry]:
+        """Returns the index record of a slot.
+
+        Args:
+            slot (int): Zero-based slot of the tree.
+
+        Returns:
+            Optional[CorpusEntry]: The location and seed of the tree, or None if the slot is absent.
+        """
+        if slot < 0:
+            slot += self._num_slots
+        if not 0 <= slot < self._num_slots:
+            raise IndexError("corpus slot out of range")
+        base = slot * 4
+        offset, length, seed, flags = self._records[base:base + 4]
+        if not flags & FLAG_PRESENT:
+            return None
+        return CorpusEntry(slot, offset, length, seed)
+
+    def read_record(self, slot: int) -> bytes:
+        """Extracts the complete stored record of a tree, e.g. a binary or XML document.
+
+        Args:
+            slot (int): Zero-based slot of the tree.
+
+        Returns:
+            bytes: The decompressed record.
+
+        Raises:
+            KeyError: If the slot holds no tree.
+        """
+        entry = self.entry(slot)
+        if entry is None:
+            raise KeyError(f"Corpus slot {slot} holds no tree")
+        if not entry.length:
+            return b""
+        return decompress(self._corpus[entry.offset:entry.offset + entry.length], self._compression)
+
+    def read_bytes(self, slot: int) -> bytes:
+        """Extracts the raw bytes of a tree line.
+
+        Args:
+            slot (int): Zero-based slot of the tree.
+
+        Returns:
+            bytes: The decompressed tree without the line terminator.
+
+        Raises:
+            KeyError: If the slot holds no tree.
+        """
+        data = self.read_record(slot)
+        return data[:-1] if data.endswith(b'\n') else data
+
+    def __getitem__(self, slot: int) -> str:
+        return self.read_bytes(slot).decode('utf-8')
+
+    def range(self, start: int, stop: int) -> List[str]:
+        """Extracts the trees of consecutive slots, skipping absent ones.
+
+        This is the unit of work to hand to parallel consumers.
+
+        Args:
+            start (int): The first slot.
+            stop (int): One past the last slot.
+
+        Returns:
+            List[str]: The trees in slot order.
+        """
+        return [self[slot] for slot in range(max(start, 0), min(stop, self._num_slots))
+                if self.entry(slot) is not None]
+
+    def __iter__(self) -> Iterator[str]:
+        for slot in range(self._num_slots):
+            if self.entry(slot) is not None:
+                yield self[slot]
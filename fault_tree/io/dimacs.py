@@ -0,0 +1,204 @@
+"""Tseitin encoding of fault trees into CNF in the DIMACS format.
+
+Every node gets the variable ``index + 1`` of its ``FaultTreeTables`` index,
+so basic events are variables ``1..num_basic``, house events follow, and gates
+come last. Auxiliary variables of XOR chains and AT-LEAST counters are numbered
+after all nodes. Each gate variable is constrained to be equivalent to its
+formula, so the encoding is satisfiability- and model-count-preserving over the
+event variables:
+
+- AND, OR, and NOT gates take the usual ``n + 1`` (or 2) clauses.
+- XOR gates are the parity of their arguments, chained through binary XORs.
+- AT-LEAST gates use a sequential counter with ``O(n * k)`` clauses,
+  where counter cell ``(i, j)`` holds iff at least ``j`` of the first ``i`` arguments hold.
+
+House events are fixed by unit clauses, and the top gate is asserted unless asked otherwise.
+The header comments map the event and gate variables back to their names.
+"""
+from array import array
+from typing import IO, List, Union
+
+from fault_tree import FaultTree
+from fault_tree.io.compression import open_output
+from fault_tree.io.tables import FaultTreeTables, OPERATORS
+
+# Literals are non-zero integers; these constants are simplified away while encoding.
+Literal = Union[int, bool]
+
+_CHUNK_LITERALS = 1 << 20
+
+
+class CnfEncoding:
+    """Clauses of a fault tree in a flat, zero-terminated literal array.
+
+    Attributes:
+        tables (FaultTreeTables): The indexed fault tree.
+        num_vars (int): The number of variables, auxiliary ones included.
+        num_clauses (int): The number of clauses.
+        literals (array): The clauses, each terminated by 0 as in DIMACS ('i').
+    """
+
+    def __init__(self, tables: FaultTreeTables):
+        """Initializes an empty encoding over the nodes of the tables.
+
+        Args:
+            tables (FaultTreeTables): The indexed fault tree.
+        """
+        self.tables = tables
+        self.num_vars = tables.num_nodes
+        self.num_clauses = 0
+        self.literals = array('i')
+
+    def new_var(self) -> int:
+        """Allocates an auxiliary variable."""
+        self.num_vars += 1
+        return self.num_vars
+
+    def add_clause(self, *clause: Literal):
+        """Adds a clause, dropping it if satisfied by a constant and omitting false literals."""
+        if any(x is True for x in clause):
+            return
+        self.literals.extend(x for x in clause if x is not False)
+        self.literals.append(0)
+        self.num_clauses += 1
+
+    def encode_gate(self, gate_number: int):
+        """Adds the clauses making the gate variable equivalent to the gate formula.
+
+        Args:
+            gate_number (int): Zero-based gate number in the tables.
+
+        Raises:
+            ValueError: If a NOT gate does not have exactly one argument.
+        """
+        tables = self.tables
+        output = tables.gate_offset + gate_number + 1
+        arguments = [x + 1 for x in tables.children[tables.child_offsets[gate_number]:
+                                                     tables.child_offsets[gate_number + 1]]]
+        operator = OPERATORS[tables.operators[gate_number]]
+        if operator in ("and", "or"):
+            sign = 1 if operator == "and" else -1
+            # The binary clauses (-output | argument) of AND, or (output | -argument) of OR
+            literals = self.literals
+            for argument in arguments:
+                literals.extend((-sign * output, sign * argument, 0))
+            literals.extend([sign * output] + [-sign * x for x in arguments])
+            literals.append(0)
+            self.num_clauses += len(arguments) + 1
+        elif operator == "not":
+            if len(arguments) != 1:
+                raise ValueError(f"NOT gate {tables.gates[gate_number].name} must have exactly one argument")
+            self.add_clause(-output, -arguments[0])
+            self.add_clause(output, arguments[0])
+        elif operator == "xor":
+            self._encode_xor(output, arguments)
+        else:
+            self._encode_atleast(output, arguments, tables.k_nums[gate_number])
+
+    def _equal(self, output: int, literal: Literal):
+        self.add_clause(-output, literal)
+        self.add_clause(output, _negate(literal))
+
+    def _encode_xor(self, output: int, arguments: List[int]):
+        if not arguments:
+            self.add_clause(-output)
+            return
+        parity = arguments[0]
+        for number, argument in enumerate(arguments[1:], start=2):
+            target = output if number == len(arguments) else self.new_var()
+            self.literals.extend((-target, parity, argument, 0, -target, -parity, -argument, 0,
+                                  target, -parity, argument, 0, target, parity, -argument, 0))
+            self.num_clauses += 4
+            parity = target
+        if len(arguments) == 1:
+            self._equal(output, parity)
+
+    def _encode_atleast(self, output: int, arguments: List[int], k_num: int):
+        num_arguments = len(arguments)
+        if k_num <= 0 or k_num > num_arguments:
+            self.add_clause(output if k_num <= 0 else -output)
+            return
+        # counts[j] holds iff at least j of the arguments seen so far hold.
+        counts: List[Literal] = [True] + [False] * k_num
+        for i, argument in enumerate(arguments, start=1):
+            # Cells that can no longer reach k, or are not reachable yet, stay constant.
+            low = max(1, k_num - (num_arguments - i))
+            for j in range(min(i, k_num), low - 1, -1):
+                before, carry = counts[j], counts[j - 1]
+                cell = output if (i, j) == (num_arguments, k_num) else self.new_var()
+                self.add_clause(_negate(before), cell)
+                self.add_clause(_negate(carry), -argument, cell)
+                self.add_clause(-cell, before, carry)
+                self.add_clause(-cell, before, argument)
+                counts[j] = cell
+
+    def write(self, out: IO, assert_top: bool = True):
+        """Writes the encoding in the DIMACS format.
+
+        Args:
+            out (IO): A binary file object.
+            assert_top (bool): Whether to add the unit clause of the top gate.
+        """
+        tables = self.tables
+        top = tables.top_index + 1 if assert_top and tables.top_index >= 0 else 0
+        header = [f"c fault tree {tables.name or ''}".rstrip()]
+        header.extend(f"c {i} {name}" for i, name in enumerate(tables.names(), start=1))
+        header.append(f"p cnf {self.num_vars} {self.num_clauses + bool(top)}")
+        out.write(("\n".join(header) + "\n").encode('utf-8'))
+        literals = self.literals
+        start = 0
+        while start < len(literals):
+            stop = min(start + _CHUNK_LITERALS, len(literals))
+            while literals[stop - 1] != 0:  # end the chunk with a whole clause
+                stop += 1
+            text = " ".join(map(str, literals[start:stop]))
+            out.write((text.replace(" 0 ", " 0\n") + "\n").encode('ascii'))
+            start = stop
+        if top:
+            out.write(f"{top} 0\n".encode('ascii'))
+
+
+def _negate(literal: Literal) -> Literal:
+    return not literal if isinstance(literal, bool) else -literal
+
+
+def encode_cnf(fault_tree: FaultTree) -> CnfEncoding:
+    """Tseitin-encodes all gates and house events of a fault tree.
+
+    Args:
+        fault_tree (FaultTree): The fault tree to encode.
+
+    Returns:
+        CnfEncoding: The clauses, without the unit clause of the top gate.
+
+    Raises:
+        ValueError: If the fault tree cannot be indexed or has malformed gates.
+    """
+    tables = FaultTreeTables.from_fault_tree(fault_tree)
+    encoding = CnfEncoding(tables)
+    for number, state in enumerate(tables.house_states):
+        variable = len(tables.basic_events) + number + 1
+        encoding.add_clause(variable if state else -variable)
+    for gate_number in range(len(tables.gates)):
+        encoding.encode_gate(gate_number)
+    return encoding
+
+
+def write_dimacs(fault_tree: FaultTree, path: str, assert_top: bool = True) -> CnfEncoding:
+    """Writes the Tseitin encoding of a fault tree into a DIMACS CNF file.
+
+    Args:
+        fault_tree (FaultTree): The fault tree to encode.
+        path (str): The destination file path; compressed by the extension.
+        assert_top (bool): Whether to assert the top gate, i.e., encode the top event occurrence.
+
+    Returns:
+        CnfEncoding: The encoding that was written.
+
+    Raises:
+        ValueError: If the fault tree cannot be indexed or has malformed gates.
+    """
+    encoding = encode_cnf(fault_tree)
+    with open_output(path) as out:
+        encoding.write(out, assert_top)
+    return encoding
@@ -0,0 +1,329 @@
+"""Parser of the boolean expression strings emitted by ``Gate.expr``.
+
+The grammar is that of ``Gate.expr``: ``(a*b)`` for AND, ``(a+b)`` for OR,
+``(a^b)`` for XOR, ``a'`` for NOT, and ``atleast_k(a,b,c)`` for K/N gates.
+Parsing is iterative, so deeply nested expressions do not hit the recursion limit.
+Repeated event names map to the same event, and structurally identical
+subexpressions map to the same gate, which restores the sharing that ``expr``
+flattens into copies.
+"""
+import collections
+import concurrent.futures
+import io
+import itertools
+import os
+import re
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from fault_tree import FaultTree
+from fault_tree.event import BasicEvent, HouseEvent, Gate
+from fault_tree.io.compression import compression_for, open_input
+
+_TOKEN = re.compile(r"\s*(?:atleast_(\d+)\(|([()+*^',])|([^\s()+*^',]+))")
+_SEPARATORS = {'*': 'and', '+': 'or', '^': 'xor'}
+
+# A parsed node is either an event name or a gate (operator, k_num, argument node ids).
+Node = Union[str, Tuple[str, Optional[int], Tuple[int, ...]]]
+
+
+class ExprParser:
+    """Reusable parser of fault tree expression strings.
+
+    Attributes:
+        top_gate_name (str): The name given to the top gate of parsed trees.
+        house_states (Dict[str, str]): States of the names that denote house events;
+            all other names become basic events without probabilities.
+    """
+
+    def __init__(self, top_gate_name: str = "root", house_states: Optional[Dict[str, str]] = None):
+        """Initializes the parser.
+
+        Args:
+            top_gate_name (str): The name given to the top gate of parsed trees.
+            house_states (Optional[Dict[str, str]]): House event names mapped to their states.
+        """
+        self.top_gate_name = top_gate_name
+        self.house_states: Dict[str, str] = house_states or {}
+
+    def parse(self, text: str, name: Optional[str] = None) -> FaultTree:
+        """Parses one expression into a fault tree.
+
+        Args:
+            text (str): The boolean expression of the fault tree.
+            name (Optional[str]): The name of the resulting fault tree.
+
+        Returns:
+            FaultTree: The fault tree with generated gate names.
+
+        Raises:
+            ValueError: If the expression is malformed.
+        """
+        nodes, top = self.parse_nodes(text)
+        return self.build(nodes, top, name)
+
+    def parse_nodes(self, text: str) -> Tuple[List[Node], int]:
+        """Parses one expression into a table of interned nodes.
+
+        Arguments always precede their gates in the table.
+
+        Args:
+            text (str): The boolean expression of the fault tree.
+
+        Returns:
+            Tuple[List[Node], int]: The node table and the id of the top node.
+
+        Raises:
+            ValueError: If the expression is malformed.
+        """
+        nodes: List[Node] = []
+        interned: Dict[Node, int] = {}
+
+        def intern(node: Node) -> int:
+            node_id = interned.get(node)
+            if node_id is None:
+                node_id = interned[node] = len(nodes)
+                nodes.append(node)
+            return node_id
+
+        # Each frame is [operator, k_num, argument ids]; the bottom frame holds the result.
+        frames: List[list] = [[None, None, []]]
+        expect_operand = True
+        position = 0
+        text = text.rstrip()
+        while position < len(text):
+            match = _TOKEN.match(text, position)
+            if match is None:
+                raise ValueError(f"Unexpected character at position {position}")
+            k_num, symbol, name = match.groups()
+            position = match.end()
+            if name is not None or k_num is not None or symbol == '(':
+                if not expect_operand:
+                    raise ValueError(f"Missing operator before position {match.start()}")
+                if name is not None:
+                    frames[-1][2].append(intern(name))
+                    expect_operand = False
+                else:
+                    frames.append(['atleast' if k_num else None, int(k_num) if k_num else None, []])
+            elif symbol == ')' or symbol == "'":
+                if expect_operand:
+                    raise ValueError(f"Missing operand before position {match.start()}")
+                if symbol == "'":
+                    arguments = frames[-1][2]
+                    arguments[-1] = intern(('not', None, (arguments[-1],)))
+                    continue
+                if len(frames) == 1:
+                    raise ValueError(f"Unbalanced parenthesis at position {match.start()}")
+                operator, k_num, arguments = frames.pop()
+                frames[-1][2].append(intern(self._gate(nodes, operator or 'or', k_num, arguments)))
+                expect_operand = False
+            else:
+                frame = frames[-1]
+                operator = 'atleast' if symbol == ',' else _SEPARATORS[symbol]
+                if (expect_operand or len(frames) == 1 or (frame[0] or operator) != operator or
+                        (operator == 'atleast') != (frame[1] is not None)):
+                    raise ValueError(f"Unexpected '{symbol}' at position {match.start()}")
+                frame[0] = operator
+                expect_operand = True
+        if len(frames) != 1 or len(frames[0][2]) != 1 or expect_operand:
+            raise ValueError("Incomplete expression")
+        return nodes, frames[0][2][0]
+
+    @staticmethod
+    def _gate(nodes: List[Node], operator: str, k_num: Optional[int], arguments: List[int]) -> Node:
+        """Makes the gate node, resolving arguments that would repeat in the gate."""
+        unique: List[int] = []
+        seen = set()
+        for argument in arguments:
+            if argument in seen:
+                if operator in ('and', 'or'):
+                    continue  # idempotent operators
+                if isinstance(nodes[argument], str):
+                    raise ValueError(f"Event {nodes[argument]} repeats in a {operator} gate")
+                # Distinct gates with the same structure: keep a separate, non-interned copy.
+                nodes.append(nodes[argument])
+                argument = len(nodes) - 1
+            seen.add(argument)
+            unique.append(argument)
+        return operator, k_num, tuple(unique)
+
+    def build(self, nodes: List[Node], top: int, name: Optional[str] = None) -> FaultTree:
+        """Materializes the node table into a fault tree.
+
+        Args:
+            nodes (List[Node]): The node table from ``parse_nodes``.
+            top (int): The id of the top node.
+            name (Optional[str]): The name of the resulting fault tree.
+
+        Returns:
+            FaultTree: The fault tree; a lone event is wrapped into a single-argument OR gate.
+        """
+        fault_tree = FaultTree(name)
+        event_names = {x for x in nodes if isinstance(x, str)}
+        if isinstance(nodes[top], str):
+            nodes = nodes + [('or', None, (top,))]
+            top = len(nodes) - 1
+
+        counter = 0
+
+        def gate_name() -> str:
+            nonlocal counter
+            while True:
+                counter += 1
+                candidate = f"G{counter}"
+                if candidate != self.top_gate_name and candidate not in event_names:
+                    return candidate
+
+        events: List[Any] = []
+        for node_id, node in enumerate(nodes):
+            if isinstance(node, str):
+                if node in self.house_states:
+                    event = HouseEvent(node, self.house_states[node])
+                    fault_tree.house_events.add(event)
+                else:
+                    event = BasicEvent(node, None)
+                    fault_tree.basic_events.add(event)
+            else:
+                operator, k_num, arguments = node
+                event = Gate(self.top_gate_name if node_id == top else gate_name(), operator, k_num)
+                for argument in arguments:
+                    child = events[argument]
+                    if isinstance(child, Gate):
+                        event.add_gate(child)
+                    elif isinstance(child, BasicEvent):
+                        event.add_basic_event(child)
+                    else:
+                        event.add_house_event(child)
+            events.append(event)
+        fault_tree.top_gate = events[top]
+        fault_tree.gates.add(fault_tree.top_gate)
+        fault_tree.gates.update(x for x in events if isinstance(x, Gate) and x.parents)
+        return fault_tree
+
+
+def parse_expr(text: str, name: Optional[str] = None, top_gate_name: str = "root",
+               house_states: Optional[Dict[str, str]] = None) -> FaultTree:
+    """Parses a boolean expression string into a fault tree.
+
+    Args:
+        text (str): The boolean expression, e.g. the output of ``FaultTree.expr``.
+        name (Optional[str]): The name of the resulting fault tree.
+        top_gate_name (str): The name of the top gate.
+        house_states (Optional[Dict[str, str]]): House event names mapped to their states.
+
+    Returns:
+        FaultTree: The parsed fault tree.
+
+    Raises:
+        ValueError: If the expression is malformed.
+    """
+    return ExprParser(top_gate_name, house_states).parse(text, name)
+
+
+def line_chunks(path: str, num_chunks: int) -> List[Tuple[int, int]]:
+    """Splits a file into byte ranges of similar size that start and end at line boundaries.
+
+    Args:
+        path (str): The path to the file.
+        num_chunks (int): The desired number of chunks.
+
+    Returns:
+        List[Tuple[int, int]]: Non-empty (start, stop) byte ranges covering the file.
+    """
+    size = os.path.getsize(path)
+    boundaries = [0]
+    with open(path, 'rb') as f:
+        for i in range(1, max(num_chunks, 1)):
+            f.seek(max(size * i // num_chunks, boundaries[-1]))
+            if f.tell() > 0:
+                f.readline()  # move to the start of the next line
+            boundaries.append(min(f.tell(), size))
+    boundaries.append(size)
+    return [(start, stop) for start, stop in zip(boundaries, boundaries[1:]) if stop > start]
+
+
+def _parse_lines(lines: List[str], function: Optional[Callable[[FaultTree], Any]],
+                 top_gate_name: str, house_states: Optional[Dict[str, str]]) -> List[Any]:
+    """Parses a batch of lines in a worker process."""
+    parser = ExprParser(top_gate_name, house_states)
+    results = []
+    for line in lines:
+        if line.strip():
+            fault_tree = parser.parse(line)
+            results.append(function(fault_tree) if function else fault_tree)
+    return results
+
+
+def _parse_chunk(path: str, start: int, stop: int, function: Optional[Callable[[FaultTree], Any]],
+                 top_gate_name: str, house_states: Optional[Dict[str, str]]) -> List[Any]:
+    """Parses all lines of one byte range in a worker process."""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(stop - start)
+    return _parse_lines(data.decode('utf-8').splitlines(), function, top_gate_name, house_states)
+
+
+def _line_batches(path: str, batch_size: int) -> Iterator[List[str]]:
+    """Streams the decompressed lines of a compressed file in batches."""
+    with io.TextIOWrapper(open_input(path), encoding='utf-8') as f:
+        while True:
+            batch = list(itertools.islice(f, batch_size))
+            if not batch:
+                return
+            yield batch
+
+
+def bounded_map(executor: concurrent.futures.Executor, tasks: Iterable[Tuple], window: int) -> Iterator[Any]:
+    """Submits tasks as they are drawn, with at most ``window`` of them in flight.
+
+    Args:
+        executor (concurrent.futures.Executor): The pool to run the tasks on.
+        tasks (Iterable[Tuple]): Tuples of a function and its arguments; drawn lazily.
+        window (int): The largest number of submitted tasks without a consumed result.
+
+    Returns:
+        Iterator[Any]: The results of the tasks in their order.
+    """
+    pending: Deque[concurrent.futures.Future] = collections.deque()
+    for task in tasks:
+        if len(pending) >= window:
+            yield pending.popleft().result()
+        pending.append(executor.submit(*task))
+    while pending:
+        yield pending.popleft().result()
+
+
+def parse_expr_file(path: str, function: Optional[Callable[[FaultTree], Any]] = None,
+                    max_workers: Optional[int] = None, top_gate_name: str = "root",
+                    house_states: Optional[Dict[str, str]] = None, batch_size: int = 1000) -> List[Any]:
+    """Parses a file with one expression per line using a pool of processes.
+
+    Plain files are split at line boundaries into one chunk per worker, which the
+    workers read themselves. Compressed files are decompressed here and handed
+    to the workers in batches of lines as they are read, with at most two batches
+    per worker in flight, so the whole file is never held in memory. Since moving whole fault trees between
+    processes is costly, a picklable ``function`` can reduce every tree to the
+    needed result (e.g. ``size_summary``) inside the workers.
+
+    Args:
+        path (str): The path to the multi-tree file.
+        function (Optional[Callable[[FaultTree], Any]]): Applied to each parsed tree in the workers.
+        max_workers (Optional[int]): The number of worker processes. Defaults to the number of CPUs.
+        top_gate_name (str): The name of the top gates.
+        house_states (Optional[Dict[str, str]]): House event names mapped to their states.
+        batch_size (int): The number of lines per task for compressed files.
+
+    Returns:
+        List[Any]: The parsed trees, or the results of ``function``, in file order.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    options = (function, top_gate_name, house_states)
+    if compression_for(path):
+        tasks = ((_parse_lines, batch) + options for batch in _line_batches(path, batch_size))
+    else:
+        tasks = iter([(_parse_chunk, path, start, stop) + options for start, stop in line_chunks(path, max_workers)])
+    first = list(itertools.islice(tasks, 2))
+    tasks = itertools.chain(first, tasks)
+    if max_workers == 1 or len(first) <= 1:
+        return [result for task in tasks for result in task[0](*task[1:])]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return [result for results in bounded_map(executor, tasks, 2 * max_workers) for result in results]
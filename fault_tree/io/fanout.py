@@ -0,0 +1,400 @@
+"""One-pass writer of a fault tree into several formats at once.
+
+The fault tree is indexed into ``FaultTreeTables`` and its gates are ordered
+topologically only once; every registered format sink then receives the same
+tables and the same sequence of gates, children before parents. Formats that
+need the whole structure at once (e.g. the binary format) simply write the shared
+tables when the traversal ends.
+
+New formats are added with ``register_format`` and are picked by the file
+extension (after any compression extension) or by name.
+"""
+import io
+import os
+from typing import Any, Dict, IO, List, Optional, Sequence, Tuple, Type
+from xml.sax.saxutils import quoteattr
+
+import numpy as np
+
+from fault_tree import FaultTree
+from fault_tree.probability import PointEstimate, LogNormal
+from fault_tree.probability.lognormal import MeanErrorFactor
+from fault_tree.io.aiger import AndInverterGraph, initial_literals, lower_gate
+from fault_tree.io.binary import dump_tables
+from fault_tree.io.compression import compress, compression_for, open_output
+from fault_tree.io.dimacs import CnfEncoding
+from fault_tree.io.jsonl import encode_record, tree_record
+from fault_tree.io.npz import tables_arrays
+from fault_tree.io.tables import FaultTreeTables, OPERATORS
+
+
+class FormatSink:
+    """Base class of the format writers fed by ``FanOutWriter``.
+
+    Attributes:
+        out (IO): The binary stream to write to.
+        fault_tree (Optional[FaultTree]): The fault tree being written.
+        tables (Optional[FaultTreeTables]): The shared tables of the fault tree.
+        metadata (Dict[str, Any]): Extra information about the tree, e.g. its seed and factors.
+        single_document (bool): Whether a file holds exactly one tree, so trees cannot be appended into a corpus.
+    """
+
+    single_document = False
+
+    def __init__(self, out: IO):
+        """Initializes the sink.
+
+        Args:
+            out (IO): The binary stream to write to.
+        """
+        self.out = out
+        self.fault_tree: Optional[FaultTree] = None
+        self.tables: Optional[FaultTreeTables] = None
+        self.metadata: Dict[str, Any] = {}
+
+    def begin(self, fault_tree: FaultTree, tables: FaultTreeTables, **metadata: Any):
+        """Starts writing a fault tree.
+
+        Args:
+            fault_tree (FaultTree): The fault tree.
+            tables (FaultTreeTables): The shared tables of the fault tree.
+            **metadata (Any): Extra information about the tree.
+        """
+        self.fault_tree = fault_tree
+        self.tables = tables
+        self.metadata = metadata
+
+    def gate(self, gate_number: int):
+        """Receives the next gate in the topological order.
+
+        Args:
+            gate_number (int): Zero-based gate number in the tables.
+        """
+
+    def end(self):
+        """Finishes writing the fault tree."""
+
+
+class ExprSink(FormatSink):
+    """Boolean expression strings as printed by ``FaultTree.expr``, one per line."""
+
+    def begin(self, fault_tree: FaultTree, tables: FaultTreeTables, **metadata: Any):
+        super().begin(fault_tree, tables, **metadata)
+        self._exprs: List[Optional[str]] = tables.names()
+
+    def gate(self, gate_number: int):
+        tables = self.tables
+        exprs = self._exprs
+        arguments = [exprs[x] for x in tables.children[tables.child_offsets[gate_number]:
+                                                       tables.child_offsets[gate_number + 1]]]
+        index = tables.gate_offset + gate_number
+        operator = OPERATORS[tables.operators[gate_number]]
+        if not arguments:
+            return
+        if operator == "not":
+            exprs[index] = arguments[0] + "'"
+        elif operator == "atleast":
+            exprs[index] = f"atleast_{tables.k_nums[gate_number]}(" + ','.join(arguments) + ')'
+        else:
+            exprs[index] = '(' + {'and': '*', 'or': '+', 'xor': '^'}[operator].join(arguments) + ')'
+
+    def end(self):
+        top = self.tables.top_index
+        self.out.write(((self._exprs[top] if top >= 0 else "") + '\n').encode('utf-8'))
+        self._exprs = []
+
+
+class MefXmlSink(FormatSink):
+    """Open-PSA MEF XML documents readable by ``read_mef_xml``.
+
+    With the ``nest`` metadata set, NOT gates of single events other than the top gate
+    are written as nested ``<not>`` formulae into their parents instead of as gates.
+    """
+
+    single_document = True
+
+    def begin(self, fault_tree: FaultTree, tables: FaultTreeTables, **metadata: Any):
+        super().begin(fault_tree, tables, **metadata)
+        tags = ["basic-event"] * len(tables.basic_events) + ["house-event"] * len(tables.house_events)
+        tags += ["gate"] * len(tables.gates)
+        self._names = [quoteattr(x) for x in tables.names()]
+        # The formula of every node as an argument of its parents
+        self._arguments = [f'<{tag} name={name}/>' for tag, name in zip(tags, self._names)]
+        self._nested = bytearray(len(tables.gates))
+        if metadata.get('nest'):
+            gate_offset = tables.gate_offset
+            for gate_number, operator in enumerate(tables.operators):
+                first, last = tables.child_offsets[gate_number], tables.child_offsets[gate_number + 1]
+                if (OPERATORS[operator] == "not" and last - first == 1 and tables.children[first] < gate_offset
+                        and gate_offset + gate_number != tables.top_index):
+                    self._nested[gate_number] = 1
+                    self._arguments[gate_offset + gate_number] = f'<not>{self._arguments[tables.children[first]]}</not>'
+        self._lines = ['<?xml version="1.0"?>', '<opsa-mef>',
+                       f'<define-fault-tree name={quoteattr(fault_tree.name or "FaultTree")}>']
+
+    def gate(self, gate_number: int):
+        if self._nested[gate_number]:
+            return
+        tables = self.tables
+        operator = OPERATORS[tables.operators[gate_number]]
+        opening = f'<atleast min="{tables.k_nums[gate_number]}">' if operator == "atleast" else f'<{operator}>'
+        arguments = "".join(self._arguments[x] for x in tables.children[tables.child_offsets[gate_number]:
+                                                                         tables.child_offsets[gate_number + 1]])
+        self._lines.append(f'<define-gate name={self._names[tables.gate_offset + gate_number]}>'
+                           f'{opening}{arguments}</{operator}></define-gate>')
+        if len(self._lines) >= 4096:
+            self._flush()
+
+    def _flush(self):
+        self.out.write(("\n".join(self._lines) + "\n").encode('utf-8'))
+        self._lines = []
+
+    @staticmethod
+    def _probability(probability: Any) -> str:
+        if isinstance(probability, LogNormal):
+            value = probability.value
+            return (f'<lognormal-deviate><float value="{value[MeanErrorFactor.mean]!r}"/>'
+                    f'<float value="{value[MeanErrorFactor.error_factor]!r}"/>'
+                    f'<float value="{value[MeanErrorFactor.percentile]!r}"/></lognormal-deviate>')
+        if isinstance(probability, PointEstimate):
+            probability = probability.value
+        return f'<float value="{float(probability)!r}"/>' if probability is not None else ""
+
+    def end(self):
+        lines = self._lines
+        lines.append('</define-fault-tree>')
+        lines.append('<model-data>')
+        for basic_event in self.tables.basic_events:
+            lines.append(f'<define-basic-event name={quoteattr(basic_event.name)}>'
+                         f'{self._probability(basic_event.probability)}</define-basic-event>')
+        for house_event in self.tables.house_events:
+            state = 'true' if house_event.state in ('true', True) else 'false'
+            lines.append(f'<define-house-event name={quoteattr(house_event.name)}>'
+                         f'<constant value="{state}"/></define-house-event>')
+        for ccf_group in self.fault_tree.ccf_groups:
+            members = "".join(f'<basic-event name={quoteattr(x.name)}/>' for x in ccf_group.members)
+            factors = "".join(f'<factor level="{level}">{self._probability(x)}</factor>'
+                              for level, x in enumerate(getattr(ccf_group, 'factors', None) or [], start=2))
+            model = f' model={quoteattr(ccf_group.model)}' if ccf_group.model else ''
+            distribution = self._probability(ccf_group.prob)
+            if distribution:
+                distribution = f'<distribution>{distribution}</distribution>'
+            lines.append(f'<define-CCF-group name={quoteattr(ccf_group.name)}{model}><members>{members}</members>'
+                         f'{distribution}<factors>{factors}</factors></define-CCF-group>')
+        lines.append('</model-data>')
+        lines.append('</opsa-mef>')
+        self._flush()
+
+
+class BinarySink(FormatSink):
+    """The versioned binary format of ``write_binary``."""
+
+    single_document = True
+
+    def end(self):
+        dump_tables(self.tables, self.out)
+
+
+class JsonLinesSink(FormatSink):
+    """JSON Lines records of ``tree_record``; the ``seed`` and ``factors`` metadata are recorded."""
+
+    def end(self):
+        self.out.write(encode_record(tree_record(self.fault_tree, self.metadata.get('seed'),
+                                                 self.metadata.get('factors'), self.tables)))
+
+
+class NpzSink(FormatSink):
+    """Columnar NumPy archives of ``write_npz``."""
+
+    single_document = True
+
+    def end(self):
+        buffer = io.BytesIO()  # zip archives need a seekable stream
+        np.savez_compressed(buffer, **tables_arrays(self.tables, self.fault_tree.ccf_groups))
+        self.out.write(buffer.getbuffer())
+
+
+class DimacsSink(FormatSink):
+    """Tseitin CNF in the DIMACS format of ``write_dimacs``, with the top gate asserted."""
+
+    single_document = True
+
+    def begin(self, fault_tree: FaultTree, tables: FaultTreeTables, **metadata: Any):
+        super().begin(fault_tree, tables, **metadata)
+        self._encoding = CnfEncoding(tables)
+        for number, state in enumerate(tables.house_states):
+            variable = len(tables.basic_events) + number + 1
+            self._encoding.add_clause(variable if state else -variable)
+
+    def gate(self, gate_number: int):
+        self._encoding.encode_gate(gate_number)
+
+    def end(self):
+        self._encoding.write(self.out)
+        self._encoding = None
+
+
+class AigerSink(FormatSink):
+    """Binary AIGER and-inverter graphs of ``write_aiger``."""
+
+    single_document = True
+
+    def begin(self, fault_tree: FaultTree, tables: FaultTreeTables, **metadata: Any):
+        super().begin(fault_tree, tables, **metadata)
+        if tables.top_index < 0:
+            raise ValueError("The fault tree has no top gate")
+        self._aig = AndInverterGraph(len(tables.basic_events))
+        self._literals = initial_literals(tables)
+
+    def gate(self, gate_number: int):
+        lower_gate(self._aig, self.tables, self._literals, gate_number)
+
+    def end(self):
+        tables = self.tables
+        self._aig.write(self.out, [self._literals[tables.top_index]], [x.name for x in tables.basic_events],
+                        [tables.gates[tables.top_index - tables.gate_offset].name], tables.name or "")
+        self._aig = None
+
+
+_FORMATS: Dict[str, Type[FormatSink]] = {}
+_EXTENSIONS: Dict[str, str] = {}
+
+
+def register_format(name: str, sink: Type[FormatSink], extensions: Sequence[str] = ()):
+    """Registers a format sink under a name and its file extensions.
+
+    Args:
+        name (str): The name of the format.
+        sink (Type[FormatSink]): The sink class.
+        extensions (Sequence[str]): File extensions (with the dot) that select the format.
+    """
+    _FORMATS[name] = sink
+    for extension in extensions:
+        _EXTENSIONS[extension] = name
+
+
+register_format("expr", ExprSink, (".txt", ".expr"))
+register_format("xml", MefXmlSink, (".xml",))
+register_format("binary", BinarySink, (".bin", ".ftb"))
+register_format("jsonl", JsonLinesSink, (".jsonl", ".ndjson"))
+register_format("npz", NpzSink, (".npz",))
+register_format("cnf", DimacsSink, (".cnf", ".dimacs"))
+register_format("aiger", AigerSink, (".aig",))
+
+
+def is_single_document(name: str) -> bool:
+    """Tells whether a format holds exactly one tree per file.
+
+    Args:
+        name (str): The name of the format.
+
+    Returns:
+        bool: True if trees of the format cannot be appended into one file, e.g. XML documents.
+    """
+    return _FORMATS[name].single_document
+
+
+def format_for(path: str, default: str = "expr") -> str:
+    """Determines the format of an output file from its extension.
+
+    Args:
+        path (str): The path to the file; compression extensions are skipped.
+        default (str): The format of unknown extensions.
+
+    Returns:
+        str: The name of the format.
+    """
+    compression = compression_for(path)
+    if compression:
+        path = path[:-len(compression)]
+    return _EXTENSIONS.get(os.path.splitext(path)[1].lower(), default)
+
+
+class FanOutWriter:
+    """Feeds one topological traversal of a fault tree to several format sinks.
+
+    The traversal starts from the top gate, so gates that are not under it are not written.
+    Trees without a top gate are traversed whole.
+
+    Attributes:
+        sinks (List[FormatSink]): The sinks to feed.
+    """
+
+    def __init__(self, sinks: Sequence[FormatSink]):
+        """Initializes the writer.
+
+        Args:
+            sinks (Sequence[FormatSink]): The sinks to feed.
+        """
+        self.sinks = list(sinks)
+
+    def write(self, fault_tree: FaultTree, **metadata: Any) -> FaultTreeTables:
+        """Writes the fault tree into every sink.
+
+        Args:
+            fault_tree (FaultTree): The fault tree to write.
+            **metadata (Any): Extra information about the tree, e.g. its seed and factors.
+
+        Returns:
+            FaultTreeTables: The shared tables.
+
+        Raises:
+            ValueError: If the fault tree cannot be indexed or is malformed for a format.
+        """
+        tables = FaultTreeTables.from_fault_tree(fault_tree)
+        for sink in self.sinks:
+            sink.begin(fault_tree, tables, **metadata)
+        # Sinks that only need the tables do not take part in the traversal.
+        traversing = [sink for sink in self.sinks if type(sink).gate is not FormatSink.gate]
+        if traversing:
+            # Only the gates under the top gate, as ``write_aiger`` lowers them.
+            roots = [tables.top_index - tables.gate_offset] if tables.top_index >= 0 else None
+            for gate_number in tables.topological_order(roots):
+                for sink in traversing:
+                    sink.gate(gate_number)
+        for sink in self.sinks:
+            sink.end()
+        return tables
+
+
+def encode_formats(fault_tree: FaultTree, outputs: Sequence[Tuple[str, Optional[str]]],
+                   **metadata: Any) -> List[bytes]:
+    """Serializes a fault tree into several formats in one traversal.
+
+    Args:
+        fault_tree (FaultTree): The fault tree to serialize.
+        outputs (Sequence[Tuple[str, Optional[str]]]): Format names with their compression extensions.
+        **metadata (Any): Extra information about the tree, e.g. its seed and factors.
+
+    Returns:
+        List[bytes]: The (compressed) data of every output, in order.
+    """
+    buffers = [io.BytesIO() for _ in outputs]
+    FanOutWriter([_FORMATS[name](buffer) for (name, _), buffer in zip(outputs, buffers)]) \
+        .write(fault_tree, **metadata)
+    return [compress(buffer.getvalue(), compression) for (_, compression), buffer in zip(outputs, buffers)]
+
+
+def write_formats(fault_tree: FaultTree, paths: Sequence[str], default_format: str = "expr",
+                  **metadata: Any) -> FaultTreeTables:
+    """Writes a fault tree into several files, each in the format of its extension.
+
+    Args:
+        fault_tree (FaultTree): The fault tree to write.
+        paths (Sequence[str]): The destination paths; compressed by their extensions.
+        default_format (str): The format of paths with unknown extensions.
+        **metadata (Any): Extra information about the tree, e.g. its seed and factors.
+
+    Returns:
+        FaultTreeTables: The shared tables.
+
+    Raises:
+        ValueError: If the fault tree cannot be indexed or is malformed for a format.
+    """
+    files = [open_output(path) for path in paths]
+    try:
+        sinks = [_FORMATS[format_for(path, default_format)](f) for path, f in zip(paths, files)]
+        return FanOutWriter(sinks).write(fault_tree, **metadata)
+    finally:
+        for f in files:
+            f.close()
@@ -0,0 +1,113 @@
+"""JSON Lines records of fault trees with their generation metadata.
+
+Every record is a single line holding one self-contained fault tree:
+
+.. code-block:: json
+
+    {"name": "...", "seed": 7, "factors": {...}, "summary": {...}, "proportions": {...},
+     "structure": {"basic_events": [...], "probabilities": [...], "house_events": [...],
+                   "house_states": [...], "gates": [...], "operators": [...], "k_nums": [...],
+                   "offsets": [...], "children": [...], "top": 5}}
+
+The structure is the compact adjacency of ``FaultTreeTables``: node indices count
+basic events, then house events, then gates, and the arguments of gate ``i`` are
+``children[offsets[i]:offsets[i + 1]]``. Operators are codes into ``OPERATORS``.
+Missing probabilities are stored as null.
+"""
+import json
+import math
+from typing import Any, Dict, Iterator, Optional
+
+from fault_tree import FaultTree, size_summary, calculate_event_proportions
+from fault_tree.event import BasicEvent, HouseEvent
+from fault_tree.probability import PointEstimate
+from fault_tree.io.compression import open_input
+from fault_tree.io.tables import FaultTreeTables, build_fault_tree
+
+
+def tree_record(fault_tree: FaultTree, seed: Optional[int] = None, factors: Optional[Dict[str, Any]] = None,
+                tables: Optional[FaultTreeTables] = None) -> Dict[str, Any]:
+    """Collects the metrics and the structure of a fault tree into a record.
+
+    Args:
+        fault_tree (FaultTree): The fault tree to describe.
+        seed (Optional[int]): The seed the tree was generated with.
+        factors (Optional[Dict[str, Any]]): The generation factors, e.g. ``ComplexityFactors.as_dict()``.
+        tables (Optional[FaultTreeTables]): The already indexed fault tree, if available.
+
+    Returns:
+        Dict[str, Any]: A JSON-serializable record.
+
+    Raises:
+        ValueError: If the fault tree cannot be indexed.
+    """
+    if tables is None:
+        tables = FaultTreeTables.from_fault_tree(fault_tree)
+    return {
+        'name': fault_tree.name,
+        'seed': seed,
+        'factors': factors if factors is not None else {},
+        'summary': size_summary(fault_tree),
+        'proportions': calculate_event_proportions(fault_tree)['fractions'],
+        'structure': {
+            'basic_events': [x.name for x in tables.basic_events],
+            'probabilities': [None if math.isnan(x) else x for x in tables.probabilities],
+            'house_events': [x.name for x in tables.house_events],
+            'house_states': tables.house_states.tolist(),
+            'gates': [x.name for x in tables.gates],
+            'operators': tables.operators.tolist(),
+            'k_nums': tables.k_nums.tolist(),
+            'offsets': tables.child_offsets.tolist(),
+            'children': tables.children.tolist(),
+            'top': tables.top_index,
+        },
+    }
+
+
+def encode_record(record: Dict[str, Any]) -> bytes:
+    """Serializes a record into one compact JSON line.
+
+    Args:
+        record (Dict[str, Any]): The record from ``tree_record``.
+
+    Returns:
+        bytes: The UTF-8 encoded line, including the line terminator.
+    """
+    return (json.dumps(record, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+def record_to_fault_tree(record: Dict[str, Any]) -> FaultTree:
+    """Rebuilds the fault tree stored in a record.
+
+    Args:
+        record (Dict[str, Any]): A decoded record.
+
+    Returns:
+        FaultTree: A fault tree with the same nodes and structure.
+
+    Raises:
+        ValueError: If the structure refers to unknown nodes.
+    """
+    structure = record['structure']
+    basic_events = [BasicEvent(name, PointEstimate(p) if p is not None else None)
+                    for name, p in zip(structure['basic_events'], structure['probabilities'])]
+    house_events = [HouseEvent(name, 'true' if state else 'false')
+                    for name, state in zip(structure['house_events'], structure['house_states'])]
+    return build_fault_tree(record.get('name'), basic_events, house_events, structure['gates'],
+                            structure['operators'], structure['k_nums'], structure['offsets'],
+                            structure['children'], structure['top'])
+
+
+def read_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    """Streams the records of a JSON Lines file, compressed or not.
+
+    Args:
+        path (str): The path to the file.
+
+    Yields:
+        Dict[str, Any]: The decoded records in file order.
+    """
+    with open_input(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
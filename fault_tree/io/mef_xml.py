@@ -0,0 +1,311 @@
+"""Streaming reader of Open-PSA Model Exchange Format (MEF) XML files.
+
+Definitions are processed as soon as their closing tag is parsed and are then
+removed from the partially built document, so the memory footprint stays close
+to the size of the resulting fault tree. Gate references are linked directly when
+the gate is already defined; forward references are resolved in a single
+fix-up pass after the whole file has been read.
+"""
+import math
+import xml.etree.ElementTree as ElementTree
+from typing import IO, Any, Dict, List, Optional, Set, Tuple, Union
+
+from ordered_set import OrderedSet
+
+from fault_tree import FaultTree, CCFGroup
+from fault_tree.event import BasicEvent, HouseEvent, Gate
+from fault_tree.probability import Probability, PointEstimate, LogNormal
+from fault_tree.io.compression import open_input
+
+# Elements whose children are definitions rather than parts of one definition.
+_CONTAINERS = {'opsa-mef', 'define-fault-tree', 'model-data', 'define-component'}
+_DEFINITIONS = {'define-gate', 'define-basic-event', 'define-house-event', 'define-CCF-group', 'define-parameter'}
+_METADATA = {'label', 'attributes'}
+_REFERENCES = {'gate', 'basic-event', 'house-event', 'event'}
+_OPERATORS = {'and', 'or', 'atleast', 'not', 'xor'}
+_NEGATED_OPERATORS = {'nand': 'and', 'nor': 'or', 'iff': 'xor'}
+
+# A captured expression: (tag, attributes, arguments).
+Expression = Tuple[str, Dict[str, str], tuple]
+
+
+def read_mef_xml(source: Union[str, IO], mission_time: Optional[float] = None) -> FaultTree:
+    """Reads an Open-PSA MEF XML model into a fault tree.
+
+    Args:
+        source (Union[str, IO]): A file path, possibly compressed, or a binary file object.
+        mission_time (Optional[float]): The value of ``<system-mission-time/>`` in expressions.
+
+    Returns:
+        FaultTree: The fault tree with all definitions of the model.
+
+    Raises:
+        ValueError: If the model is malformed or uses unsupported constructs.
+    """
+    return MefXmlReader(mission_time).read(source)
+
+
+class MefXmlReader:
+    """Incremental builder of a fault tree from MEF XML parse events.
+
+    Attributes:
+        mission_time (Optional[float]): The value of ``<system-mission-time/>`` in expressions.
+    """
+
+    def __init__(self, mission_time: Optional[float] = None):
+        """Initializes an empty reader.
+
+        Args:
+            mission_time (Optional[float]): The value of ``<system-mission-time/>`` in expressions.
+        """
+        self.mission_time = mission_time
+        self._name: Optional[str] = None
+        self._gates: Dict[str, Gate] = {}
+        self._basic_events: Dict[str, BasicEvent] = {}
+        self._house_events: Dict[str, HouseEvent] = {}
+        self._defined: Set[Tuple[str, str]] = set()  # events may be referenced before their definitions
+        self._ccf_groups: List[CCFGroup] = []
+        self._parameters: Dict[str, Expression] = {}
+        self._probabilities: List[Tuple[Any, str, Expression]] = []
+        self._ccf_factors: List[Tuple[CCFGroup, List[Expression]]] = []
+        self._forward_references: List[Tuple[Gate, str, str]] = []
+
+    def read(self, source: Union[str, IO]) -> FaultTree:
+        """Parses the whole source and builds the fault tree.
+
+        Args:
+            source (Union[str, IO]): A file path or a binary file object.
+
+        Returns:
+            FaultTree: The fault tree with all definitions of the model.
+        """
+        if isinstance(source, str):
+            with open_input(source) as f:
+                return self.read(f)
+        stack: List[ElementTree.Element] = []
+        try:
+            for event, element in ElementTree.iterparse(source, events=('start', 'end')):
+                if event == 'start':
+                    if element.tag == 'define-fault-tree' and self._name is None:
+                        self._name = element.get('name')
+                    stack.append(element)
+                    continue
+                stack.pop()
+                if stack and stack[-1].tag in _CONTAINERS:
+                    if element.tag in _DEFINITIONS:
+                        self._define(element)
+                    stack[-1].remove(element)
+        except ElementTree.ParseError as err:
+            raise ValueError(f"Malformed MEF XML: {err}") from None
+        return self._finish()
+
+    def _define(self, element: ElementTree.Element):
+        name = element.get('name')
+        if not name:
+            raise ValueError(f"<{element.tag}> is missing a name")
+        body = [x for x in element if x.tag not in _METADATA]
+        if element.tag == 'define-gate':
+            if name in self._gates:
+                raise ValueError(f"Redefinition of gate {name}")
+            if len(body) != 1:
+                raise ValueError(f"Gate {name} must have exactly one formula")
+            gate = Gate(name, 'or')
+            self._gates[name] = gate
+            self._build_formula(gate, body[0])
+        elif element.tag == 'define-basic-event':
+            if (element.tag, name) in self._defined:
+                raise ValueError(f"Redefinition of basic event {name}")
+            self._defined.add((element.tag, name))
+            basic_event = self._basic_event(name)
+            if body:
+                self._probabilities.append((basic_event, 'probability', self._capture(body[0])))
+        elif element.tag == 'define-house-event':
+            if (element.tag, name) in self._defined:
+                raise ValueError(f"Redefinition of house event {name}")
+            self._defined.add((element.tag, name))
+            house_event = self._house_event(name)
+            if body:
+                if body[0].tag != 'constant':
+                    raise ValueError(f"House event {name} must have a constant state")
+                house_event.state = body[0].get('value')
+        elif element.tag == 'define-parameter':
+            if len(body) != 1:
+                raise ValueError(f"Parameter {name} must have exactly one expression")
+            self._parameters[name] = self._capture(body[0])
+        else:
+            self._define_ccf_group(name, element, body)
+
+    def _define_ccf_group(self, name: str, element: ElementTree.Element, body: List[ElementTree.Element]):
+        ccf_group = CCFGroup(name)
+        ccf_group.model = element.get('model')
+        ccf_group.members = OrderedSet()
+        factors: List[Expression] = []
+        for child in body:
+            if child.tag == 'members':
+                ccf_group.members.update(self._basic_event(x.get('name')) for x in child)
+            elif child.tag == 'distribution':
+                self._probabilities.append((ccf_group, 'prob', self._capture(child[0])))
+            elif child.tag == 'factor':
+                factors.append(self._capture(child[0]))
+            elif child.tag == 'factors':
+                factors.extend(self._capture(x[0]) for x in child)
+        self._ccf_groups.append(ccf_group)
+        self._ccf_factors.append((ccf_group, factors))
+
+    def _basic_event(self, name: str) -> BasicEvent:
+        basic_event = self._basic_events.get(name)
+        if basic_event is None:
+            basic_event = self._basic_events[name] = BasicEvent(name, None)
+        return basic_event
+
+    def _house_event(self, name: str) -> HouseEvent:
+        house_event = self._house_events.get(name)
+        if house_event is None:
+            house_event = self._house_events[name] = HouseEvent(name, 'false')
+        return house_event
+
+    def _anonymous_gate(self, parent: Gate, operator: str) -> Gate:
+        name = f"{parent.name}__{len(parent.g_arguments) + 1}"
+        while name in self._gates:
+            name += "_"
+        gate = self._gates[name] = Gate(name, operator)
+        parent.add_gate(gate)
+        return gate
+
+    def _build_formula(self, gate: Gate, formula: ElementTree.Element):
+        """Sets up the operator and the arguments of the gate from the formula element."""
+        tag = formula.tag
+        arguments = list(formula)
+        if tag in _REFERENCES:
+            gate.operator = 'or'  # a pass-through gate with a single argument
+            self._add_argument(gate, formula)
+        elif tag == 'null':
+            gate.operator = 'or'
+            self._add_arguments(gate, arguments)
+        elif tag in _OPERATORS:
+            gate.operator = tag
+            if tag == 'atleast':
+                gate.k_num = int(formula.get('min'))
+            self._add_arguments(gate, arguments)
+        elif tag in _NEGATED_OPERATORS:
+            gate.operator = 'not'
+            self._add_arguments(self._anonymous_gate(gate, _NEGATED_OPERATORS[tag]), arguments)
+        elif tag == 'imply':
+            if len(arguments) != 2:
+                raise ValueError(f"Implication in gate {gate.name} must have two arguments")
+            gate.operator = 'or'
+            self._add_argument(self._anonymous_gate(gate, 'not'), arguments[0])
+            self._add_argument(gate, arguments[1])
+        else:
+            raise ValueError(f"Unsupported formula <{tag}> in gate {gate.name}")
+
+    def _add_arguments(self, gate: Gate, arguments: List[ElementTree.Element]):
+        for argument in arguments:
+            self._add_argument(gate, argument)
+
+    def _add_argument(self, gate: Gate, argument: ElementTree.Element):
+        tag = argument.tag
+        if tag not in _REFERENCES:
+            self._build_formula(self._anonymous_gate(gate, 'or'), argument)
+            return
+        name = argument.get('name')
+        if tag == 'basic-event':
+            self._link(gate, self._basic_event(name))
+        elif tag == 'house-event':
+            self._link(gate, self._house_event(name))
+        else:
+            event = self._gates.get(name)
+            if event is None and tag == 'event':
+                event = self._basic_events.get(name) or self._house_events.get(name)
+            if event is None:
+                self._forward_references.append((gate, name, tag))
+            else:
+                self._link(gate, event)
+
+    @staticmethod
+    def _link(gate: Gate, event: Union[Gate, BasicEvent, HouseEvent]):
+        if isinstance(event, Gate):
+            arguments, add = gate.g_arguments, gate.add_gate
+        elif isinstance(event, BasicEvent):
+            arguments, add = gate.b_arguments, gate.add_basic_event
+        else:
+            arguments, add = gate.h_arguments, gate.add_house_event
+        if event in arguments:
+            raise ValueError(f"Duplicate argument {event.name} in gate {gate.name}")
+        add(event)
+
+    @staticmethod
+    def _capture(element: ElementTree.Element) -> Expression:
+        return element.tag, dict(element.attrib), tuple(MefXmlReader._capture(x) for x in element)
+
+    def _evaluate(self, expression: Expression, visiting: Tuple[str, ...] = ()) -> float:
+        """Evaluates a captured constant expression."""
+        tag, attributes, arguments = expression
+        if tag in ('float', 'int'):
+            return float(attributes['value'])
+        if tag == 'bool':
+            return 1.0 if attributes['value'] == 'true' else 0.0
+        if tag == 'parameter':
+            name = attributes['name']
+            if name in visiting:
+                raise ValueError(f"Cyclic parameter {name}")
+            if name not in self._parameters:
+                raise ValueError(f"Undefined parameter {name}")
+            return self._evaluate(self._parameters[name], visiting + (name,))
+        if tag == 'system-mission-time':
+            if self.mission_time is None:
+                raise ValueError("The model uses the mission time, but it is not provided")
+            return float(self.mission_time)
+        values = [self._evaluate(x, visiting) for x in arguments]
+        if tag == 'exponential':
+            return 1 - math.exp(-values[0] * values[1])
+        if tag == 'neg':
+            return -values[0]
+        if tag == 'add':
+            return sum(values)
+        if tag == 'mul':
+            return math.prod(values)
+        if tag == 'sub':
+            return values[0] - sum(values[1:])
+        if tag == 'div':
+            result = values[0]
+            for value in values[1:]:
+                result /= value
+            return result
+        raise ValueError(f"Unsupported expression <{tag}>")
+
+    def _probability(self, expression: Expression) -> Probability:
+        tag, _, arguments = expression
+        if tag == 'lognormal-deviate':
+            return LogNormal(*[self._evaluate(x) for x in arguments])
+        return PointEstimate(self._evaluate(expression))
+
+    def _finish(self) -> FaultTree:
+        """Resolves forward references and expressions, then assembles the fault tree."""
+        for gate, name, tag in self._forward_references:
+            event = self._gates.get(name)
+            if event is None and tag == 'event':
+                event = self._basic_events.get(name) or self._house_events.get(name)
+            if event is None:
+                raise ValueError(f"Undefined {tag} {name} in gate {gate.name}")
+            self._link(gate, event)
+        self._forward_references.clear()
+
+        for owner, attribute, expression in self._probabilities:
+            setattr(owner, attribute, self._probability(expression))
+        for ccf_group, factors in self._ccf_factors:
+            ccf_group.factors = [self._evaluate(x) for x in factors]
+
+        fault_tree = FaultTree(self._name)
+        fault_tree.gates.update(self._gates.values())
+        fault_tree.basic_events.update(self._basic_events.values())
+        fault_tree.house_events.update(self._house_events.values())
+        fault_tree.ccf_groups.update(self._ccf_groups)
+        ccf_members = {x for ccf_group in self._ccf_groups for x in ccf_group.members}
+        fault_tree.non_ccf_events.update(x for x in self._basic_events.values() if x not in ccf_members)
+        top_gates = OrderedSet(x for x in self._gates.values() if x.is_orphan())
+        if top_gates:
+            fault_tree.top_gate = top_gates[0]
+            if len(top_gates) > 1:
+                fault_tree.top_gates = top_gates
+        return fault_tree
@@ -0,0 +1,232 @@
+"""Columnar NumPy (``.npz``) export of fault tree structure and event tables.
+
+The archive stores the ``FaultTreeTables`` layout as named arrays:
+
+=====================  =========  ============================================
+Array                  Type       Length
+=====================  =========  ============================================
+basic_names            str        num_basic
+house_names            str        num_house
+gate_names             str        num_gates
+operators              uint8      num_gates (codes into ``OPERATORS``)
+k_nums                 uint32     num_gates (0 for non-atleast gates)
+child_offsets          int64      num_gates + 1 (CSR)
+children               uint32     num_children (CSR)
+parent_counts          uint32     num_nodes
+probabilities          float64    num_basic (NaN if undefined)
+house_states           bool       num_house
+ccf_names              str        num_ccf
+ccf_models             str        num_ccf
+ccf_probabilities      float64    num_ccf
+ccf_offsets            int64      num_ccf + 1 (CSR into ``ccf_members``)
+ccf_members            uint32     basic event indices of the group members
+ccf_factor_offsets     int64      num_ccf + 1 (CSR into ``ccf_factors``)
+ccf_factors            float64    the factors of the CCF models
+=====================  =========  ============================================
+
+Scalars (``version``, ``name``, ``top_index``) are zero-dimensional arrays.
+No array holds Python objects, so archives load without pickling.
+"""
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+from ordered_set import OrderedSet
+
+from fault_tree import FaultTree, CCFGroup
+from fault_tree.event import BasicEvent, HouseEvent
+from fault_tree.probability import PointEstimate
+from fault_tree.io.tables import FaultTreeTables, build_fault_tree, probability_value
+
+VERSION = 1
+
+
+def fault_tree_arrays(fault_tree: FaultTree) -> Dict[str, np.ndarray]:
+    """Converts a fault tree into named columnar arrays.
+
+    Args:
+        fault_tree (FaultTree): The fault tree to convert.
+
+    Returns:
+        Dict[str, np.ndarray]: The arrays described in the module documentation.
+
+    Raises:
+        ValueError: If the fault tree cannot be indexed or a CCF member is not one of its basic events.
+    """
+    return tables_arrays(FaultTreeTables.from_fault_tree(fault_tree), fault_tree.ccf_groups)
+
+
+def tables_arrays(tables: FaultTreeTables, ccf_groups: Iterable[CCFGroup] = ()) -> Dict[str, np.ndarray]:
+    """Converts already indexed fault tree tables into named columnar arrays.
+
+    Args:
+        tables (FaultTreeTables): The indexed fault tree.
+        ccf_groups (Iterable[CCFGroup]): The CCF groups over the basic events of the tables.
+
+    Returns:
+        Dict[str, np.ndarray]: The arrays described in the module documentation.
+
+    Raises:
+        ValueError: If a CCF member is not one of the basic events.
+    """
+    basic_index = {x: i for i, x in enumerate(tables.basic_events)}
+    children = np.frombuffer(tables.children, dtype=np.uint32)
+    ccf_groups = list(ccf_groups)
+    ccf_members = []
+    ccf_factors = []
+    for ccf_group in ccf_groups:
+        try:
+            ccf_members.append([basic_index[x] for x in ccf_group.members])
+        except KeyError as error:
+            raise ValueError(f"CCF group {ccf_group.name} has an unknown member {error.args[0]}") from None
+        ccf_factors.append([float(x) for x in getattr(ccf_group, 'factors', None) or []])
+    return {
+        'version': np.array(VERSION),
+        'name': np.array(tables.name or ""),
+        'top_index': np.array(tables.top_index, dtype=np.int64),
+        'basic_names': np.array([x.name for x in tables.basic_events], dtype=str),
+        'house_names': np.array([x.name for x in tables.house_events], dtype=str),
+        'gate_names': np.array([x.name for x in tables.gates], dtype=str),
+        'operators': np.frombuffer(tables.operators, dtype=np.uint8).copy(),
+        'k_nums': np.frombuffer(tables.k_nums, dtype=np.uint32).copy(),
+        'child_offsets': np.array(tables.child_offsets, dtype=np.int64),
+        'children': children.copy(),
+        'parent_counts': np.bincount(children, minlength=tables.num_nodes).astype(np.uint32),
+        'probabilities': np.frombuffer(tables.probabilities, dtype=np.float64).copy(),
+        'house_states': np.frombuffer(tables.house_states, dtype=np.uint8).astype(bool),
+        'ccf_names': np.array([x.name for x in ccf_groups], dtype=str),
+        'ccf_models': np.array([x.model or "" for x in ccf_groups], dtype=str),
+        'ccf_probabilities': np.array([probability_value(x.prob) for x in ccf_groups], dtype=np.float64),
+        'ccf_offsets': np.cumsum([0] + [len(x) for x in ccf_members], dtype=np.int64),
+        'ccf_members': np.array([i for x in ccf_members for i in x], dtype=np.uint32),
+        'ccf_factor_offsets': np.cumsum([0] + [len(x) for x in ccf_factors], dtype=np.int64),
+        'ccf_factors': np.array([f for x in ccf_factors for f in x], dtype=np.float64),
+    }
+
+
+def write_npz(fault_tree: FaultTree, path: str, compressed: bool = True) -> Dict[str, np.ndarray]:
+    """Writes the fault tree into a ``.npz`` archive.
+
+    Args:
+        fault_tree (FaultTree): The fault tree to export.
+        path (str): The destination file path.
+        compressed (bool): Whether to deflate the arrays in the archive.
+
+    Returns:
+        Dict[str, np.ndarray]: The arrays that were written.
+
+    Raises:
+        ValueError: If the fault tree cannot be indexed.
+    """
+    arrays = fault_tree_arrays(fault_tree)
+    with open(path, 'wb') as f:
+        (np.savez_compressed if compressed else np.savez)(f, **arrays)
+    return arrays
+
+
+class FaultTreeArrays:
+    """Columnar fault tree loaded from a ``.npz`` archive.
+
+    Every array of the module documentation is an attribute of the same name,
+    ready for vectorized analysis without building ``Gate`` objects.
+
+    Attributes:
+        name (Optional[str]): The name of the fault tree.
+        top_index (int): Node index of the top gate, or -1 if there is none.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        """Wraps loaded arrays.
+
+        Args:
+            arrays (Dict[str, np.ndarray]): The arrays of an archive.
+
+        Raises:
+            ValueError: If the arrays are of an unsupported version.
+        """
+        version = int(arrays['version'])
+        if version != VERSION:
+            raise ValueError(f"Unsupported fault tree archive version: {version}")
+        for key, value in arrays.items():
+            setattr(self, key, value)
+        self.name: Optional[str] = str(arrays['name']) or None
+        self.top_index: int = int(arrays['top_index'])
+
+    @property
+    def num_basic(self) -> int:
+        """The number of basic events."""
+        return len(self.basic_names)
+
+    @property
+    def num_house(self) -> int:
+        """The number of house events."""
+        return len(self.house_names)
+
+    @property
+    def num_gates(self) -> int:
+        """The number of gates."""
+        return len(self.gate_names)
+
+    @property
+    def gate_offset(self) -> int:
+        """The node index of the first gate."""
+        return self.num_basic + self.num_house
+
+    @property
+    def num_nodes(self) -> int:
+        """The total number of indexed nodes."""
+        return self.gate_offset + self.num_gates
+
+    def child_indices(self, gate_number: int) -> np.ndarray:
+        """Returns the node indices of the arguments of a gate.
+
+        Args:
+            gate_number (int): Zero-based gate number (node index minus ``gate_offset``).
+
+        Returns:
+            np.ndarray: A view into ``children``.
+        """
+        return self.children[self.child_offsets[gate_number]:self.child_offsets[gate_number + 1]]
+
+    def to_fault_tree(self) -> FaultTree:
+        """Materializes the arrays into a regular fault tree, CCF groups included.
+
+        Returns:
+            FaultTree: A fault tree with the same nodes and structure.
+        """
+        basic_events = [BasicEvent(str(name), None if np.isnan(p) else PointEstimate(float(p)))
+                        for name, p in zip(self.basic_names, self.probabilities)]
+        house_events = [HouseEvent(str(name), 'true' if state else 'false')
+                        for name, state in zip(self.house_names, self.house_states)]
+        fault_tree = build_fault_tree(self.name, basic_events, house_events, self.gate_names, self.operators,
+                                      self.k_nums, self.child_offsets, self.children, self.top_index)
+        in_ccf = set()
+        for number, name in enumerate(self.ccf_names):
+            ccf_group = CCFGroup(str(name))
+            members = self.ccf_members[self.ccf_offsets[number]:self.ccf_offsets[number + 1]]
+            ccf_group.members = OrderedSet(basic_events[int(i)] for i in members)
+            probability = float(self.ccf_probabilities[number])
+            ccf_group.prob = None if np.isnan(probability) else PointEstimate(probability)
+            ccf_group.model = str(self.ccf_models[number]) or None
+            factors = self.ccf_factors[self.ccf_factor_offsets[number]:self.ccf_factor_offsets[number + 1]]
+            ccf_group.factors = factors.tolist()
+            fault_tree.ccf_groups.add(ccf_group)
+            in_ccf.update(ccf_group.members)
+        if len(self.ccf_names):
+            fault_tree.non_ccf_events.update(x for x in basic_events if x not in in_ccf)
+        return fault_tree
+
+
+def read_npz(path: str) -> FaultTreeArrays:
+    """Loads a fault tree archive written by ``write_npz``.
+
+    Args:
+        path (str): The path to the archive.
+
+    Returns:
+        FaultTreeArrays: The columnar fault tree.
+
+    Raises:
+        ValueError: If the archive is of an unsupported version.
+    """
+    with np.load(path, allow_pickle=False) as archive:
+        return FaultTreeArrays({key: archive[key] for key in archive.files})
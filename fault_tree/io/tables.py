@@ -0,0 +1,270 @@
+import math
+from array import array
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Union
+
+from fault_tree import FaultTree
+
+from fault_tree.event import BasicEvent, HouseEvent, Gate
+from fault_tree.probability import Probability, PointEstimate, LogNormal
+from fault_tree.probability.lognormal import MeanErrorFactor
+
+# The order matches the gate weights of the generator: [AND, OR, K/N, NOT, XOR].
+OPERATORS = ("and", "or", "atleast", "not", "xor")
+OPERATOR_CODES: Dict[str, int] = {operator: code for code, operator in enumerate(OPERATORS)}
+
+
+def operator_code(gate: Gate) -> int:
+    """Returns the integer code of the gate operator.
+
+    Args:
+        gate (Gate): The gate whose operator is encoded.
+
+    Returns:
+        int: The index of the operator in OPERATORS.
+
+    Raises:
+        ValueError: If the operator is not one of OPERATORS.
+    """
+    try:
+        return OPERATOR_CODES[gate.operator.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown gate operator: {gate.operator}") from None
+
+
+def probability_value(probability: Union[Probability, float, None]) -> float:
+    """Reduces a probability to a single float.
+
+    Point estimates give their value, lognormal distributions give their mean,
+    plain numbers are taken as they are, and missing probabilities give NaN.
+
+    Args:
+        probability (Union[Probability, float, None]): The probability of a basic event or a CCF group.
+
+    Returns:
+        float: The representative value of the probability.
+    """
+    if isinstance(probability, PointEstimate):
+        return float(probability.value)
+    if isinstance(probability, LogNormal):
+        return float(probability.value[MeanErrorFactor.mean])
+    if isinstance(probability, (int, float)):
+        return float(probability)
+    return math.nan
+
+
+def build_fault_tree(name: Optional[str], basic_events: List[BasicEvent], house_events: List[HouseEvent],
+                     gate_names: Sequence[str], operators: Sequence[int], k_nums: Sequence[int],
+                     child_offsets: Sequence[int], children: Sequence[int], top_index: int) -> FaultTree:
+    """Links events and gates given in the ``FaultTreeTables`` layout into a fault tree.
+
+    Args:
+        name (Optional[str]): The name of the fault tree.
+        basic_events (List[BasicEvent]): Basic events in index order.
+        house_events (List[HouseEvent]): House events in index order.
+        gate_names (Sequence[str]): Gate names in index order.
+        operators (Sequence[int]): Operator code per gate.
+        k_nums (Sequence[int]): The k number per gate, 0 for non-atleast gates.
+        child_offsets (Sequence[int]): CSR row offsets.
+        children (Sequence[int]): CSR node indices of gate arguments.
+        top_index (int): Node index of the top gate, or -1 if there is none.
+
+    Returns:
+        FaultTree: A fault tree with new gates over the given events.
+
+    Raises:
+        ValueError: If a gate refers to an unknown node.
+    """
+    fault_tree = FaultTree(name)
+    gates = [Gate(str(gate_name), OPERATORS[int(operator)], int(k_num) or None)
+             for gate_name, operator, k_num in zip(gate_names, operators, k_nums)]
+    house_offset = len(basic_events)
+    gate_offset = house_offset + len(house_events)
+    num_nodes = gate_offset + len(gates)
+    for gate_number, gate in enumerate(gates):
+        for child in children[child_offsets[gate_number]:child_offsets[gate_number + 1]]:
+            child = int(child)
+            if not 0 <= child < num_nodes:
+                raise ValueError(f"Gate {gate.name} refers to unknown node {child}")
+            if child >= gate_offset:
+                gate.add_gate(gates[child - gate_offset])
+            elif child >= house_offset:
+                gate.add_house_event(house_events[child - house_offset])
+            else:
+                gate.add_basic_event(basic_events[child])
+    fault_tree.basic_events.update(basic_events)
+    fault_tree.house_events.update(house_events)
+    fault_tree.gates.update(gates)
+    if top_index >= 0:
+        fault_tree.top_gate = gates[top_index - gate_offset]
+    return fault_tree
+
+
+class FaultTreeTables:
+    """Structure-of-arrays layout of a fault tree.
+
+    Every node gets an integer index: basic events come first, house events next,
+    and gates last, so that node ``i`` is a gate iff ``i >= gate_offset``.
+    Gate arguments are stored in compressed sparse row (CSR) form in the same
+    order as ``Gate.expr`` prints them (basic, house, then gate arguments).
+
+    Attributes:
+        name (Optional[str]): The name of the fault tree.
+        basic_events (List[BasicEvent]): Basic events in index order.
+        house_events (List[HouseEvent]): House events in index order.
+        gates (List[Gate]): Gates in index order.
+        top_index (int): Node index of the top gate, or -1 if there is none.
+        operators (array): Operator code per gate ('B').
+        k_nums (array): The k number per gate, 0 for non-atleast gates ('I').
+        child_offsets (array): CSR row offsets, one more than the number of gates ('Q').
+        children (array): CSR node indices of gate arguments ('I').
+        probabilities (array): Probability value per basic event ('d').
+        house_states (array): 1 for true house events, 0 otherwise ('B').
+    """
+
+    def __init__(self, name: Optional[str] = None):
+        """Initializes empty tables.
+
+        Args:
+            name (Optional[str]): The name of the fault tree.
+        """
+        self.name: Optional[str] = name
+        self.basic_events: List[BasicEvent] = []
+        self.house_events: List[HouseEvent] = []
+        self.gates: List[Gate] = []
+        self.top_index: int = -1
+        self.operators = array('B')
+        self.k_nums = array('I')
+        self.child_offsets = array('Q', [0])
+        self.children = array('I')
+        self.probabilities = array('d')
+        self.house_states = array('B')
+
+    @property
+    def gate_offset(self) -> int:
+        """The node index of the first gate."""
+        return len(self.basic_events) + len(self.house_events)
+
+    @property
+    def num_nodes(self) -> int:
+        """The total number of indexed nodes."""
+        return self.gate_offset + len(self.gates)
+
+    def names(self) -> List[str]:
+        """Returns the node names in index order."""
+        return [str(node) for node in self.basic_events + self.house_events + self.gates]
+
+    def topological_order(self, roots: Optional[Sequence[int]] = None) -> List[int]:
+        """Orders gates so that every gate comes after all of its gate arguments.
+
+        The traversal is an iterative depth-first search, so deep trees do not hit the recursion limit.
+
+        Args:
+            roots (Optional[Sequence[int]]): Gate numbers to start from. Defaults to all gates,
+                starting from the top gate.
+
+        Returns:
+            List[int]: The gate numbers (node index minus ``gate_offset``) reachable from the roots.
+
+        Raises:
+            ValueError: If the gates form a cycle.
+        """
+        gate_offset = self.gate_offset
+        offsets, children = self.child_offsets, self.children
+        if roots is None:
+            top = [self.top_index - gate_offset] if self.top_index >= 0 else []
+            roots = top + list(range(len(self.gates)))
+        order: List[int] = []
+        state = bytearray(len(self.gates))  # 0: new, 1: on the path, 2: done
+        for root in roots:
+            if state[root]:
+                continue
+            state[root] = 1
+            # Each frame is a gate and the position of its next argument to visit.
+            stack = [[root, offsets[root]]]
+            while stack:
+                frame = stack[-1]
+                gate_number, position = frame
+                if position == offsets[gate_number + 1]:
+                    state[gate_number] = 2
+                    order.append(gate_number)
+                    stack.pop()
+                    continue
+                frame[1] += 1
+                child = children[position] - gate_offset
+                if child < 0 or state[child] == 2:
+                    continue
+                if state[child] == 1:
+                    raise ValueError(f"Gate {self.gates[child].name} is in a cycle")
+                state[child] = 1
+                stack.append([child, offsets[child]])
+        return order
+
+    @staticmethod
+    def from_fault_tree(fault_tree) -> 'FaultTreeTables':
+        """Indexes all nodes reachable from the top gate and the registered gates.
+
+        Nodes registered in the fault tree keep their registration order;
+        nodes found only through gate arguments are appended as they are discovered.
+
+        Args:
+            fault_tree (FaultTree): The fault tree to index.
+
+        Returns:
+            FaultTreeTables: The populated tables.
+
+        Raises:
+            ValueError: If a gate has undefined arguments or an unknown operator.
+        """
+        tables = FaultTreeTables(fault_tree.name)
+        # Events are equal by name, and keying by name avoids the Python-level Event.__hash__.
+        basic_index: Dict[Optional[str], int] = {}
+        house_index: Dict[Optional[str], int] = {}
+        gate_index: Dict[Optional[str], int] = {}
+
+        def add_basic_event(basic_event: BasicEvent):
+            if basic_event.name not in basic_index:
+                basic_index[basic_event.name] = len(tables.basic_events)
+                tables.basic_events.append(basic_event)
+
+        def add_house_event(house_event: HouseEvent):
+            if house_event.name not in house_index:
+                house_index[house_event.name] = len(tables.house_events)
+                tables.house_events.append(house_event)
+
+        for basic_event in fault_tree.basic_events:
+            add_basic_event(basic_event)
+        for house_event in fault_tree.house_events:
+            add_house_event(house_event)
+
+        roots = [fault_tree.top_gate] if fault_tree.top_gate is not None else []
+        queue = deque(roots + list(fault_tree.gates))
+        while queue:
+            gate = queue.popleft()
+            if gate.name in gate_index:
+                continue
+            if gate.u_arguments:
+                raise ValueError(f"Gate {gate.name} has arguments of undefined type")
+            gate_index[gate.name] = len(tables.gates)
+            tables.gates.append(gate)
+            for basic_event in gate.b_arguments:
+                add_basic_event(basic_event)
+            for house_event in gate.h_arguments:
+                add_house_event(house_event)
+            queue.extend(gate.g_arguments)
+
+        house_offset = len(tables.basic_events)
+        gate_offset = tables.gate_offset
+        for gate in tables.gates:
+            tables.operators.append(operator_code(gate))
+            tables.k_nums.append(gate.k_num or 0)
+            tables.children.extend(basic_index[x.name] for x in gate.b_arguments)
+            tables.children.extend(house_offset + house_index[x.name] for x in gate.h_arguments)
+            tables.children.extend(gate_offset + gate_index[x.name] for x in gate.g_arguments)
+            tables.child_offsets.append(len(tables.children))
+
+        tables.probabilities.extend(probability_value(x.probability) for x in tables.basic_events)
+        tables.house_states.extend(1 if x.state in ('true', True) else 0 for x in tables.house_events)
+        if fault_tree.top_gate is not None:
+            tables.top_index = gate_offset + gate_index[fault_tree.top_gate.name]
+        return tables
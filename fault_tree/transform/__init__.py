@@ -0,0 +1,4 @@
+from .graph import GateGraph, build_copy
+from .preprocess import coalesce, preprocess
+from .expand import at_least, exclusive_or, expand, expand_connectives
+from .nnf import negation_normal_form
@@ -0,0 +1,124 @@
+"""Sharing-preserving expansion of AT-LEAST and XOR gates into AND/OR/NOT gates.
+
+A naive expansion of an AT-LEAST gate with ``k`` out of ``n`` arguments is an OR
+of all ``C(n, k)`` AND combinations. The expansion here is the sequential
+counter of dynamic programming instead: with ``c(i, j)`` true iff at least
+``j`` of the first ``i`` arguments hold,
+
+    c(i, j) = c(i - 1, j) + c(i - 1, j - 1) * x_i,    c(i, 0) = TRUE,    c(i, j) = FALSE for j > i,
+
+and the gate is ``c(n, k)``. Only the cells that can still reach ``k`` are built,
+so a gate takes at most ``2 * n * k`` AND/OR gates.
+
+An XOR gate keeps both polarities of its prefixes, ``p`` the XOR and ``q`` the
+XNOR of the arguments so far:
+
+    p' = p * -x + q * x,    q' = q * -x + p * x,
+
+so negations only apply to the arguments themselves, and the gate takes at
+most ``6 * n`` AND/OR gates.
+
+The new gates are hash-consed with all others, so equal counters and prefixes
+are shared between gates over the same arguments. The expanded tree has only
+AND, OR, and NOT gates, and can go to engines and tools without AT-LEAST and XOR
+support, e.g. before MOCUS, which would otherwise enumerate the combinations.
+"""
+from typing import List, Optional, Sequence, Tuple
+
+from fault_tree import FaultTree
+from fault_tree.io.tables import FaultTreeTables
+from fault_tree.transform.graph import AND, ATLEAST, NOT, OR, XOR, GateGraph
+from fault_tree.transform.preprocess import coalesce
+
+
+def at_least(graph: GateGraph, arguments: Sequence[int], k_num: int, name: Optional[str] = None) -> int:
+    """Adds the sequential counter of an AT-LEAST gate.
+
+    Args:
+        graph (GateGraph): The graph to add the gates to.
+        arguments (Sequence[int]): The argument signals.
+        k_num (int): The number of arguments that must hold.
+        name (Optional[str]): The name of the gate of the result.
+
+    Returns:
+        int: The signal of the gate, or of the argument or constant it simplifies to.
+    """
+    num_arguments = len(arguments)
+    if k_num <= 0 or k_num > num_arguments:
+        return graph.constant(k_num <= 0)
+    counts: List[int] = [graph.true] + [graph.false] * k_num  # counts[j] is c(i, j)
+    for i, argument in enumerate(arguments, start=1):
+        low = max(1, k_num - (num_arguments - i))  # cells that can no longer reach k are not built
+        for j in range(min(i, k_num), low - 1, -1):
+            counts[j] = graph.add(OR, [counts[j], graph.add(AND, [counts[j - 1], argument])],
+                                  name=name if (i, j) == (num_arguments, k_num) else None)
+    return counts[k_num]
+
+
+def exclusive_or(graph: GateGraph, arguments: Sequence[int], name: Optional[str] = None) -> int:
+    """Adds the AND/OR expansion of an XOR gate.
+
+    Args:
+        graph (GateGraph): The graph to add the gates to.
+        arguments (Sequence[int]): The argument signals.
+        name (Optional[str]): The name of the gate of the result.
+
+    Returns:
+        int: The signal of the gate, or of the argument or constant it simplifies to.
+    """
+    if not arguments:
+        return graph.false
+    odd, even = arguments[0], graph.add(NOT, [arguments[0]])
+    for i, argument in enumerate(arguments[1:], start=2):
+        negation = graph.add(NOT, [argument])
+        if i == len(arguments):
+            return graph.add(OR, [graph.add(AND, [odd, negation]), graph.add(AND, [even, argument])], name=name)
+        odd, even = (graph.add(OR, [graph.add(AND, [odd, negation]), graph.add(AND, [even, argument])]),
+                     graph.add(OR, [graph.add(AND, [even, negation]), graph.add(AND, [odd, argument])]))
+    return odd
+
+
+def expand_connectives(graph: GateGraph, root: int) -> Tuple[GateGraph, int]:
+    """Expands the AT-LEAST and XOR gates under a root into AND/OR/NOT gates.
+
+    Args:
+        graph (GateGraph): The gates.
+        root (int): The signal of the top gate.
+
+    Returns:
+        Tuple[GateGraph, int]: A new graph with the expanded gates under the root, and the new root signal.
+    """
+    result = GateGraph(graph.tables)
+    signals: List[int] = list(range(graph.num_basic + 2)) + [-1] * len(graph.operators)
+    for gate_number in graph.reachable(root):
+        operator, name = graph.operators[gate_number], graph.names[gate_number]
+        arguments = [signals[x] for x in graph.arguments[gate_number]]
+        if operator == ATLEAST:
+            signal = at_least(result, arguments, graph.k_nums[gate_number], name)
+        elif operator == XOR:
+            signal = exclusive_or(result, arguments, name)
+        else:
+            signal = result.add(operator, arguments, graph.k_nums[gate_number], name)
+        signals[graph.num_basic + 2 + gate_number] = signal
+    return result, signals[root]
+
+
+def expand(fault_tree: FaultTree) -> FaultTree:
+    """Rewrites the AT-LEAST and XOR gates under the top gate of a fault tree with AND, OR, and NOT gates.
+
+    The tree is preprocessed (:func:`fault_tree.transform.preprocess`) on the way,
+    and the original fault tree is not changed.
+
+    Args:
+        fault_tree (FaultTree): The fault tree.
+
+    Returns:
+        FaultTree: An equivalent fault tree of AND, OR, and NOT gates over copies of the basic events.
+
+    Raises:
+        ValueError: If there is no top gate, a gate is malformed, or the gates form a cycle.
+    """
+    graph, root = GateGraph.from_tables(FaultTreeTables.from_fault_tree(fault_tree))
+    graph, root = expand_connectives(graph, root)
+    graph, root = coalesce(graph, root)
+    return graph.to_fault_tree(root, fault_tree)
@@ -0,0 +1,309 @@
+"""Hash-consed gate graphs for rewriting fault trees.
+
+A ``GateGraph`` holds new gates over the basic events of indexed fault tree
+tables. Every node is a signal: signals ``0..num_basic-1`` are the basic
+events, the next two the constants FALSE and TRUE, and the rest gates in the
+order of their creation, so that the arguments of a gate always come before it.
+
+``add`` simplifies every gate before it is created:
+
+- constant arguments are folded, so house events never reach a gate;
+- duplicate AND/OR arguments are merged, an argument next to its negation
+  absorbs the gate, and equal XOR arguments cancel in pairs;
+- AT-LEAST gates with trivial thresholds become constants, OR, or AND gates,
+  and others split off repeated arguments as ``x * atleast_(k-m)(rest) + atleast_k(rest)``;
+- double negations are removed, and gates left with one argument pass it through;
+- gates with equal operators, thresholds, and (sorted) arguments are created once.
+
+Rewriting passes build a new graph from the gates of an old one in creation
+order, and ``to_fault_tree`` turns the gates under a root into a fault tree.
+"""
+import copy
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ordered_set import OrderedSet
+
+from fault_tree import FaultTree
+from fault_tree.event import BasicEvent, HouseEvent
+from fault_tree.io.tables import FaultTreeTables, OPERATOR_CODES, build_fault_tree
+
+AND = OPERATOR_CODES["and"]
+OR = OPERATOR_CODES["or"]
+ATLEAST = OPERATOR_CODES["atleast"]
+NOT = OPERATOR_CODES["not"]
+XOR = OPERATOR_CODES["xor"]
+
+
+class GateGraph:
+    """Simplified, hash-consed gates over the basic events of indexed tables.
+
+    Attributes:
+        tables (FaultTreeTables): The indexed fault tree of the basic events.
+        num_basic (int): The number of basic events.
+        false (int): The signal of the constant FALSE.
+        true (int): The signal of the constant TRUE.
+        operators (List[int]): The operator code of every gate.
+        k_nums (List[int]): The k number of every gate, 0 for non-atleast gates.
+        arguments (List[Tuple[int, ...]]): The argument signals of every gate.
+        names (List[Optional[str]]): The name of every gate, None for gates made by rewriting.
+    """
+
+    # The prefix of the names given to unnamed gates in fault trees.
+    NAME_PREFIX = "N"
+
+    def __init__(self, tables: FaultTreeTables):
+        """Initializes a graph without gates.
+
+        Args:
+            tables (FaultTreeTables): The indexed fault tree of the basic events.
+        """
+        self.tables = tables
+        self.num_basic = len(tables.basic_events)
+        self.false, self.true = self.num_basic, self.num_basic + 1
+        self.operators: List[int] = []
+        self.k_nums: List[int] = []
+        self.arguments: List[Tuple[int, ...]] = []
+        self.names: List[Optional[str]] = []
+        self._unique: Dict[Tuple[int, int, Tuple[int, ...]], int] = {}
+
+    @staticmethod
+    def from_tables(tables: FaultTreeTables) -> Tuple['GateGraph', int]:
+        """Adds the gates under the top gate of indexed tables to a new graph.
+
+        Args:
+            tables (FaultTreeTables): The indexed fault tree.
+
+        Returns:
+            Tuple[GateGraph, int]: The graph and the signal of the top gate.
+
+        Raises:
+            ValueError: If there is no top gate, a NOT gate does not have exactly one argument,
+                or the gates form a cycle.
+        """
+        if tables.top_index < 0:
+            raise ValueError("The fault tree has no top gate")
+        graph = GateGraph(tables)
+        gate_offset = tables.gate_offset
+        offsets, children = tables.child_offsets, tables.children
+        signals = list(range(graph.num_basic)) + [graph.constant(x) for x in tables.house_states]
+        signals.extend([-1] * len(tables.gates))
+        for gate_number in tables.topological_order([tables.top_index - gate_offset]):
+            arguments = [signals[x] for x in children[offsets[gate_number]:offsets[gate_number + 1]]]
+            signals[gate_offset + gate_number] = graph.add(tables.operators[gate_number], arguments,
+                                                           tables.k_nums[gate_number], tables.gates[gate_number].name)
+        return graph, signals[tables.top_index]
+
+    def constant(self, value: bool) -> int:
+        """Returns the signal of a constant."""
+        return self.true if value else self.false
+
+    def gate(self, signal: int) -> int:
+        """Returns the gate number of a signal, negative for basic events and constants."""
+        return signal - self.num_basic - 2
+
+    def operator(self, signal: int) -> int:
+        """Returns the operator code of a gate signal, -1 for basic events and constants."""
+        gate_number = self.gate(signal)
+        return self.operators[gate_number] if gate_number >= 0 else -1
+
+    def add(self, operator: int, arguments: Sequence[int], k_num: int = 0, name: Optional[str] = None) -> int:
+        """Adds a simplified gate, or finds an equal one.
+
+        Args:
+            operator (int): The operator code.
+            arguments (Sequence[int]): The argument signals.
+            k_num (int): The k number of an AT-LEAST gate.
+            name (Optional[str]): The name of the gate; an equal gate without a name takes it.
+
+        Returns:
+            int: The signal of the gate, or of the argument or constant it simplifies to.
+
+        Raises:
+            ValueError: If a NOT gate does not have exactly one argument, or the operator is unknown.
+        """
+        false, true = self.false, self.true
+        if operator == NOT:
+            if len(arguments) != 1:
+                raise ValueError(f"NOT gate {name} must have exactly one argument")
+            argument = arguments[0]
+            if argument in (false, true):
+                return false + true - argument
+            if self.operator(argument) == NOT:
+                return self.arguments[self.gate(argument)][0]
+            return self._node(NOT, (argument,), 0, name)
+        if operator == ATLEAST:
+            k_num -= sum(1 for x in arguments if x == true)
+            arguments = [x for x in arguments if x not in (false, true)]
+            if k_num <= 0:
+                return true
+            if k_num > len(arguments):
+                return false
+            if 1 < k_num < len(arguments):
+                counts = Counter(arguments)
+                if len(counts) == len(arguments):
+                    return self._node(ATLEAST, tuple(sorted(arguments)), k_num, name)
+                # A repeated argument x adds its multiplicity m to the count when it holds:
+                # atleast_k(x, ..., x, rest) = x * atleast_(k-m)(rest) + atleast_k(rest).
+                repeated = next(x for x in arguments if counts[x] > 1)
+                rest = [x for x in arguments if x != repeated]
+                held = self.add(AND, [repeated, self.add(ATLEAST, rest, k_num - counts[repeated])])
+                return self.add(OR, [held, self.add(ATLEAST, rest, k_num)], name=name)
+            operator = OR if k_num == 1 else AND
+        if operator == XOR:
+            parity = 0
+            odd = set()  # the arguments that occur an odd number of times
+            for argument in arguments:
+                if argument == true:
+                    parity ^= 1
+                elif argument != false:
+                    odd ^= {argument}
+            if not odd:
+                return self.constant(parity)
+            signal = odd.pop() if len(odd) == 1 else self._node(XOR, tuple(sorted(odd)), 0, None if parity else name)
+            return self.add(NOT, [signal], name=name) if parity else signal
+        if operator not in (AND, OR):
+            raise ValueError(f"Unknown operator code: {operator}")
+        absorbing, identity = (false, true) if operator == AND else (true, false)
+        unique = set(arguments)
+        unique.discard(identity)
+        if absorbing in unique:
+            return absorbing
+        for argument in unique:
+            if self.operator(argument) == NOT and self.arguments[self.gate(argument)][0] in unique:
+                return absorbing
+        if len(unique) < 2:
+            return unique.pop() if unique else identity
+        return self._node(operator, tuple(sorted(unique)), 0, name)
+
+    def _node(self, operator: int, arguments: Tuple[int, ...], k_num: int, name: Optional[str]) -> int:
+        """Creates a gate unless an equal one exists."""
+        key = (operator, k_num, arguments)
+        signal = self._unique.get(key)
+        if signal is None:
+            signal = self._unique[key] = self.num_basic + 2 + len(self.operators)
+            self.operators.append(operator)
+            self.k_nums.append(k_num)
+            self.arguments.append(arguments)
+            self.names.append(name)
+        elif name is not None and self.names[self.gate(signal)] is None:
+            self.names[self.gate(signal)] = name
+        return signal
+
+    def reachable(self, root: int) -> List[int]:
+        """Returns the numbers of the gates under a root signal in creation order, arguments first."""
+        needed = bytearray(len(self.operators))
+        if self.gate(root) >= 0:
+            needed[self.gate(root)] = 1
+        for gate_number in range(len(self.operators) - 1, -1, -1):
+            if needed[gate_number]:
+                for argument in self.arguments[gate_number]:
+                    if self.gate(argument) >= 0:
+                        needed[self.gate(argument)] = 1
+        return [x for x in range(len(self.operators)) if needed[x]]
+
+    def to_fault_tree(self, root: int, fault_tree: FaultTree) -> FaultTree:
+        """Turns the gates under a root signal into a fault tree.
+
+        The root becomes the top gate under the name of the top gate of the original fault tree;
+        a basic event or constant root gets an OR gate of one argument. House events are only
+        kept for a constant top gate. See ``build_copy`` for the events and the gate names.
+
+        Args:
+            root (int): The signal of the top gate.
+            fault_tree (FaultTree): The original fault tree of the tables.
+
+        Returns:
+            FaultTree: A new fault tree with the gates under the root.
+
+        Raises:
+            ValueError: If the original fault tree has no top gate.
+        """
+        house_events: List[Tuple[Optional[str], str]] = []
+        if root in (self.false, self.true):
+            # An original house event of the same state stands for the constant.
+            same_state = [x.name for x, value in zip(self.tables.house_events, self.tables.house_states)
+                          if value == (root == self.true)]
+            house_events.append((same_state[0] if same_state else None, 'true' if root == self.true else 'false'))
+        gate_offset = self.num_basic + len(house_events)
+        order = self.reachable(root)
+        positions = {gate_number: gate_offset + i for i, gate_number in enumerate(order)}
+        names = [self.names[x] for x in order]
+        operators = [self.operators[x] for x in order]
+        k_nums = [self.k_nums[x] for x in order]
+        child_offsets = [0]
+        children: List[int] = []
+        for gate_number in order:
+            children.extend(x if x < self.num_basic else positions[self.gate(x)] for x in self.arguments[gate_number])
+            child_offsets.append(len(children))
+        if self.gate(root) >= 0:
+            top_index = positions[self.gate(root)]
+        else:
+            names.append(None)
+            operators.append(OR)
+            k_nums.append(0)
+            children.append(root if root < self.num_basic else self.num_basic)
+            child_offsets.append(len(children))
+            top_index = gate_offset + len(order)
+        return build_copy(fault_tree, self.tables, house_events, names, operators, k_nums,
+                          child_offsets, children, top_index)
+
+
+def build_copy(fault_tree: FaultTree, tables: FaultTreeTables, house_events: Sequence[Tuple[Optional[str], str]],
+               gate_names: Sequence[Optional[str]], operators: Sequence[int], k_nums: Sequence[int],
+               child_offsets: Sequence[int], children: Sequence[int], top_index: int) -> FaultTree:
+    """Links new gates over copies of the events of a fault tree, given in the ``FaultTreeTables`` layout.
+
+    The basic events and CCF groups are copies of the original ones, so the original
+    fault tree is not changed. The top gate takes the name of the original top gate;
+    other gates and house events without a name or with a taken name get fresh
+    ``GateGraph.NAME_PREFIX`` names.
+
+    Args:
+        fault_tree (FaultTree): The original fault tree.
+        tables (FaultTreeTables): The indexed original fault tree; its basic events keep their indices.
+        house_events (Sequence[Tuple[Optional[str], str]]): The name and state of every house event.
+        gate_names (Sequence[Optional[str]]): The gate names in index order.
+        operators (Sequence[int]): Operator code per gate.
+        k_nums (Sequence[int]): The k number per gate, 0 for non-atleast gates.
+        child_offsets (Sequence[int]): CSR row offsets.
+        children (Sequence[int]): CSR node indices of gate arguments.
+        top_index (int): Node index of the top gate.
+
+    Returns:
+        FaultTree: The new fault tree.
+
+    Raises:
+        ValueError: If the original fault tree has no top gate.
+    """
+    if fault_tree.top_gate is None:
+        raise ValueError("The fault tree has no top gate")
+    basic_events = [BasicEvent(x.name, x.probability) for x in tables.basic_events]
+    gate_offset = len(basic_events) + len(house_events)
+    names = [x for x, _ in house_events] + list(gate_names)
+    names[top_index - len(basic_events)] = fault_tree.top_gate.name
+    taken = {x.name for x in basic_events} | {fault_tree.top_gate.name}
+    for i, name in enumerate(names):
+        if i != top_index - len(basic_events):
+            if name in taken:
+                names[i] = None
+            taken.add(name)
+    counter = 0
+    for i, name in enumerate(names):
+        if name is None:
+            while f"{GateGraph.NAME_PREFIX}{counter}" in taken:
+                counter += 1
+            names[i] = f"{GateGraph.NAME_PREFIX}{counter}"
+            taken.add(names[i])
+    house_copies = [HouseEvent(name, state) for name, (_, state) in zip(names, house_events)]
+    result = build_fault_tree(fault_tree.name, basic_events, house_copies, names[len(house_events):],
+                              operators, k_nums, child_offsets, children, top_index)
+
+    copies = {x.name: x for x in basic_events}
+    for ccf_group in fault_tree.ccf_groups:
+        group = copy.copy(ccf_group)
+        if hasattr(ccf_group, 'members'):
+            group.members = OrderedSet(copies.get(x.name, x) for x in ccf_group.members)
+        result.ccf_groups.add(group)
+    result.non_ccf_events.update(copies.get(x.name, x) for x in fault_tree.non_ccf_events)
+    return result
@@ -0,0 +1,134 @@
+"""Linear-time negation normal form of fault trees.
+
+Negations are pushed down to the events with De Morgan's laws and their
+counterparts for the other operators:
+
+    -(a * b) = -a + -b,    -(a + b) = -a * -b,
+    -atleast_k(x_1, ..., x_n) = atleast_(n-k+1)(-x_1, ..., -x_n),
+    -(a ^ b ^ ...) = -a ^ b ^ ...
+
+Every node is rewritten at most twice, once for each polarity it is reached in,
+and both versions are memoized, so a gate shared by negated and plain parents
+becomes two gates, not two copies of its subgraph. NOT gates disappear into
+their polarities; what is left are NOT gates of single basic or house events,
+one per negated event, and single-argument copies of the arguments that XOR and
+AT-LEAST gates get more than once. Gates keep their names and their argument order, a
+negated gate takes the name of the NOT gate over it, and the structure is not
+simplified otherwise (see :mod:`fault_tree.transform.preprocess` for that).
+
+The traversal is iterative, so deep trees do not hit the recursion limit.
+"""
+from typing import Dict, List, Optional, Tuple
+
+from fault_tree import FaultTree
+from fault_tree.io.tables import FaultTreeTables
+from fault_tree.transform.graph import AND, ATLEAST, NOT, OR, XOR, build_copy
+
+
+def negation_normal_form(fault_tree: FaultTree) -> FaultTree:
+    """Pushes the negations under the top gate of a fault tree down to the events.
+
+    Args:
+        fault_tree (FaultTree): The fault tree.
+
+    Returns:
+        FaultTree: An equivalent fault tree over copies of the events whose only NOT gates
+        negate single basic or house events. The original fault tree is not changed.
+
+    Raises:
+        ValueError: If there is no top gate, a NOT gate does not have exactly one argument,
+            or the gates form a cycle.
+    """
+    tables = FaultTreeTables.from_fault_tree(fault_tree)
+    if tables.top_index < 0:
+        raise ValueError("The fault tree has no top gate")
+    tables.topological_order([tables.top_index - tables.gate_offset])  # rejects cycles
+    gate_offset = tables.gate_offset
+    offsets, children = tables.child_offsets, tables.children
+
+    # The new gates: a name, an operator, a k number, and the original node and polarity they rewrite.
+    # Copies of repeated arguments rewrite a new node in no polarity.
+    names: List[Optional[str]] = []
+    operators: List[int] = []
+    k_nums: List[int] = []
+    sources: List[Tuple[int, Optional[bool]]] = []
+    memo: Dict[Tuple[int, bool], int] = {}  # the new node of every original node and polarity
+
+    def rewrite(node: int, negated: bool) -> int:
+        """Returns the new node of an original node in a polarity, creating the gate if it is new."""
+        name = None
+        while node >= gate_offset and tables.operators[node - gate_offset] == NOT:
+            gate_number = node - gate_offset
+            if offsets[gate_number + 1] - offsets[gate_number] != 1:
+                raise ValueError(f"NOT gate {tables.gates[gate_number].name} must have exactly one argument")
+            if not negated:
+                name = tables.gates[gate_number].name
+            node, negated = children[offsets[gate_number]], not negated
+        if node < gate_offset and not negated:
+            return node
+        if node >= gate_offset and not negated:
+            name = tables.gates[node - gate_offset].name
+        key = (node, negated)
+        if key not in memo:
+            memo[key] = gate_offset + len(names)
+            names.append(name)
+            sources.append(key)
+        elif name is not None and names[memo[key] - gate_offset] is None:
+            names[memo[key] - gate_offset] = name
+        return memo[key]
+
+    def duplicate(new_node: int) -> int:
+        """Returns a new gate with the value of a new node."""
+        source = sources[new_node - gate_offset] if new_node >= gate_offset else (new_node, False)
+        if not (source[0] < gate_offset and source[1]):  # not a NOT gate of an event
+            source = (new_node, None if new_node >= gate_offset else False)
+        names.append(None)
+        sources.append(source)
+        return gate_offset + len(names) - 1
+
+    top = rewrite(tables.top_index, False)
+    new_children: List[int] = []
+    child_offsets = [0]
+    for node, negated in sources:  # grows with the new gates of the arguments
+        if negated is None or node < gate_offset:  # a negated event or a copy
+            operators.append(NOT if negated else OR)
+            k_nums.append(0)
+            new_children.append(node)
+            child_offsets.append(len(new_children))
+            continue
+        gate_number = node - gate_offset
+        arguments = children[offsets[gate_number]:offsets[gate_number + 1]]
+        operator, k_num = tables.operators[gate_number], tables.k_nums[gate_number]
+        if not negated:
+            new_arguments = [rewrite(x, False) for x in arguments]
+        elif operator == XOR:
+            new_arguments = [rewrite(x, i == 0) for i, x in enumerate(arguments)]
+        else:
+            new_arguments = [rewrite(x, True) for x in arguments]
+            if operator == ATLEAST:
+                k_num = len(arguments) - k_num + 1
+            else:
+                operator = OR if operator == AND else AND
+        # Different arguments may meet in one new node, e.g. two NOT gates of an event.
+        # AND/OR gates drop the repetitions; XOR and AT-LEAST gates count them, so they get copies.
+        if operator in (AND, OR):
+            new_arguments = list(dict.fromkeys(new_arguments))
+        else:
+            seen = set()
+            for i, argument in enumerate(new_arguments):
+                if argument in seen:
+                    new_arguments[i] = duplicate(argument)
+                seen.add(new_arguments[i])
+        new_children.extend(new_arguments)
+        operators.append(operator)
+        k_nums.append(k_num)
+        child_offsets.append(len(new_children))
+    if top < gate_offset:  # the top gate is an even number of negations of an event
+        names.append(None)
+        operators.append(OR)
+        k_nums.append(0)
+        new_children.append(top)
+        child_offsets.append(len(new_children))
+        top = gate_offset + len(names) - 1
+    house_events = [(x.name, 'true' if state else 'false') for x, state in zip(tables.house_events, tables.house_states)]
+    return build_copy(fault_tree, tables, house_events, names, operators, k_nums, child_offsets, new_children, top)
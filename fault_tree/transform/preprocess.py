@@ -0,0 +1,84 @@
+"""Linear-time preprocessing of fault trees.
+
+The pipeline rebuilds the gates under the top gate in two iterative passes over
+a hash-consed gate graph (:class:`fault_tree.transform.graph.GateGraph`):
+
+1. Every gate is added to the graph in topological order, which propagates
+   the constant states of house events, removes single-argument and
+   pass-through gates and double negations, merges duplicate arguments, and
+   creates identical gates only once.
+2. AND/OR gates whose only parent has the same operator are coalesced into
+   the parent; the arguments of chains of such gates are collected with an
+   explicit stack, so every gate is expanded once. Shared gates stay shared.
+
+Gates keep their names unless they disappear; the top gate keeps its name.
+Both passes take time linear in the size of the tree, up to the sorting of the
+arguments of every gate for hashing.
+"""
+from typing import List, Tuple
+
+from fault_tree import FaultTree
+from fault_tree.io.tables import FaultTreeTables
+from fault_tree.transform.graph import AND, OR, GateGraph
+
+
+def coalesce(graph: GateGraph, root: int) -> Tuple[GateGraph, int]:
+    """Coalesces AND/OR gates into their only parent with the same operator.
+
+    Args:
+        graph (GateGraph): The gates.
+        root (int): The signal of the top gate.
+
+    Returns:
+        Tuple[GateGraph, int]: A new graph with the coalesced gates under the root, and the new root signal.
+    """
+    order = graph.reachable(root)
+    num_parents = [0] * len(graph.operators)
+    parent_operators = [-1] * len(graph.operators)
+    for gate_number in order:
+        for argument in graph.arguments[gate_number]:
+            if graph.gate(argument) >= 0:
+                num_parents[graph.gate(argument)] += 1
+                parent_operators[graph.gate(argument)] = graph.operators[gate_number]
+
+    result = GateGraph(graph.tables)
+    signals: List[int] = list(range(graph.num_basic + 2)) + [-1] * len(graph.operators)
+    merged = bytearray(len(graph.operators))  # the gates coalesced into their parents
+    for gate_number in order:
+        operator = graph.operators[gate_number]
+        if operator in (AND, OR) and num_parents[gate_number] == 1 and parent_operators[gate_number] == operator:
+            merged[gate_number] = 1
+            continue
+        arguments = []
+        stack = list(reversed(graph.arguments[gate_number]))
+        while stack:
+            argument = stack.pop()
+            if graph.gate(argument) >= 0 and merged[graph.gate(argument)]:
+                stack.extend(reversed(graph.arguments[graph.gate(argument)]))
+            else:
+                arguments.append(signals[argument])
+        signals[graph.num_basic + 2 + gate_number] = result.add(operator, arguments, graph.k_nums[gate_number],
+                                                                graph.names[gate_number])
+    return result, signals[root]
+
+
+def preprocess(fault_tree: FaultTree) -> FaultTree:
+    """Simplifies the gates under the top gate of a fault tree.
+
+    House event constants are propagated, nested AND/AND and OR/OR gates are coalesced,
+    single-argument and pass-through gates are removed, and identical gates are merged.
+    The original fault tree is not changed.
+
+    Args:
+        fault_tree (FaultTree): The fault tree.
+
+    Returns:
+        FaultTree: An equivalent fault tree over copies of the basic events. A constant
+        top gate gets a house event of its state as the only argument.
+
+    Raises:
+        ValueError: If there is no top gate, a gate is malformed, or the gates form a cycle.
+    """
+    graph, root = GateGraph.from_tables(FaultTreeTables.from_fault_tree(fault_tree))
+    graph, root = coalesce(graph, root)
+    return graph.to_fault_tree(root, fault_tree)
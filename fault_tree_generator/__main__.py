@@ -1,8 +1,11 @@
 import argparse
 import sys
 import random
-from multiprocessing import Manager
 from argparse import ArgumentTypeError
+from fault_tree.io.compression import compression_for
+from fault_tree.io.corpus import CorpusIndexWriter, index_path_for
+from fault_tree.io.fanout import encode_formats, format_for, is_single_document
+from fault_tree.transform import negation_normal_form
 from fault_tree_generator import ComplexityFactorError, GenerativeFaultTree
 from fault_tree_generator import FaultTreeGeneratorArgParser, ComplexityFactors
 import concurrent.futures
@@ -28,6 +31,7 @@ def setup_factors(args: argparse.Namespace) -> ComplexityFactors:
     random.seed(args.seed)
     complexity_factors = ComplexityFactors()
     complexity_factors.set_min_max_prob(args.min_prob, args.max_prob)
+    complexity_factors.set_error_factor(args.error_factor)
     complexity_factors.set_common_event_factors(args.common_b, args.common_g, args.parents_b, args.parents_g)
     complexity_factors.set_num_factors(args.num_args, args.num_basic, args.num_house, args.num_ccf)
     complexity_factors.set_gate_weights([float(i) for i in args.weights_g])
@@ -37,25 +41,32 @@ def setup_factors(args: argparse.Namespace) -> ComplexityFactors:
     return complexity_factors
 
 
-# Define a function to generate a single fault tree
-def generate(index, args, factors, lock, file_path):
-    try:
-        # Create a new fault tree with a unique name
-        ft_name = f"{args.ft_name}_{index}"
-        fault_tree = GenerativeFaultTree(name=ft_name, factors=factors, top_gate_name=args.root, timeout=args.timeout)
-        result = fault_tree.expr()
-
-        with lock:
-            if file_path == "stdout":
-                sys.stdout.write(result + '\n')
-            else:
-                with open(file_path, 'a') as f:
-                    f.write(result + '\n')
+def generate(index, args, factors, outputs=(("expr", None),)):
+    """Generates a single fault tree in a worker process.
+
+    Every tree is seeded with the run seed offset by its index,
+    so any tree of a run can be regenerated on its own.
+    The tree is encoded (and compressed) here, so the parent only appends bytes.
+    All output formats are fed by a single traversal of the tree.
+    With ``--nest``, negations are pushed down to the events and nested into the formulae of their parents.
+
+    Args:
+        index: The one-based index of the fault tree in the run.
+        args: An argparse.Namespace object containing command-line arguments.
+        factors: Fully configured generation factors.
+        outputs: Pairs of the output format name and codec extension (None for no compression).
 
-    except TimeoutError as e:
-        return f"Fault tree {index} generation timed out: {e}"
-    except Exception as e:
-        return f"Fault tree {index} generation failed with exception: {e}"
+    Returns:
+        A tuple of the index, the seed, and the stored bytes of the fault tree for every output.
+    """
+    seed = args.seed + index
+    random.seed(seed)
+    # Create a new fault tree with a unique name
+    ft_name = f"{args.ft_name}_{index}"
+    fault_tree = GenerativeFaultTree(name=ft_name, factors=factors, top_gate_name=args.root, timeout=args.timeout)
+    if args.nest:
+        fault_tree = negation_normal_form(fault_tree)
+    return index, seed, encode_formats(fault_tree, outputs, seed=seed, factors=factors.as_dict(), nest=args.nest)
 
 
 def main() -> None:
@@ -72,25 +83,50 @@ def main() -> None:
         parser = FaultTreeGeneratorArgParser()
         parsed_args, leftovers = parser.parse_known_args()
         factors = setup_factors(parsed_args)
-        manager = Manager()
-        lock = manager.Lock()
+        paths = parsed_args.out or ["stdout"]
+        outputs = [(parsed_args.format, None) if path == "stdout" else
+                   (format_for(path, parsed_args.format), compression_for(path)) for path in paths]
+        if parsed_args.max_trees > 1:
+            for path, (name, _) in zip(paths, outputs):
+                if is_single_document(name):
+                    raise ArgumentTypeError(f"{path}: the {name} format holds a single fault tree; "
+                                            f"use --max-trees 1")
+        files, index_writers = [], []
+        for path in paths:
+            if path == "stdout":
+                files.append(sys.stdout.buffer)
+                index_writers.append(None)
+            else:
+                # The index is rewritten for every run, so the corpus starts over too.
+                files.append(open(path, 'wb'))
+                index_writers.append(CorpusIndexWriter(index_path_for(path), parsed_args.max_trees))
         # Use ProcessPoolExecutor for parallel processing
         with concurrent.futures.ProcessPoolExecutor(max_workers=parsed_args.max_workers) as executor:
             # Submit tasks to the executor
             future_to_index = {
-                executor.submit(generate, i + 1, parsed_args, factors, lock, parsed_args.out): i + 1
+                executor.submit(generate, i + 1, parsed_args, factors, outputs): i + 1
                 for i in range(parsed_args.max_trees)
             }
 
-            # Process the results as they are completed
+            # Only this process writes, so the byte offsets of the trees are exact
             for future in concurrent.futures.as_completed(future_to_index):
                 index = future_to_index[future]
                 try:
-                    future.result()
+                    index, seed, encoded = future.result()
+                    for out, index_writer, data in zip(files, index_writers, encoded):
+                        offset = out.tell() if index_writer else 0
+                        out.write(data)
+                        if index_writer:
+                            index_writer.add(index - 1, offset, len(data), seed)
                 except concurrent.futures.TimeoutError:
                     print(f"Fault tree {index} generation timed out after {parsed_args.timeout} seconds.", file=sys.stderr)
                 except Exception as e:
                     print(f"Fault tree {index} generation failed with exception: {e}", file=sys.stderr)
+        for out, index_writer in zip(files, index_writers):
+            out.flush()
+            if index_writer:
+                out.close()
+                index_writer.close(factors.as_dict())
 
     except ArgumentTypeError as err:
         print("Argument Error:\n" + str(err), file=sys.stderr)
@@ -63,7 +63,7 @@ class FaultTreeGeneratorArgParser(argparse.ArgumentParser):
         The arguments include options for setting the fault tree name, root gate name,
         random seed, number of basic events, average number of gate arguments, weights for gate types,
         commonality factors, probability ranges, number of house events, number of CCF groups,
-        output file path, and an option to nest NOT connectives in Boolean formulae.
+        output file path and format, and an option to nest NOT connectives in Boolean formulae.
         """
         self.add_argument("--ft-name",
                           type=str,
@@ -137,6 +137,12 @@ class FaultTreeGeneratorArgParser(argparse.ArgumentParser):
                           default=0.01,
                           metavar="float",
                           help="Minimum probability for basic events.")
+        self.add_argument("--error-factor",
+                          type=float,
+                          default=None,
+                          metavar="float",
+                          help="Error factor of lognormal basic event probabilities "
+                               "with the sampled probabilities as means (point estimates if omitted).")
         self.add_argument("--num-house",
                           type=int,
                           help="Number of house events.",
@@ -149,12 +155,24 @@ class FaultTreeGeneratorArgParser(argparse.ArgumentParser):
                           metavar="int")
         self.add_argument("-o", "--out",
                           type=str,
-                          default="stdout",
+                          action="append",
                           metavar="path",
-                          help="File path to write the fault tree.")
+                          help="File path to write the fault trees to, or 'stdout'. Repeat to write several formats "
+                               "in one pass; the format follows the extension (.xml, .bin, .jsonl, .npz, .cnf, .aig, "
+                               "otherwise --format), and .gz, .xz, .bz2 extensions compress it. XML, binary, npz, "
+                               "CNF, and AIGER files hold a single tree and need --max-trees 1; the trees of "
+                               "expression and JSON Lines files are read one at a time through "
+                               "CorpusReader.read_record.")
+        self.add_argument("-f", "--format",
+                          type=str,
+                          choices=["expr", "jsonl"],
+                          default="expr",
+                          help="Output format for stdout and paths without a known extension: boolean expressions "
+                               "or JSON Lines records with per-tree metadata.")
         self.add_argument("--nest",
                           action="store_true",
-                          help="Nest NOT connectives in Boolean formulae.")
+                          help="Nest NOT connectives in Boolean formulae: push negations down to the events "
+                               "and write them into the formulae of their parents.")
         self.add_argument("-n", "--max-trees",
                           type=int,
                           help="Maximum number of fault trees to generate.",
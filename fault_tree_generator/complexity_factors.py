@@ -21,6 +21,7 @@ class ComplexityFactors:
         common_g: The percentage of common gates per gate.
         parents_b: The average number of parents for common basic events.
         parents_g: The average number of parents for common gates.
+        error_factor: The error factor of lognormal basic event probabilities, or None for point estimates.
     """
 
     # Constant configurations
@@ -31,6 +32,7 @@ class ComplexityFactors:
         # Probabilistic factors
         self.min_prob = 0
         self.max_prob = 1
+        self.error_factor = None
 
         # Configurable graph factors
         self.num_basic = None
@@ -73,6 +75,19 @@ class ComplexityFactors:
         self.min_prob = min_value
         self.max_prob = max_value
 
+    def set_error_factor(self, error_factor):
+        """Makes basic event probabilities lognormal around the sampled means.
+
+        Args:
+            error_factor: The error factor of the lognormal distributions, or None for point estimates.
+
+        Raises:
+            FactorError: Invalid values or setup.
+        """
+        if error_factor is not None and error_factor <= 1:
+            raise ComplexityFactorError("Error factor must be greater than 1.")
+        self.error_factor = error_factor
+
     def set_common_event_factors(self, common_b, common_g, parents_b,
                                  parents_g):
         """Sets the factors for the number of common events.
@@ -215,6 +230,28 @@ class ComplexityFactors:
         for i in range(1, len(self.__cum_dist)):
             self.__cum_dist[i] += self.__cum_dist[i - 1]
 
+    def as_dict(self):
+        """Collects the configured factors into a plain dictionary.
+
+        Returns:
+            A JSON-serializable dictionary of the factors.
+        """
+        return {
+            'num_basic': self.num_basic,
+            'num_house': self.num_house,
+            'num_ccf': self.num_ccf,
+            'num_args': self.num_args,
+            'weights_g': self.__weights_g,
+            'common_b': self.common_b,
+            'common_g': self.common_g,
+            'parents_b': self.parents_b,
+            'parents_g': self.parents_g,
+            'num_gate': self.__num_gate,
+            'min_prob': self.min_prob,
+            'max_prob': self.max_prob,
+            'error_factor': self.error_factor,
+        }
+
     def get_random_operator(self):
         """Samples the gate operator.
 
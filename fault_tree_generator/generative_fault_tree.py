@@ -4,7 +4,7 @@ from collections import deque
 
 from fault_tree import FaultTree, CCFGroup
 from fault_tree.event import Gate, BasicEvent, HouseEvent
-from fault_tree.probability import PointEstimate
+from fault_tree.probability import PointEstimate, LogNormal
 
 
 # Define a timeout handler function
@@ -98,12 +98,16 @@ class GenerativeFaultTree(FaultTree):
     def construct_basic_event(self):
         """Constructs a basic event with a unique identifier.
 
+        The probability is lognormal around the sampled mean if the factors have an error factor.
+
         Returns:
             A fully initialized basic event with a random probability.
         """
+        value = random.uniform(self.factors.min_prob, self.factors.max_prob)
+        error_factor = self.factors.error_factor
         basic_event = BasicEvent(
             "B" + str(len(self.basic_events) + 1),
-            PointEstimate(value=random.uniform(self.factors.min_prob, self.factors.max_prob)))
+            LogNormal(mean=value, error_factor=error_factor) if error_factor else PointEstimate(value=value))
         self.basic_events.append(basic_event)
         return basic_event
 
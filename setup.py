@@ -22,6 +22,7 @@ setuptools.setup(
     install_requires=[
         'argparse',
         'ordered_set',
+        'numpy',
     ],
     extras_require={
         'dev': [
@@ -0,0 +1,38 @@
+"""Fault trees shared by the tests of the analyses and transformations."""
+import random
+from typing import List, Sequence
+
+from fault_tree import FaultTree
+from fault_tree.event import BasicEvent, Gate
+from fault_tree_generator import ComplexityFactors, GenerativeFaultTree
+from ordered_set import OrderedSet
+
+
+def make_fault_tree(top: Gate, *gates: Gate, basic_events: Sequence[BasicEvent] = ()) -> FaultTree:
+    """Returns a fault tree named ``TestTree`` with the gates, their arguments, and the basic events registered."""
+    ft = FaultTree(name="TestTree")
+    ft.basic_events.update(basic_events)
+    ft.top_gate = top
+    ft.add_gates(OrderedSet((top,) + gates))
+    return ft
+
+
+def generated_fault_trees(num_args: float, num_basic: int, num_house: int = 0, common: float = 0.3,
+                          weights: Sequence[float] = (1, 1, 1, 0.5, 0.5), num_trees: int = 5) -> List[FaultTree]:
+    """Generates up to ``num_trees`` fault trees from the seeds 0 to 29; small trees may fail to generate."""
+    factors = ComplexityFactors()
+    factors.set_min_max_prob(0.01, 0.1)
+    factors.set_common_event_factors(common, common, 2, 2)
+    factors.set_num_factors(num_args, num_basic, num_house)
+    factors.set_gate_weights(list(weights))
+    factors.calculate()
+    fault_trees = []
+    for seed in range(30):
+        random.seed(seed)
+        try:
+            fault_trees.append(GenerativeFaultTree("T", factors, "root", timeout=1))
+        except (AssertionError, TimeoutError):
+            continue
+        if len(fault_trees) == num_trees:
+            break
+    return fault_trees
@@ -0,0 +1,109 @@
+import itertools
+import os
+import tempfile
+import unittest
+from fault_tree import FaultTree
+from fault_tree.event import Gate, BasicEvent, HouseEvent
+from fault_tree.io import AndInverterGraph, lower_fault_tree, write_aiger
+from ordered_set import OrderedSet
+
+
+def read_aiger(path):
+    # A minimal decoder of the binary AIGER files written by write_aiger
+    with open(path, 'rb') as f:
+        _, max_variable, num_inputs, _, num_outputs, num_ands = f.readline().split()
+        num_inputs, num_ands = int(num_inputs), int(num_ands)
+        outputs = [int(f.readline()) for _ in range(int(num_outputs))]
+        ands = []
+        for i in range(num_ands):
+            lhs = 2 * (num_inputs + i + 1)
+            deltas = []
+            for _ in range(2):
+                delta, shift = 0, 0
+                while True:
+                    byte = f.read(1)[0]
+                    delta |= (byte & 0x7f) << shift
+                    shift += 7
+                    if not byte & 0x80:
+                        break
+                deltas.append(delta)
+            rhs0 = lhs - deltas[0]
+            ands.append((lhs, rhs0, rhs0 - deltas[1]))
+        symbols = f.read().decode('utf-8').splitlines()
+    return int(max_variable), num_inputs, outputs, ands, symbols
+
+
+def simulate(num_inputs, ands, output):
+    # Bit-parallel evaluation over all input assignments: bit m of an input is its value in assignment m
+    size = 1 << num_inputs
+    mask = (1 << size) - 1
+    values = {0: 0}
+    for i in range(num_inputs):
+        values[i + 1] = sum(1 << m for m in range(size) if m >> i & 1)
+
+    def value(literal):
+        bits = values[literal >> 1]
+        return bits ^ mask if literal & 1 else bits
+
+    for lhs, rhs0, rhs1 in ands:
+        values[lhs >> 1] = value(rhs0) & value(rhs1)
+    bits = value(output)
+    return [bool(bits >> m & 1) for m in range(size)]
+
+
+class TestAiger(unittest.TestCase):
+
+    def setUp(self):
+        # root = atleast_2(B1,B2,B3,B4) + (B1^B4^H1)' + (B2*B3*B2')
+        self.ft = FaultTree(name="TestTree")
+        self.events = [BasicEvent(f"B{i}", None) for i in range(1, 5)]
+        top = Gate("root", "or")
+        g2 = Gate("G2", "atleast", k_num=2)
+        g3 = Gate("G3", "not")
+        g4 = Gate("G4", "xor")
+        g5 = Gate("G5", "and")
+        g6 = Gate("G6", "not")
+        g2.add_basic_events(OrderedSet(self.events))
+        g4.add_basic_events(OrderedSet([self.events[0], self.events[3]]))
+        g4.add_house_event(HouseEvent("H1", "true"))
+        g3.add_gate(g4)
+        g6.add_basic_event(self.events[1])
+        g5.add_basic_events(OrderedSet(self.events[1:3]))
+        g5.add_gate(g6)
+        top.add_gates(OrderedSet([g2, g3, g5]))
+        self.ft.top_gate = top
+        self.ft.add_gates(OrderedSet([top]))
+
+    def expected(self):
+        return [sum(x) >= 2 or not (x[0] ^ x[3] ^ True)
+                for x in ((m & 1, m >> 1 & 1, m >> 2 & 1, m >> 3 & 1) for m in range(16))]
+
+    def test_structural_hashing(self):
+        aig = AndInverterGraph(2)
+        a, b = aig.input_literal(0), aig.input_literal(1)
+        self.assertEqual(aig.add_and(a, b), aig.add_and(b, a))
+        self.assertEqual(aig.add_and(a, a ^ 1), 0)
+        self.assertEqual(aig.add_or(a, 1), 1)
+        self.assertEqual(aig.add_atleast(1, [a, b]), aig.add_or(a, b))
+        self.assertEqual(aig.num_ands, 2)
+
+    def test_lowering(self):
+        aig, tables, output = lower_fault_tree(self.ft)
+        ands = [(2 * (aig.num_inputs + i + 1), aig.ands[2 * i], aig.ands[2 * i + 1])
+                for i in range(aig.num_ands)]
+        self.assertEqual(simulate(aig.num_inputs, ands, output), self.expected())
+
+    def test_write(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "tree.aig")
+            aig = write_aiger(self.ft, path)
+            max_variable, num_inputs, outputs, ands, symbols = read_aiger(path)
+        self.assertEqual(max_variable, aig.max_variable)
+        self.assertTrue(all(lhs > rhs0 >= rhs1 for lhs, rhs0, rhs1 in ands))
+        self.assertEqual(simulate(num_inputs, ands, outputs[0]), self.expected())
+        self.assertEqual(symbols[:5], ["i0 B1", "i1 B2", "i2 B3", "i3 B4", "o0 root"])
+        self.assertEqual(symbols[5:], ["c", "TestTree"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import itertools
+import unittest
+from fault_tree import FaultTree
+from fault_tree.analysis import Bdd, BddNodeBudgetError, FaultTreeBdd, top_event_probability
+from fault_tree.event import Gate, BasicEvent, HouseEvent
+from fault_tree.probability import PointEstimate
+from ordered_set import OrderedSet
+
+
+def structure(b1, b2, b3, b4):
+    # root = atleast_2(B1,B2,B3) | ~(B1 ^ B4 ^ H1) with H1 true, and ~(B2 & B3) under an AND
+    return (b1 + b2 + b3 >= 2 or not (b1 ^ b4 ^ True)) and not (b2 and b3 and b4)
+
+
+class TestBdd(unittest.TestCase):
+
+    def setUp(self):
+        self.probabilities = [0.1, 0.2, 0.3, 0.4]
+        self.ft = FaultTree(name="TestTree")
+        self.events = events = [BasicEvent(f"B{i}", PointEstimate(p)) for i, p in enumerate(self.probabilities, start=1)]
+        top = Gate("root", "and")
+        g1 = Gate("G1", "or")
+        g2 = Gate("G2", "atleast", k_num=2)
+        g3 = Gate("G3", "not")
+        g4 = Gate("G4", "xor")
+        g5 = Gate("G5", "not")
+        g6 = Gate("G6", "and")
+        g2.add_basic_events(OrderedSet(events[:3]))
+        g4.add_basic_events(OrderedSet([events[0], events[3]]))
+        g4.add_house_event(HouseEvent("H1", "true"))
+        g3.add_gate(g4)
+        g1.add_gates(OrderedSet([g2, g3]))
+        g6.add_basic_events(OrderedSet(events[1:]))
+        g5.add_gate(g6)
+        top.add_gates(OrderedSet([g1, g5]))
+        self.ft.top_gate = top
+        self.ft.add_gates(OrderedSet([top, g1, g2, g3, g4, g5, g6]))
+
+    def expected_probability(self):
+        total = 0.0
+        for values in itertools.product([False, True], repeat=4):
+            if structure(*values):
+                weight = 1.0
+                for value, p in zip(values, self.probabilities):
+                    weight *= p if value else 1 - p
+                total += weight
+        return total
+
+    def test_probability(self):
+        self.assertAlmostEqual(top_event_probability(self.ft), self.expected_probability(), places=12)
+
+    def test_custom_probabilities(self):
+        bdd = FaultTreeBdd(self.ft)
+        self.assertEqual(len(bdd.order), 4)
+        self.probabilities = [0.5, 0.9, 0.01, 0.7]
+        values = [self.probabilities[int(bdd.tables.basic_events[x].name[1:]) - 1] for x in bdd.order]
+        self.assertAlmostEqual(bdd.probability(values), self.expected_probability(), places=12)
+
+    def test_canonical_complement(self):
+        bdd = Bdd(3)
+        a, b, c = (bdd.variable(i) for i in range(3))
+        f = bdd.apply_or(bdd.apply_and(a, b), c)
+        self.assertEqual(bdd.apply_and(bdd.apply_or(a ^ 1, b ^ 1), c ^ 1), f ^ 1)
+        self.assertEqual(bdd.apply_xor(f, f ^ 1), 0)
+        self.assertEqual(bdd.atleast(2, [a, b, c]), bdd.atleast(2, [c, a, b]))
+        self.assertTrue(all(high & 1 == 0 for high in bdd.highs))
+
+    def test_node_budget(self):
+        with self.assertRaises(BddNodeBudgetError):
+            FaultTreeBdd(self.ft, max_nodes=3)
+
+    def test_missing_probability(self):
+        self.events[3].probability = None
+        with self.assertRaises(ValueError):
+            top_event_probability(self.ft)
+
+
+if __name__ == '__main__':
+    unittest.main()
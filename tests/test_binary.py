@@ -0,0 +1,105 @@
+import os
+import tempfile
+import unittest
+from fault_tree import FaultTree
+from fault_tree.event import Gate, BasicEvent, HouseEvent
+from fault_tree.io import write_binary, read_binary, MappedGate
+from fault_tree.probability import LogNormal, PointEstimate
+from ordered_set import OrderedSet
+
+
+class TestBinary(unittest.TestCase):
+
+    def setUp(self):
+        # Set up a small fault tree with a shared gate
+        self.ft = FaultTree(name="TestTree")
+        self.be1 = BasicEvent("B1", PointEstimate(0.1))
+        self.be2 = BasicEvent("B2", PointEstimate(0.2))
+        self.be3 = BasicEvent("B3", None)
+        self.he1 = HouseEvent("H1", "true")
+        self.top = Gate("root", "or")
+        self.g2 = Gate("G2", "atleast", k_num=2)
+        self.g3 = Gate("G3", "not")
+        self.g2.add_basic_events(OrderedSet([self.be1, self.be2, self.be3]))
+        self.g3.add_basic_event(self.be1)
+        self.top.add_house_event(self.he1)
+        self.top.add_gates(OrderedSet([self.g2, self.g3]))
+        self.ft.top_gate = self.top
+        self.ft.add_gates(OrderedSet([self.top]))
+        handle, self.path = tempfile.mkstemp(suffix=".ftb")
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_round_trip_expr(self):
+        write_binary(self.ft, self.path)
+        with read_binary(self.path) as mapped:
+            self.assertEqual(mapped.name, "TestTree")
+            self.assertEqual(mapped.expr(), self.ft.expr())
+
+    def test_counts(self):
+        write_binary(self.ft, self.path)
+        with read_binary(self.path) as mapped:
+            self.assertEqual(len(mapped.basic_events), 3)
+            self.assertEqual(len(mapped.house_events), 1)
+            self.assertEqual(len(mapped.gates), 3)
+
+    def test_lazy_gate_view(self):
+        write_binary(self.ft, self.path)
+        with read_binary(self.path) as mapped:
+            top = mapped.top_gate
+            self.assertIsInstance(top, MappedGate)
+            self.assertIsNone(top._arguments)
+            self.assertEqual(top.num_arguments(), 3)
+            g2 = mapped.gates[mapped.find("G2") - mapped.gate_offset]
+            self.assertEqual(g2.operator, "atleast")
+            self.assertEqual(g2.k_num, 2)
+            self.assertIs(g2, top.g_arguments[0])
+            with self.assertRaises(TypeError):
+                top.add_basic_event(BasicEvent("B4", None))
+
+    def test_event_attributes(self):
+        write_binary(self.ft, self.path)
+        with read_binary(self.path) as mapped:
+            self.assertAlmostEqual(mapped.basic_events[1].probability.value, 0.2)
+            self.assertIsNone(mapped.basic_events[2].probability)
+            self.assertEqual(mapped.house_events[0].state, "true")
+            self.assertIn(self.be3, mapped.basic_events)
+            self.assertNotIn(self.be3, mapped.gates)
+
+    def test_to_fault_tree(self):
+        write_binary(self.ft, self.path)
+        with read_binary(self.path) as mapped:
+            fault_tree = mapped.to_fault_tree()
+        self.assertEqual(fault_tree.expr(), self.ft.expr())
+        self.assertEqual(fault_tree.gates, self.ft.gates)
+        self.assertTrue(fault_tree.basic_events[0].is_common())
+
+    def test_lognormal_to_point_estimate(self):
+        self.be2.probability = LogNormal(0.01, 3)
+        write_binary(self.ft, self.path)
+        with read_binary(self.path) as mapped:
+            fault_tree = mapped.to_fault_tree()
+        probability = fault_tree.basic_events[1].probability
+        self.assertIsInstance(probability, PointEstimate)
+        self.assertAlmostEqual(probability.value, 0.01)
+
+    def test_trailing_data(self):
+        write_binary(self.ft, self.path)
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        with open(self.path, 'wb') as f:
+            f.write(data + data)
+        with self.assertRaises(ValueError):
+            read_binary(self.path)
+
+    def test_invalid_file(self):
+        with open(self.path, 'wb') as f:
+            f.write(b"not a fault tree" * 16)
+        with self.assertRaises(ValueError):
+            read_binary(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import json
+import os
+import re
+import tempfile
+import unittest
+from unittest import mock
+from fault_tree.analysis import top_event_probability
+from fault_tree.io import CorpusReader, read_mef_xml, record_to_fault_tree
+from fault_tree.probability import LogNormal
+from fault_tree.probability.lognormal import MeanErrorFactor
+from fault_tree_generator.__main__ import main
+
+
+class TestCli(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.expr_path = os.path.join(self.directory.name, "a.txt")
+        self.jsonl_path = os.path.join(self.directory.name, "b.jsonl.gz")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def run_main(self, *args):
+        # Every factor is given, since the defaults are random
+        argv = ["fault_tree_generator", "-N", "1", "-t", "10", "--seed", "7", "-b", "5", "--common-b", "0.003",
+                "--weights-g", "1", "1", "1", "1", "1"]
+        with mock.patch("sys.argv", argv + list(args)):
+            main()
+
+    def records(self):
+        with CorpusReader(self.jsonl_path) as reader:
+            return [json.loads(reader[slot]) for slot in range(len(reader))]
+
+    def test_corpus_index(self):
+        self.run_main("-n", "3", "-o", self.expr_path, "-o", self.jsonl_path)
+        for path in (self.expr_path, self.jsonl_path):
+            with CorpusReader(path) as reader:
+                self.assertEqual(len(reader), 3)
+                for slot in range(3):
+                    self.assertEqual(reader.entry(slot).seed, 7 + slot + 1)
+                self.assertEqual(reader.factors['num_basic'], 5)
+        with CorpusReader(self.expr_path) as reader:
+            exprs = list(reader)
+        records = self.records()
+        self.assertEqual([x['seed'] for x in records], [8, 9, 10])
+        self.assertEqual([record_to_fault_tree(x).expr() for x in records], exprs)
+
+    def test_second_run_overwrites(self):
+        self.run_main("-n", "3", "-o", self.expr_path, "-o", self.jsonl_path)
+        first = os.path.getsize(self.expr_path), os.path.getsize(self.jsonl_path)
+        self.run_main("-n", "3", "-o", self.expr_path, "-o", self.jsonl_path)
+        self.assertEqual((os.path.getsize(self.expr_path), os.path.getsize(self.jsonl_path)), first)
+        with CorpusReader(self.expr_path) as reader:
+            self.assertEqual(sum(reader.entry(slot).length for slot in range(len(reader))), first[0])
+
+    def test_nest(self):
+        self.run_main("-n", "3", "-o", self.jsonl_path)
+        plain = [record_to_fault_tree(x) for x in self.records()]
+        self.run_main("-n", "3", "-o", self.expr_path, "-o", self.jsonl_path, "--nest")
+        nested = [record_to_fault_tree(x) for x in self.records()]
+        with open(self.expr_path) as f:
+            self.assertIsNone(re.search(r"\)'", f.read()))  # only events are negated
+        for ft, nested_ft in zip(plain, nested):
+            self.assertAlmostEqual(top_event_probability(nested_ft), top_event_probability(ft), places=12)
+        xml_path = os.path.join(self.directory.name, "c.xml")
+        self.run_main("-n", "1", "-o", xml_path, "--nest")
+        with open(xml_path) as f:
+            self.assertIn("<not><basic-event", f.read())
+        self.assertAlmostEqual(top_event_probability(read_mef_xml(xml_path)), top_event_probability(plain[0]),
+                               places=12)
+
+    def test_error_factor(self):
+        xml_path = os.path.join(self.directory.name, "c.xml")
+        self.run_main("-n", "1", "-o", xml_path, "-o", self.jsonl_path, "--error-factor", "3")
+        self.assertEqual(self.records()[0]['factors']['error_factor'], 3)
+        with CorpusReader(xml_path) as reader:
+            self.assertEqual(reader.entry(0).seed, 8)
+        for basic_event in read_mef_xml(xml_path).basic_events:
+            self.assertIsInstance(basic_event.probability, LogNormal)
+            self.assertEqual(basic_event.probability.value[MeanErrorFactor.error_factor], 3)
+
+    def test_single_document_formats(self):
+        path = os.path.join(self.directory.name, "d.bin")
+        with self.assertRaises(SystemExit) as context:
+            self.run_main("-n", "3", "-o", path)
+        self.assertEqual(context.exception.code, 2)
+        self.assertFalse(os.path.exists(path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+from fault_tree.io.compression import compress, compression_for, open_input
+from fault_tree.io.corpus import CorpusIndexWriter, CorpusReader, index_path_for
+
+
+class TestCorpus(unittest.TestCase):
+
+    def setUp(self):
+        # Write three trees out of order, leaving one slot empty
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "corpus.txt")
+        self.trees = {2: "(B1*B2)", 0: "(B3+B4')", 3: "atleast_2(B5,B6,B7)"}
+        with open(self.path, 'wb') as out, CorpusIndexWriter(index_path_for(self.path), 4) as index:
+            for slot, tree in self.trees.items():
+                data = tree.encode('utf-8')
+                offset = out.tell()
+                out.write(data + b'\n')
+                index.add(slot, offset, len(data) + 1, seed=100 + slot)
+            index.close({'num_basic': 7})
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_random_access(self):
+        with CorpusReader(self.path) as reader:
+            self.assertEqual(len(reader), 4)
+            for slot, tree in self.trees.items():
+                self.assertEqual(reader[slot], tree)
+            self.assertEqual(reader[-1], self.trees[3])
+
+    def test_entries(self):
+        with CorpusReader(self.path) as reader:
+            entry = reader.entry(0)
+            self.assertEqual(entry.seed, 100)
+            self.assertEqual(entry.length, len(self.trees[0]) + 1)
+            self.assertIsNone(reader.entry(1))
+            with self.assertRaises(KeyError):
+                reader.read_bytes(1)
+            with self.assertRaises(IndexError):
+                reader.entry(4)
+
+    def test_range_and_iteration(self):
+        with CorpusReader(self.path) as reader:
+            self.assertEqual(reader.range(0, 3), [self.trees[0], self.trees[2]])
+            self.assertEqual(list(reader), [self.trees[0], self.trees[2], self.trees[3]])
+
+    def test_factors(self):
+        with CorpusReader(self.path) as reader:
+            self.assertEqual(reader.factors, {'num_basic': 7})
+
+    def test_compressed_members(self):
+        path = os.path.join(self.directory.name, "corpus.txt.gz")
+        with open(path, 'wb') as out, CorpusIndexWriter(index_path_for(path)) as index:
+            for slot, tree in self.trees.items():
+                data = compress((tree + "\n").encode('utf-8'), compression_for(path))
+                index.add(slot, out.tell(), len(data))
+                out.write(data)
+        with CorpusReader(path) as reader:
+            self.assertEqual(reader[3], self.trees[3])
+        with open_input(path) as f:
+            self.assertEqual(f.read().decode('utf-8').split(), list(self.trees.values()))
+
+    def test_invalid_index(self):
+        with open(index_path_for(self.path), 'wb') as f:
+            f.write(b"garbage" * 10)
+        with self.assertRaises(ValueError):
+            CorpusReader(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import itertools
+import os
+import tempfile
+import unittest
+from fault_tree import FaultTree
+from fault_tree.event import Gate, BasicEvent, HouseEvent
+from fault_tree.io import encode_cnf, write_dimacs
+from ordered_set import OrderedSet
+
+
+def count_models(num_vars, clauses):
+    count = 0
+    for values in itertools.product([False, True], repeat=num_vars):
+        if all(any(values[abs(x) - 1] == (x > 0) for x in clause) for clause in clauses):
+            count += 1
+    return count
+
+
+class TestDimacs(unittest.TestCase):
+
+    def setUp(self):
+        # root = atleast_2(B1,B2,B3) + (B1^B4^H1)'
+        self.ft = FaultTree(name="TestTree")
+        events = [BasicEvent(f"B{i}", None) for i in range(1, 5)]
+        top = Gate("root", "or")
+        g2 = Gate("G2", "atleast", k_num=2)
+        g3 = Gate("G3", "not")
+        g4 = Gate("G4", "xor")
+        g2.add_basic_events(OrderedSet(events[:3]))
+        g4.add_basic_events(OrderedSet([events[0], events[3]]))
+        g4.add_house_event(HouseEvent("H1", "true"))
+        g3.add_gate(g4)
+        top.add_gates(OrderedSet([g2, g3]))
+        self.ft.top_gate = top
+        self.ft.add_gates(OrderedSet([top]))
+
+    def expected_count(self):
+        count = 0
+        for b1, b2, b3, b4 in itertools.product([False, True], repeat=4):
+            if b1 + b2 + b3 >= 2 or not (b1 ^ b4 ^ True):
+                count += 1
+        return count
+
+    def test_model_count(self):
+        encoding = encode_cnf(self.ft)
+        clauses = [[]]
+        for literal in encoding.literals:
+            if literal:
+                clauses[-1].append(literal)
+            else:
+                clauses.append([])
+        clauses.pop()
+        self.assertEqual(len(clauses), encoding.num_clauses)
+        # Gate and auxiliary variables are functionally determined by the events.
+        self.assertEqual(count_models(encoding.num_vars, clauses), 16)
+        top = encoding.tables.top_index + 1
+        self.assertEqual(count_models(encoding.num_vars, clauses + [[top]]), self.expected_count())
+
+    def test_write(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "tree.cnf")
+            encoding = write_dimacs(self.ft, path)
+            with open(path) as f:
+                lines = f.read().splitlines()
+        self.assertIn("c 1 B1", lines)
+        header = next(x for x in lines if x.startswith("p cnf"))
+        self.assertEqual(header, f"p cnf {encoding.num_vars} {encoding.num_clauses + 1}")
+        clauses = lines[lines.index(header) + 1:]
+        self.assertEqual(len(clauses), encoding.num_clauses + 1)
+        self.assertTrue(all(x.endswith(" 0") for x in clauses))
+        self.assertEqual(clauses[-1], f"{encoding.tables.top_index + 1} 0")
+
+
+if __name__ == '__main__':
+    unittest.main()
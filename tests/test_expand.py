@@ -0,0 +1,69 @@
+import unittest
+from fault_tree.analysis import minimal_cut_sets, top_event_probability
+from fault_tree.event import Gate, BasicEvent
+from fault_tree.probability import PointEstimate
+from fault_tree.transform import expand
+from ordered_set import OrderedSet
+from tests.helpers import generated_fault_trees, make_fault_tree
+
+
+class TestExpand(unittest.TestCase):
+
+    def fault_tree(self, top, num_events):
+        events = [BasicEvent(f"B{i}", PointEstimate(0.05 * i)) for i in range(1, num_events + 1)]
+        top.add_basic_events(OrderedSet(events))
+        return make_fault_tree(top)
+
+    def test_atleast(self):
+        ft = self.fault_tree(Gate("root", "atleast", 2), 3)
+        result = expand(ft)
+        self.assertEqual({x.operator for x in result.gates}, {"and", "or"})
+        self.assertEqual(result.top_gate.name, "root")
+        self.assertEqual({frozenset(x) for x in minimal_cut_sets(result)},
+                         {frozenset(["B1", "B2"]), frozenset(["B1", "B3"]), frozenset(["B2", "B3"])})
+        self.assertAlmostEqual(top_event_probability(result), top_event_probability(ft), places=15)
+
+    def test_counter_size(self):
+        # 5 out of 12 takes 792 combinations but at most 2 * n * k counter gates.
+        ft = self.fault_tree(Gate("root", "atleast", 5), 12)
+        result = expand(ft)
+        self.assertLessEqual(len(result.gates), 2 * 12 * 5)
+        self.assertAlmostEqual(top_event_probability(result), top_event_probability(ft), places=15)
+
+    def test_xor(self):
+        ft = self.fault_tree(Gate("root", "xor"), 4)
+        result = expand(ft)
+        self.assertEqual({x.operator for x in result.gates}, {"and", "or", "not"})
+        self.assertLessEqual(len(result.gates), 6 * 4 + 4)
+        for gate in result.gates:
+            if gate.operator == "not":
+                self.assertEqual(len(gate.b_arguments), 1)
+        probabilities = [0.05, 0.1, 0.15, 0.2]
+        expected = (1 - (1 - 2 * probabilities[0]) * (1 - 2 * probabilities[1])
+                    * (1 - 2 * probabilities[2]) * (1 - 2 * probabilities[3])) / 2
+        self.assertAlmostEqual(top_event_probability(result), expected, places=15)
+
+    def test_shared_counters(self):
+        # Gates equal up to the order of their arguments share one expansion.
+        top, g1, g2 = Gate("root", "and"), Gate("G1", "atleast", 2), Gate("G2", "atleast", 2)
+        events = [BasicEvent(f"B{i}", PointEstimate(0.1)) for i in range(1, 5)]
+        g1.add_basic_events(OrderedSet(events))
+        g2.add_basic_events(OrderedSet(reversed(events)))
+        top.add_basic_event(events[0])
+        top.add_gates(OrderedSet([g1, g2]))
+        ft = make_fault_tree(top)
+        single = self.fault_tree(Gate("root", "atleast", 2), 4)
+        self.assertEqual(len(expand(ft).gates), len(expand(single).gates) + 1)
+
+    def test_generated(self):
+        fault_trees = generated_fault_trees(4, 60, 5)
+        self.assertTrue(fault_trees)
+        for ft in fault_trees:
+            result = expand(ft)
+            self.assertEqual(result.top_gate.name, "root")
+            self.assertLessEqual({x.operator for x in result.gates}, {"and", "or", "not"})
+            self.assertAlmostEqual(top_event_probability(result), top_event_probability(ft), places=12)
+
+
+if __name__ == '__main__':
+    unittest.main()
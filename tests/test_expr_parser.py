@@ -0,0 +1,103 @@
+import concurrent.futures
+import os
+import tempfile
+import unittest
+from fault_tree import FaultTree, size_summary
+from fault_tree.event import Gate, BasicEvent, HouseEvent
+from fault_tree.io import parse_expr, parse_expr_file
+from fault_tree.io.compression import open_output
+from fault_tree.io.expr_parser import bounded_map, line_chunks
+from ordered_set import OrderedSet
+
+
+class TestExprParser(unittest.TestCase):
+
+    def test_round_trip(self):
+        # Build a tree with every operator and compare the printed expressions
+        top = Gate("root", "and")
+        g_or = Gate("G2", "or")
+        g_xor = Gate("G3", "xor")
+        g_not = Gate("G4", "not")
+        g_atleast = Gate("G5", "atleast", k_num=2)
+        events = [BasicEvent(f"B{i}", None) for i in range(1, 7)]
+        g_or.add_basic_events(OrderedSet(events[0:2]))
+        g_xor.add_basic_events(OrderedSet(events[2:4]))
+        g_not.add_gate(g_xor)
+        g_atleast.add_basic_events(OrderedSet(events[4:6]))
+        g_atleast.add_gate(g_or)
+        top.add_house_event(HouseEvent("H1", "true"))
+        top.add_gates(OrderedSet([g_or, g_not, g_atleast]))
+        ft = FaultTree("Test")
+        ft.top_gate = top
+        parsed = parse_expr(ft.expr(), house_states={"H1": "true"})
+        self.assertEqual(parsed.expr(), ft.expr())
+        self.assertEqual(parsed.top_gate.name, "root")
+        self.assertEqual(len(parsed.house_events), 1)
+        self.assertEqual(size_summary(parsed)['gate_types']['atleast'], 1)
+
+    def test_interning(self):
+        parsed = parse_expr("((B1*B2)+(B1*B2)'+B1)")
+        self.assertEqual(len(parsed.basic_events), 2)
+        self.assertEqual(len(parsed.gates), 3)
+        shared = parsed.top_gate.g_arguments[0]
+        self.assertTrue(shared.is_common())
+        self.assertTrue(parsed.basic_events[0].is_common())
+
+    def test_repeated_gate_in_atleast(self):
+        parsed = parse_expr("atleast_2((B1*B2),(B1*B2),B3)")
+        self.assertEqual(parsed.top_gate.k_num, 2)
+        self.assertEqual(len(parsed.top_gate.g_arguments), 2)
+        self.assertEqual(parsed.expr(), "atleast_2(B3,(B1*B2),(B1*B2))")
+
+    def test_single_event(self):
+        parsed = parse_expr("B1", top_gate_name="G1")
+        self.assertEqual(parsed.top_gate.name, "G1")
+        self.assertEqual(parsed.expr(), "(B1)")
+
+    def test_malformed(self):
+        for text in ["(B1*B2+B3)", "(B1 B2)", "(B1,B2)", "atleast_2(B1+B2)", "B1)", "(B1*", "'", ""]:
+            with self.assertRaises(ValueError):
+                parse_expr(text)
+
+    def test_parse_file(self):
+        lines = ["(B1*B2)", "(B1+B2+B3)", "atleast_2(B1,B2,B3)", "((B1^B2)+B3')"] * 5
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "corpus.txt")
+            with open(path, 'w') as f:
+                f.write("\n".join(lines) + "\n")
+            chunks = line_chunks(path, 3)
+            self.assertEqual(chunks[0][0], 0)
+            self.assertEqual(chunks[-1][1], os.path.getsize(path))
+            trees = parse_expr_file(path, max_workers=1)
+            self.assertEqual([x.expr() for x in trees], lines)
+            summaries = parse_expr_file(path, size_summary, max_workers=2)
+            self.assertEqual([x['basic_events'] for x in summaries], [2, 3, 3, 3] * 5)
+
+    def test_parse_compressed_file(self):
+        lines = ["(B1*B2)", "(B1+B2+B3)", "((B1^B2)+B3')"] * 3
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "corpus.txt.xz")
+            with open_output(path) as f:
+                f.write(("\n".join(lines) + "\n").encode('utf-8'))
+            trees = parse_expr_file(path, max_workers=1, batch_size=4)
+            self.assertEqual([x.expr() for x in trees], lines)
+            summaries = parse_expr_file(path, size_summary, max_workers=2, batch_size=4)
+            self.assertEqual([x['total_gates'] for x in summaries], [1, 1, 3] * 3)
+
+    def test_bounded_map(self):
+        drawn = []
+
+        def tasks():
+            for i in range(20):
+                drawn.append(i)
+                yield (pow, i, 2)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            results = bounded_map(executor, tasks(), 4)
+            self.assertEqual(next(results), 0)
+            self.assertEqual(len(drawn), 5)  # the window, then one more before the first result
+            self.assertEqual(list(results), [i * i for i in range(1, 20)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import io
+import os
+import tempfile
+import unittest
+from fault_tree import FaultTree
+from fault_tree.event import Gate, BasicEvent, HouseEvent
+from fault_tree.io import (FanOutWriter, FormatSink, encode_formats, format_for, is_single_document, register_format,
+                           write_aiger, write_formats, read_binary, read_mef_xml, read_jsonl, read_npz)
+from fault_tree.io.compression import decompress, open_input
+from fault_tree.probability import PointEstimate, LogNormal
+from ordered_set import OrderedSet
+
+
+class GateOrderSink(FormatSink):
+    # Records the names of the gates in the order of the traversal
+    def gate(self, gate_number):
+        self.out.write((self.tables.gates[gate_number].name + "\n").encode('utf-8'))
+
+
+register_format("gate-order", GateOrderSink, (".order",))
+
+
+class TestFanOut(unittest.TestCase):
+
+    def setUp(self):
+        # Set up a tree with a gate shared by two parents
+        self.ft = FaultTree(name="TestTree")
+        events = [BasicEvent("B1", PointEstimate(0.1)), BasicEvent("B2", LogNormal(0.01, 3)),
+                  BasicEvent("B3", PointEstimate(0.3))]
+        top = Gate("root", "or")
+        g2 = Gate("G2", "atleast", k_num=2)
+        g3 = Gate("G3", "not")
+        g4 = Gate("G4", "and")
+        g4.add_basic_events(OrderedSet(events[1:]))
+        g2.add_basic_event(events[0])
+        g2.add_house_event(HouseEvent("H1", "false"))
+        g2.add_gate(g4)
+        g3.add_gate(g4)
+        top.add_gates(OrderedSet([g2, g3]))
+        self.ft.top_gate = top
+        self.ft.add_gates(OrderedSet([top]))
+
+    def test_format_for(self):
+        self.assertEqual(format_for("out.xml"), "xml")
+        self.assertEqual(format_for("out.BIN.gz"), "binary")
+        self.assertEqual(format_for("out.jsonl.xz"), "jsonl")
+        self.assertEqual(format_for("out.txt.gz"), "expr")
+        self.assertEqual(format_for("out", "jsonl"), "jsonl")
+
+    def test_single_document(self):
+        formats = ("expr", "xml", "binary", "jsonl", "npz", "cnf", "aiger")
+        self.assertEqual([x for x in formats if is_single_document(x)], ["xml", "binary", "npz", "cnf", "aiger"])
+
+    def test_write_formats(self):
+        with tempfile.TemporaryDirectory() as directory:
+            paths = [os.path.join(directory, x) for x in
+                     ["tree.xml", "tree.bin", "tree.txt.gz", "tree.jsonl", "tree.npz", "tree.order"]]
+            write_formats(self.ft, paths, seed=5)
+            expr = self.ft.expr()
+            xml_tree = read_mef_xml(paths[0])
+            self.assertEqual(xml_tree.expr(), expr)
+            probabilities = {x.name: x.probability.value for x in xml_tree.basic_events}
+            self.assertEqual(probabilities["B2"], self.ft.basic_events[1].probability.value)
+            with read_binary(paths[1]) as mapped:
+                self.assertEqual(mapped.expr(), expr)
+            with open_input(paths[2]) as f:
+                self.assertEqual(f.read().decode('utf-8'), expr + "\n")
+            self.assertEqual(next(read_jsonl(paths[3]))['seed'], 5)
+            self.assertEqual(read_npz(paths[4]).to_fault_tree().expr(), expr)
+            with open(paths[5]) as f:
+                order = f.read().split()
+        # Arguments come before their gates, and the shared gate is visited once
+        self.assertEqual(len(order), 4)
+        self.assertLess(order.index("G4"), order.index("G2"))
+        self.assertLess(order.index("G4"), order.index("G3"))
+        self.assertEqual(order[-1], "root")
+
+    def test_encode_formats(self):
+        data = encode_formats(self.ft, [("expr", None), ("expr", ".xz"), ("cnf", ".gz")])
+        self.assertEqual(data[0], (self.ft.expr() + "\n").encode('utf-8'))
+        self.assertEqual(decompress(data[1], ".xz"), data[0])
+        self.assertIn(b"p cnf", decompress(data[2], ".gz"))
+
+    def test_nested_negations(self):
+        # root = (B1 * B2') + G3 with the negation of B2 written into the formula of its parent
+        events = [BasicEvent("B1", PointEstimate(0.1)), BasicEvent("B2", PointEstimate(0.2))]
+        ft = FaultTree(name="Nested")
+        top, g1, g2, g3 = Gate("root", "or"), Gate("G1", "and"), Gate("G2", "not"), Gate("G3", "not")
+        g2.add_basic_event(events[1])
+        g1.add_basic_event(events[0])
+        g1.add_gate(g2)
+        g3.add_basic_event(events[0])
+        top.add_gates(OrderedSet([g1, g3]))
+        ft.top_gate = top
+        ft.add_gates(OrderedSet([top]))
+        flat, nested = (encode_formats(ft, [("xml", None)], nest=nest)[0].decode('utf-8') for nest in (False, True))
+        self.assertIn('<define-gate name="G2">', flat)
+        self.assertNotIn('<define-gate name="G2">', nested)
+        self.assertIn('<and><basic-event name="B1"/><not><basic-event name="B2"/></not></and>', nested)
+        self.assertEqual(read_mef_xml(io.BytesIO(nested.encode('utf-8'))).expr(), ft.expr())
+
+    def test_gates_under_top(self):
+        # G5 is registered but not under the top gate, so neither AIGER writer lowers it.
+        g5 = Gate("G5", "or")
+        g5.add_basic_events(OrderedSet([BasicEvent("B1", PointEstimate(0.1)), BasicEvent("B3", PointEstimate(0.3))]))
+        self.ft.add_gates(OrderedSet([g5]))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "tree.aig")
+            write_aiger(self.ft, path)
+            with open(path, 'rb') as f:
+                expected = f.read()
+        self.assertEqual(encode_formats(self.ft, [("aiger", None)])[0], expected)
+
+    def test_traversal_is_shared(self):
+        first, second = io.BytesIO(), io.BytesIO()
+        FanOutWriter([GateOrderSink(first), GateOrderSink(second)]).write(self.ft)
+        self.assertEqual(first.getvalue(), second.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import math
+import unittest
+from fault_tree import FaultTree
+from fault_tree.analysis import importance_measures, rank
+from fault_tree.analysis.bdd import FaultTreeBdd
+from fault_tree.event import Gate, BasicEvent, HouseEvent
+from fault_tree.probability import PointEstimate
+from ordered_set import OrderedSet
+
+
+class TestImportance(unittest.TestCase):
+
+    def setUp(self):
+        # root = (atleast_2(B1,B2,B3) + (B1 ^ B4 ^ H1)') * (B2*B3*B4)' with H1 true
+        self.events = [BasicEvent(f"B{i}", PointEstimate(p)) for i, p in enumerate([0.1, 0.2, 0.3, 0.4], start=1)]
+        e = self.events
+        self.ft = FaultTree(name="TestTree")
+        top = Gate("root", "and")
+        g1 = Gate("G1", "or")
+        g2 = Gate("G2", "atleast", k_num=2)
+        g3 = Gate("G3", "not")
+        g4 = Gate("G4", "xor")
+        g5 = Gate("G5", "not")
+        g6 = Gate("G6", "and")
+        g2.add_basic_events(OrderedSet(e[:3]))
+        g4.add_basic_events(OrderedSet([e[0], e[3]]))
+        g4.add_house_event(HouseEvent("H1", "true"))
+        g3.add_gate(g4)
+        g1.add_gates(OrderedSet([g2, g3]))
+        g6.add_basic_events(OrderedSet(e[1:]))
+        g5.add_gate(g6)
+        top.add_gates(OrderedSet([g1, g5]))
+        self.ft.top_gate = top
+        self.ft.add_gates(OrderedSet([top, g1, g2, g3, g4, g5, g6]))
+
+    def conditional(self, bdd, level, value):
+        probabilities = bdd.probabilities()
+        probabilities[level] = value
+        return bdd.probability(probabilities)
+
+    def test_against_requantification(self):
+        bdd = FaultTreeBdd(self.ft)
+        top = bdd.probability()
+        measures = importance_measures(self.ft)
+        self.assertEqual(sorted(measures), ["B1", "B2", "B3", "B4"])
+        for level, node in enumerate(bdd.order):
+            name = bdd.tables.basic_events[node].name
+            failed, working = self.conditional(bdd, level, 1.0), self.conditional(bdd, level, 0.0)
+            p, birnbaum, fussell_vesely, raw, rrw = measures[name]
+            self.assertAlmostEqual(birnbaum, failed - working)
+            self.assertAlmostEqual(fussell_vesely, (top - working) / top)
+            self.assertAlmostEqual(raw, failed / top)
+            self.assertAlmostEqual(rrw, top / working)
+
+    def test_rank(self):
+        # root = B1 + B2 * B3
+        ft = FaultTree(name="Coherent")
+        b1, b2, b3 = (BasicEvent(f"B{i}", PointEstimate(p)) for i, p in enumerate([0.01, 0.5, 0.1], start=1))
+        top = Gate("root", "or")
+        g1 = Gate("G1", "and")
+        g1.add_basic_events(OrderedSet([b2, b3]))
+        top.add_basic_event(b1)
+        top.add_gate(g1)
+        ft.top_gate = top
+        ft.add_gates(OrderedSet([top, g1]))
+        measures = importance_measures(ft)
+        self.assertEqual(rank(measures), ["B1", "B3", "B2"])
+        self.assertEqual(rank(measures, by="fussell_vesely"), ["B2", "B3", "B1"])
+        self.assertAlmostEqual(measures["B1"].raw, 1 / (0.01 + 0.99 * 0.05))
+        with self.assertRaises(ValueError):
+            rank(measures, by="criticality")
+
+    def test_certain_event(self):
+        # An event that always occurs under an OR gate makes the top event certain.
+        self.events[0].probability = PointEstimate(1.0)
+        ft = FaultTree(name="Certain")
+        top = Gate("root", "or")
+        top.add_basic_events(OrderedSet(self.events[:2]))
+        ft.top_gate = top
+        ft.add_gates(OrderedSet([top]))
+        measures = importance_measures(ft)
+        self.assertAlmostEqual(measures["B1"].rrw, 1 / 0.2)
+        self.assertEqual(measures["B1"].raw, 1.0)
+        self.assertEqual(measures["B2"].birnbaum, 0.0)
+        self.assertEqual(measures["B2"].rrw, 1.0)
+
+    def test_impossible_top_event(self):
+        # root = B1 * B2 with B2 impossible
+        self.events[1].probability = PointEstimate(0.0)
+        ft = FaultTree(name="Impossible")
+        top = Gate("root", "and")
+        top.add_basic_events(OrderedSet(self.events[:2]))
+        ft.top_gate = top
+        ft.add_gates(OrderedSet([top]))
+        measures = importance_measures(ft)
+        self.assertEqual(measures["B1"], (0.1, 0.0, 0.0, 1.0, 1.0))
+        self.assertEqual(measures["B2"].raw, math.inf)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+from fault_tree import FaultTree
+from fault_tree.analysis import ImportanceSampler, importance_sampling, monte_carlo, top_event_probability
+from fault_tree.event import Gate, BasicEvent, HouseEvent
+from fault_tree.probability import PointEstimate
+from ordered_set import OrderedSet
+
+
+class TestImportanceSampling(unittest.TestCase):
+
+    def make_rare_tree(self):
+        # root = (B0_0 + B0_1 + B0_2) * ... * (B3_0 + B3_1 + B3_2), about 1.3e-9
+        ft = FaultTree(name="RareTree")
+        top = Gate("root", "and")
+        gates = [top]
+        for i in range(4):
+            gate = Gate(f"G{i}", "or")
+            gate.add_basic_events(OrderedSet(BasicEvent(f"B{i}_{j}", PointEstimate(0.001 * (j + 1)))
+                                             for j in range(3)))
+            top.add_gate(gate)
+            gates.append(gate)
+        ft.top_gate = top
+        ft.add_gates(OrderedSet(gates))
+        return ft
+
+    def test_rare_event(self):
+        ft = self.make_rare_tree()
+        exact = top_event_probability(ft)
+        self.assertEqual(monte_carlo(ft, max_samples=64 * 1024, seed=1).num_hits, 0)
+        result = importance_sampling(ft, relative_error=0.01, seed=1)
+        self.assertLessEqual(result.relative_error, 0.01)
+        self.assertLessEqual(result.num_samples, 64 * 1024 * 4)
+        self.assertLess(result.lower, exact)
+        self.assertLess(exact, result.upper)
+
+    def test_order_limit(self):
+        # The order limit is raised until there are cut sets of the fourth order.
+        sampler = ImportanceSampler(self.make_rare_tree(), limit_order=1, max_cut_sets=10)
+        self.assertEqual(len(sampler.cut_sets), 10)
+        self.assertTrue(all(len(x) == 4 for x in sampler.cut_sets))
+        self.assertEqual(max(sampler.cut_set_probabilities), 0.003 ** 4)
+
+    def test_non_coherent(self):
+        # root = (B1 * B2') + H1 * B3 with H1 false; the cut sets exclude B3.
+        ft = FaultTree(name="TestTree")
+        b1, b2, b3 = (BasicEvent(f"B{i}", PointEstimate(p)) for i, p in enumerate([0.01, 0.3, 0.02], start=1))
+        top = Gate("root", "or")
+        g1 = Gate("G1", "and")
+        g2 = Gate("G2", "not")
+        g3 = Gate("G3", "and")
+        g2.add_basic_event(b2)
+        g1.add_basic_event(b1)
+        g1.add_gate(g2)
+        g3.add_house_event(HouseEvent("H1", "false"))
+        g3.add_basic_event(b3)
+        top.add_gates(OrderedSet([g1, g3]))
+        ft.top_gate = top
+        ft.add_gates(OrderedSet([top, g1, g2, g3]))
+        sampler = ImportanceSampler(ft)
+        self.assertEqual(len(sampler.cut_sets), 1)
+        result = sampler.run(relative_error=0.005, seed=2)
+        self.assertLess(abs(result.probability - 0.007), result.upper - result.lower)
+        with self.assertRaises(ValueError):
+            ImportanceSampler(ft, nominal_fraction=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
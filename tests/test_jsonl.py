@@ -0,0 +1,58 @@
+import json
+import os
+import tempfile
+import unittest
+from fault_tree import FaultTree
+from fault_tree.event import Gate, BasicEvent, HouseEvent
+from fault_tree.io import tree_record, encode_record, record_to_fault_tree, read_jsonl
+from fault_tree.io.compression import open_output
+from fault_tree.probability import PointEstimate
+from ordered_set import OrderedSet
+
+
+class TestJsonLines(unittest.TestCase):
+
+    def setUp(self):
+        # Set up a small fault tree with a shared basic event
+        self.ft = FaultTree(name="TestTree")
+        be1 = BasicEvent("B1", PointEstimate(0.1))
+        be2 = BasicEvent("B2", None)
+        top = Gate("root", "or")
+        g2 = Gate("G2", "atleast", k_num=2)
+        g3 = Gate("G3", "not")
+        g2.add_basic_events(OrderedSet([be1, be2, BasicEvent("B3", PointEstimate(0.3))]))
+        g3.add_basic_event(be1)
+        top.add_house_event(HouseEvent("H1", "true"))
+        top.add_gates(OrderedSet([g2, g3]))
+        self.ft.top_gate = top
+        self.ft.add_gates(OrderedSet([top]))
+
+    def test_record(self):
+        record = json.loads(encode_record(tree_record(self.ft, seed=7, factors={'num_basic': 3})))
+        self.assertEqual(record['seed'], 7)
+        self.assertEqual(record['factors'], {'num_basic': 3})
+        self.assertEqual(record['summary']['gate_types']['atleast'], 1)
+        self.assertIn('common_basic_events', record['proportions'])
+        structure = record['structure']
+        self.assertEqual(structure['probabilities'], [0.1, None, 0.3])
+        self.assertEqual(structure['house_states'], [1])
+        self.assertEqual(structure['offsets'][-1], len(structure['children']))
+        self.assertEqual(structure['top'], 4)
+
+    def test_round_trip(self):
+        rebuilt = record_to_fault_tree(tree_record(self.ft))
+        self.assertEqual(rebuilt.name, "TestTree")
+        self.assertEqual(rebuilt.expr(), self.ft.expr())
+        self.assertTrue(rebuilt.basic_events[0].is_common())
+
+    def test_read_compressed(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "corpus.jsonl.gz")
+            with open_output(path) as f:
+                for seed in range(3):
+                    f.write(encode_record(tree_record(self.ft, seed=seed)))
+            self.assertEqual([x['seed'] for x in read_jsonl(path)], [0, 1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
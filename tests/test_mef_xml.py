@@ -0,0 +1,117 @@
+import io
+import unittest
+from fault_tree.io import read_mef_xml
+from fault_tree.probability import PointEstimate, LogNormal
+from fault_tree.probability.lognormal import MeanErrorFactor
+
+MODEL = b"""<?xml version="1.0"?>
+<opsa-mef>
+  <define-fault-tree name="Pumps">
+    <define-gate name="TOP">
+      <label>The top event</label>
+      <or>
+        <gate name="TRAINS"/>
+        <event name="VALVE"/>
+        <and>
+          <basic-event name="PUMP_A"/>
+          <house-event name="MAINTENANCE"/>
+        </and>
+      </or>
+    </define-gate>
+    <define-gate name="TRAINS">
+      <atleast min="2">
+        <basic-event name="PUMP_A"/>
+        <basic-event name="PUMP_B"/>
+        <gate name="POWER"/>
+      </atleast>
+    </define-gate>
+    <define-gate name="POWER">
+      <nor>
+        <basic-event name="GRID"/>
+        <basic-event name="DIESEL"/>
+      </nor>
+    </define-gate>
+    <define-CCF-group name="PUMPS" model="beta-factor">
+      <members>
+        <basic-event name="PUMP_A"/>
+        <basic-event name="PUMP_B"/>
+      </members>
+      <distribution><float value="0.001"/></distribution>
+      <factor level="2"><float value="0.1"/></factor>
+    </define-CCF-group>
+  </define-fault-tree>
+  <model-data>
+    <define-parameter name="lambda"><float value="0.0001"/></define-parameter>
+    <define-basic-event name="PUMP_A"><float value="0.02"/></define-basic-event>
+    <define-basic-event name="VALVE">
+      <exponential><parameter name="lambda"/><system-mission-time/></exponential>
+    </define-basic-event>
+    <define-basic-event name="GRID">
+      <lognormal-deviate><float value="0.01"/><float value="3"/><float value="0.95"/></lognormal-deviate>
+    </define-basic-event>
+    <define-house-event name="MAINTENANCE"><constant value="true"/></define-house-event>
+  </model-data>
+</opsa-mef>
+"""
+
+
+class TestMefXml(unittest.TestCase):
+
+    def setUp(self):
+        self.ft = read_mef_xml(io.BytesIO(MODEL), mission_time=100)
+
+    def test_structure(self):
+        self.assertEqual(self.ft.name, "Pumps")
+        self.assertEqual(self.ft.top_gate.name, "TOP")
+        self.assertIsNone(self.ft.top_gates)
+        top = self.ft.top_gate
+        self.assertEqual({x.name for x in top.g_arguments}, {"TRAINS", "TOP__1"})
+        self.assertEqual([x.name for x in top.b_arguments], ["VALVE"])
+        self.assertEqual(top.g_arguments[0].expr(), "(PUMP_A*MAINTENANCE)")
+        trains = top.g_arguments[1]
+        self.assertEqual(trains.operator, "atleast")
+        self.assertEqual(trains.k_num, 2)
+
+    def test_negated_operator(self):
+        power = self.ft.top_gate.g_arguments[1].g_arguments[0]
+        self.assertEqual(power.operator, "not")
+        self.assertEqual(power.g_arguments[0].operator, "or")
+        self.assertEqual(power.expr(), "(GRID+DIESEL)'")
+
+    def test_probabilities(self):
+        events = {x.name: x for x in self.ft.basic_events}
+        self.assertIsInstance(events["PUMP_A"].probability, PointEstimate)
+        self.assertAlmostEqual(events["VALVE"].probability.value, 0.00995, places=5)
+        self.assertIsInstance(events["GRID"].probability, LogNormal)
+        self.assertEqual(events["GRID"].probability.value[MeanErrorFactor.error_factor], 3)
+        self.assertIsNone(events["DIESEL"].probability)
+        self.assertEqual(self.ft.house_events[0].state, "true")
+
+    def test_ccf_groups(self):
+        ccf_group = self.ft.ccf_groups[0]
+        self.assertEqual(ccf_group.model, "beta-factor")
+        self.assertEqual([x.name for x in ccf_group.members], ["PUMP_A", "PUMP_B"])
+        self.assertAlmostEqual(ccf_group.prob.value, 0.001)
+        self.assertEqual(ccf_group.factors, [0.1])
+        self.assertNotIn(ccf_group.members[0], self.ft.non_ccf_events)
+
+    def test_undefined_gate(self):
+        model = b'<opsa-mef><define-gate name="G"><or><gate name="X"/><basic-event name="B"/></or></define-gate></opsa-mef>'
+        with self.assertRaises(ValueError):
+            read_mef_xml(io.BytesIO(model))
+
+    def test_redefinition(self):
+        for tag, body in (("basic-event", '<float value="0.1"/>'), ("house-event", '<constant value="true"/>')):
+            definition = f'<define-{tag} name="E">{body}</define-{tag}>'
+            model = (f'<opsa-mef><define-gate name="G"><or><{tag} name="E"/><basic-event name="B"/></or>'
+                     f'</define-gate><model-data>{definition}{definition}</model-data></opsa-mef>').encode()
+            with self.assertRaises(ValueError):
+                read_mef_xml(io.BytesIO(model))
+
+    def test_missing_mission_time(self):
+        with self.assertRaises(ValueError):
+            read_mef_xml(io.BytesIO(MODEL))
+
+
+if __name__ == '__main__':
+    unittest.main()
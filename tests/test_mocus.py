@@ -0,0 +1,94 @@
+import unittest
+from fault_tree import FaultTree
+from fault_tree.analysis import MocusProgram, minimal_cut_sets, minimize_cut_sets, mocus
+from fault_tree.event import Gate, BasicEvent, HouseEvent
+from fault_tree.io import FaultTreeTables
+from ordered_set import OrderedSet
+
+
+class TestMocus(unittest.TestCase):
+
+    def setUp(self):
+        # root = (B1 + B2*B3 + B4') * atleast_2(B2,B3,B5,B6) * (B7 + H1) with H1 false
+        self.ft = FaultTree(name="TestTree")
+        e = [BasicEvent(f"B{i}", None) for i in range(1, 8)]
+        top = Gate("root", "and")
+        g1 = Gate("G1", "or")
+        g2 = Gate("G2", "and")
+        g3 = Gate("G3", "atleast", k_num=2)
+        g4 = Gate("G4", "not")
+        g5 = Gate("G5", "or")
+        g2.add_basic_events(OrderedSet([e[1], e[2]]))
+        g4.add_basic_event(e[3])
+        g1.add_basic_event(e[0])
+        g1.add_gates(OrderedSet([g2, g4]))
+        g3.add_basic_events(OrderedSet([e[1], e[2], e[4], e[5]]))
+        g5.add_basic_event(e[6])
+        g5.add_house_event(HouseEvent("H1", "false"))
+        top.add_gates(OrderedSet([g1, g3, g5]))
+        self.ft.top_gate = top
+        self.ft.add_gates(OrderedSet([top, g1, g2, g3, g4, g5]))
+
+    def as_sets(self, cut_sets):
+        return {frozenset(x) for x in cut_sets}
+
+    def test_against_zbdd(self):
+        expected = self.as_sets(minimal_cut_sets(self.ft))
+        self.assertIn(frozenset(["B2", "B3", "B7"]), expected)
+        self.assertIn(frozenset(["B4'", "B5", "B6", "B7"]), expected)
+        self.assertEqual(self.as_sets(mocus(self.ft, max_workers=1)), expected)
+
+    def test_limit_order(self):
+        for limit_order in range(5):
+            expected = self.as_sets(minimal_cut_sets(self.ft, limit_order=limit_order))
+            cut_sets = mocus(self.ft, limit_order=limit_order, max_workers=1)
+            self.assertEqual(self.as_sets(cut_sets), expected)
+            self.assertTrue(all(len(x) <= limit_order for x in cut_sets))
+
+    def test_process_pool(self):
+        expected = self.as_sets(mocus(self.ft, max_workers=1))
+        self.assertEqual(self.as_sets(mocus(self.ft, max_workers=2, chunks_per_worker=2)), expected)
+
+    def test_split(self):
+        program = MocusProgram(FaultTreeTables.from_fault_tree(self.ft))
+        frontier, cut_sets = program.split(4)
+        self.assertGreaterEqual(len(frontier), 4)
+        merged = minimize_cut_sets(cut_sets + program.expand(frontier))
+        self.assertEqual(sorted(merged), sorted(program.expand([(0, 1 << program.top)])))
+
+    def test_wide_gates(self):
+        # A 20-input XOR has 2^19 odd parities and 10 of 20 has 184756 combinations;
+        # the intermediate gates keep the alternatives linear and quadratic.
+        events = [BasicEvent(f"B{i}", None) for i in range(1, 21)]
+        for gate, bound in ((Gate("root", "xor"), 4 * 20), (Gate("root", "atleast", k_num=10), 2 * 20 * 10)):
+            gate.add_basic_events(OrderedSet(events))
+            ft = FaultTree(name="TestTree")
+            ft.top_gate = gate
+            ft.add_gates(OrderedSet([gate]))
+            program = MocusProgram(FaultTreeTables.from_fault_tree(ft), limit_order=3)
+            self.assertLessEqual(sum(len(x) for x in program.alternatives.values()), bound)
+            expected = self.as_sets(minimal_cut_sets(ft, limit_order=3))
+            self.assertEqual(self.as_sets(mocus(ft, limit_order=3, max_workers=1)), expected)
+
+    def test_small_xor(self):
+        # root = (B1 ^ B2 ^ B3) * -(B2 ^ B4 ^ B5 ^ B6) * atleast_2(B1, B5, B6)
+        top, g1, g2, g3, g4 = (Gate("root", "and"), Gate("G1", "xor"), Gate("G2", "not"), Gate("G3", "xor"),
+                               Gate("G4", "atleast", k_num=2))
+        e = [BasicEvent(f"B{i}", None) for i in range(1, 7)]
+        g1.add_basic_events(OrderedSet(e[:3]))
+        g3.add_basic_events(OrderedSet([e[1], e[3], e[4], e[5]]))
+        g2.add_gate(g3)
+        g4.add_basic_events(OrderedSet([e[0], e[4], e[5]]))
+        top.add_gates(OrderedSet([g1, g2, g4]))
+        ft = FaultTree(name="TestTree")
+        ft.top_gate = top
+        ft.add_gates(OrderedSet([top, g1, g2, g3, g4]))
+        self.assertEqual(self.as_sets(mocus(ft, max_workers=1)), self.as_sets(minimal_cut_sets(ft)))
+
+    def test_minimize_cut_sets(self):
+        self.assertEqual(minimize_cut_sets([0b111, 0b011, 0b100, 0b011, 0b1010]), [0b100, 0b011, 0b1010])
+        self.assertEqual(minimize_cut_sets([0b1, 0]), [0])
+
+
+if __name__ == '__main__':
+    unittest.main()
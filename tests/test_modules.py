@@ -0,0 +1,76 @@
+import unittest
+from fault_tree import FaultTree
+from fault_tree.analysis import find_modules, module_gates
+from fault_tree.event import Gate, BasicEvent, HouseEvent
+from fault_tree.io.tables import FaultTreeTables
+from fault_tree.probability import PointEstimate
+from ordered_set import OrderedSet
+from tests.helpers import generated_fault_trees
+
+
+class TestModules(unittest.TestCase):
+
+    def brute_force(self, tables):
+        # A gate is a module iff nothing below it is reachable from the top gate while avoiding it.
+        gate_offset = tables.gate_offset
+        offsets, children = tables.child_offsets, tables.children
+        houses = range(len(tables.basic_events), gate_offset)
+
+        def reachable(start, avoid):
+            seen, stack = set(), [start]
+            while stack:
+                node = stack.pop()
+                if node == avoid or node in seen:
+                    continue
+                seen.add(node)
+                if node >= gate_offset:
+                    gate_number = node - gate_offset
+                    stack.extend(children[offsets[gate_number]:offsets[gate_number + 1]])
+            return seen
+
+        under_top = reachable(tables.top_index, None)
+        modules = []
+        for gate_number in range(len(tables.gates)):
+            node = gate_offset + gate_number
+            if node not in under_top:
+                modules.append(False)
+                continue
+            below = reachable(node, None) - {node}
+            outside = reachable(tables.top_index, node) if node != tables.top_index else set()
+            modules.append(not (below & outside).difference(houses))
+        return modules
+
+    def test_hierarchy(self):
+        # root = G1 * G2 * B1 with G1 = B2 + G3, G3 = B3 * B4 * H1, G2 = B1 + B5
+        ft = FaultTree(name="TestTree")
+        b1, b2, b3, b4, b5 = (BasicEvent(f"B{i}", PointEstimate(0.1)) for i in range(1, 6))
+        house = HouseEvent("H1", "true")
+        top, g1, g2, g3 = Gate("root", "and"), Gate("G1", "or"), Gate("G2", "or"), Gate("G3", "and")
+        g3.add_basic_events(OrderedSet([b3, b4]))
+        g3.add_house_event(house)
+        g1.add_basic_event(b2)
+        g1.add_gate(g3)
+        g2.add_basic_events(OrderedSet([b1, b5]))
+        top.add_basic_event(b1)
+        top.add_gates(OrderedSet([g1, g2]))
+        # G4 = H1 + B5 is outside of the top gate, and shares H1 with G3.
+        g4 = Gate("G4", "or")
+        g4.add_house_event(house)
+        ft.top_gate = top
+        ft.add_gates(OrderedSet([top, g1, g2, g3, g4]))
+        modules = find_modules(ft)
+        self.assertEqual(list(modules), ["root", "G1", "G3"])
+        self.assertEqual(modules["root"], ("root", ["G2"], ["B1", "B5"], ["G1"]))
+        self.assertEqual(modules["G1"], ("G1", [], ["B2"], ["G3"]))
+        self.assertEqual(modules["G3"], ("G3", [], ["B3", "B4"], []))
+
+    def test_generated(self):
+        fault_trees = generated_fault_trees(3, 60, common=0.2)
+        self.assertTrue(fault_trees)
+        for ft in fault_trees:
+            tables = FaultTreeTables.from_fault_tree(ft)
+            self.assertEqual(module_gates(tables), self.brute_force(tables))
+
+
+if __name__ == '__main__':
+    unittest.main()
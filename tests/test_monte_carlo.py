@@ -0,0 +1,80 @@
+import unittest
+import numpy as np
+from fault_tree import FaultTree
+from fault_tree.analysis import BitParallelSimulator, monte_carlo, top_event_probability
+from fault_tree.analysis.monte_carlo import popcount
+from fault_tree.event import Gate, BasicEvent, HouseEvent
+from fault_tree.probability import PointEstimate
+from ordered_set import OrderedSet
+
+
+class TestMonteCarlo(unittest.TestCase):
+
+    def setUp(self):
+        # root = (atleast_2(B1,B2,B3) + (B1 ^ B4 ^ H1)') * (B2*B3*B4)' with H1 true
+        self.events = [BasicEvent(f"B{i}", PointEstimate(p)) for i, p in enumerate([0.1, 0.2, 0.3, 0.4], start=1)]
+        e = self.events
+        self.ft = FaultTree(name="TestTree")
+        top = Gate("root", "and")
+        g1 = Gate("G1", "or")
+        g2 = Gate("G2", "atleast", k_num=2)
+        g3 = Gate("G3", "not")
+        g4 = Gate("G4", "xor")
+        g5 = Gate("G5", "not")
+        g6 = Gate("G6", "and")
+        g2.add_basic_events(OrderedSet(e[:3]))
+        g4.add_basic_events(OrderedSet([e[0], e[3]]))
+        g4.add_house_event(HouseEvent("H1", "true"))
+        g3.add_gate(g4)
+        g1.add_gates(OrderedSet([g2, g3]))
+        g6.add_basic_events(OrderedSet(e[1:]))
+        g5.add_gate(g6)
+        top.add_gates(OrderedSet([g1, g5]))
+        self.ft.top_gate = top
+        self.ft.add_gates(OrderedSet([top, g1, g2, g3, g4, g5, g6]))
+
+    def test_truth_table(self):
+        # Bit m of the plane of event i is bit i of the assignment m.
+        simulator = BitParallelSimulator(self.ft)
+        names = [x.name for x in simulator.tables.basic_events]
+        planes = np.zeros((4, 1), dtype=np.uint64)
+        for m in range(16):
+            for i, name in enumerate(names):
+                if m >> (int(name[1:]) - 1) & 1:
+                    planes[i, 0] |= np.uint64(1 << m)
+        top = int(simulator.evaluate(planes)[0])
+        for m in range(16):
+            b1, b2, b3, b4 = (bool(m >> i & 1) for i in range(4))
+            expected = (b1 + b2 + b3 >= 2 or not (b1 ^ b4 ^ True)) and not (b2 and b3 and b4)
+            self.assertEqual(bool(top >> m & 1), expected)
+
+    def test_sample(self):
+        simulator = BitParallelSimulator(self.ft)
+        simulator.probabilities[:] = [0.001, 0.05, 0.5, 1.0]
+        planes = simulator.sample(4096, np.random.default_rng(7))
+        frequencies = [popcount(x) / (64 * 4096) for x in planes]
+        for frequency, p in zip(frequencies, simulator.probabilities):
+            self.assertAlmostEqual(frequency, p, delta=5 * np.sqrt(p * (1 - p) / (64 * 4096)) + 1e-12)
+
+    def test_estimate(self):
+        exact = top_event_probability(self.ft)
+        result = monte_carlo(self.ft, relative_error=0.01, seed=3)
+        self.assertLessEqual(result.relative_error, 0.01)
+        self.assertLess(result.lower, result.probability)
+        self.assertLess(result.probability, result.upper)
+        self.assertLess(abs(result.probability - exact), 4 * (result.upper - result.lower))
+        self.assertEqual(result, monte_carlo(self.ft, relative_error=0.01, seed=3))
+
+    def test_max_samples(self):
+        result = monte_carlo(self.ft, relative_error=1e-9, max_samples=64 * 256 * 3, batch_words=256, seed=1)
+        self.assertEqual(result.num_samples, 64 * 256 * 3)
+        self.assertGreater(result.relative_error, 1e-9)
+
+    def test_missing_probability(self):
+        self.events[2].probability = None
+        with self.assertRaises(ValueError):
+            BitParallelSimulator(self.ft)
+
+
+if __name__ == '__main__':
+    unittest.main()
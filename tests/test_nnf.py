@@ -0,0 +1,111 @@
+import unittest
+from fault_tree import FaultTree
+from fault_tree.analysis import top_event_probability
+from fault_tree.event import Gate, BasicEvent, HouseEvent
+from fault_tree.io import parse_expr
+from fault_tree.probability import PointEstimate
+from fault_tree.transform import negation_normal_form
+from ordered_set import OrderedSet
+from tests.helpers import generated_fault_trees, make_fault_tree
+
+
+class TestNegationNormalForm(unittest.TestCase):
+
+    def setUp(self):
+        self.b1, self.b2, self.b3 = (BasicEvent(f"B{i}", PointEstimate(0.1 * i)) for i in range(1, 4))
+
+    def test_de_morgan(self):
+        # root = -(B1 * (B2 + -B3)) = -B1 + (-B2 * B3)
+        top, g1, g2, g3 = Gate("root", "not"), Gate("G1", "and"), Gate("G2", "or"), Gate("G3", "not")
+        g3.add_basic_event(self.b3)
+        g2.add_basic_event(self.b2)
+        g2.add_gate(g3)
+        g1.add_basic_event(self.b1)
+        g1.add_gate(g2)
+        top.add_gate(g1)
+        ft = make_fault_tree(top)
+        result = negation_normal_form(ft)
+        self.assertEqual(result.top_gate.name, "root")
+        self.assertEqual(result.top_gate.expr(), "(B1'+(B3*B2'))")
+        self.assertAlmostEqual(top_event_probability(result), top_event_probability(ft), places=15)
+        # The original fault tree is unchanged.
+        self.assertEqual(ft.top_gate.operator, "not")
+
+    def test_atleast_and_xor(self):
+        # root = -atleast_2(B1, B2, B3) + -(B1 ^ B2 ^ H1)
+        top, g1, g2, g3, g4 = (Gate("root", "or"), Gate("G1", "not"), Gate("G2", "atleast", 2), Gate("G3", "not"),
+                               Gate("G4", "xor"))
+        g2.add_basic_events(OrderedSet([self.b1, self.b2, self.b3]))
+        g4.add_basic_events(OrderedSet([self.b1, self.b2]))
+        g4.add_house_event(HouseEvent("H1", "true"))
+        g1.add_gate(g2)
+        g3.add_gate(g4)
+        top.add_gates(OrderedSet([g1, g3]))
+        ft = make_fault_tree(top)
+        result = negation_normal_form(ft)
+        self.assertEqual(result.top_gate.expr(), "(atleast_2(B1',B2',B3')+(B2^H1^B1'))")
+        self.assertEqual([x.name for x in result.house_events], ["H1"])
+        self.assertAlmostEqual(top_event_probability(result), top_event_probability(ft), places=15)
+
+    def test_shared_gate(self):
+        # root = G1 * -G1 * -G1' with G1 = B1 + B2 takes one gate for either polarity of G1.
+        top, g1, g2, g3, g4 = (Gate("root", "or"), Gate("G1", "or"), Gate("G2", "not"), Gate("G3", "not"),
+                               Gate("G4", "and"))
+        g1.add_basic_events(OrderedSet([self.b1, self.b2]))
+        g2.add_gate(g1)
+        g3.add_gate(g1)
+        g4.add_gate(g3)
+        g4.add_basic_event(self.b3)
+        top.add_gates(OrderedSet([g1, g2, g4]))
+        ft = make_fault_tree(top)
+        result = negation_normal_form(ft)
+        self.assertEqual(sorted(x.name for x in result.gates), ["G1", "G2", "G4", "N0", "N1", "root"])
+        negated = [x for x in result.gates if x.name == "G2"][0]
+        self.assertEqual(negated.expr(), "(B1'*B2')")
+        self.assertIn(negated, [x for x in result.gates if x.name == "G4"][0].g_arguments)
+
+    def test_repeated_arguments(self):
+        # root = -B1 * -B1 with two NOT gates of B1 under one parent
+        top, g1, g2 = Gate("root", "and"), Gate("G1", "not"), Gate("G2", "not")
+        g1.add_basic_event(self.b1)
+        g2.add_basic_event(self.b1)
+        top.add_gates(OrderedSet([g1, g2]))
+        result = negation_normal_form(make_fault_tree(top))
+        self.assertEqual(result.top_gate.expr(), "(B1')")
+        # XOR and AT-LEAST gates count their arguments, so repetitions get copies.
+        for text in ["((B1''*B1)+B2)", "((B1'^B1'^B2)+B3)", "(atleast_2(B1',B1''',B2,B3)*B4)"]:
+            ft = parse_expr(text)
+            for basic_event in ft.basic_events:
+                basic_event.probability = PointEstimate(0.3)
+            self.assertAlmostEqual(top_event_probability(negation_normal_form(ft)), top_event_probability(ft),
+                                   places=15)
+
+    def test_negated_event_top(self):
+        top, g1 = Gate("root", "not"), Gate("G1", "not")
+        g1.add_basic_event(self.b1)
+        top.add_gate(g1)
+        result = negation_normal_form(make_fault_tree(top))
+        self.assertEqual(result.top_gate.name, "root")
+        self.assertEqual(result.top_gate.expr(), "(B1)")
+
+    def test_malformed(self):
+        top = Gate("root", "not")
+        top.add_basic_events(OrderedSet([self.b1, self.b2]))
+        with self.assertRaises(ValueError):
+            negation_normal_form(make_fault_tree(top))
+        with self.assertRaises(ValueError):
+            negation_normal_form(FaultTree("Empty"))
+
+    def test_generated(self):
+        fault_trees = generated_fault_trees(3, 60, 5, weights=(1, 1, 1, 1, 1))
+        self.assertTrue(fault_trees)
+        for ft in fault_trees:
+            result = negation_normal_form(ft)
+            for gate in result.gates:
+                if gate.operator == "not":
+                    self.assertFalse(gate.g_arguments)
+            self.assertAlmostEqual(top_event_probability(result), top_event_probability(ft), places=12)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from fault_tree import FaultTree, CCFGroup
+from fault_tree.event import Gate, BasicEvent, HouseEvent
+from fault_tree.io import write_npz, read_npz
+from fault_tree.probability import PointEstimate
+from ordered_set import OrderedSet
+
+
+class TestNpz(unittest.TestCase):
+
+    def setUp(self):
+        # Set up a small fault tree with a shared basic event and a CCF group
+        self.ft = FaultTree(name="TestTree")
+        events = [BasicEvent("B1", PointEstimate(0.1)), BasicEvent("B2", PointEstimate(0.2)),
+                  BasicEvent("B3", None)]
+        top = Gate("root", "or")
+        g2 = Gate("G2", "atleast", k_num=2)
+        g3 = Gate("G3", "not")
+        g2.add_basic_events(OrderedSet(events))
+        g3.add_basic_event(events[0])
+        top.add_house_event(HouseEvent("H1", "true"))
+        top.add_gates(OrderedSet([g2, g3]))
+        self.ft.top_gate = top
+        self.ft.add_gates(OrderedSet([top]))
+        ccf_group = CCFGroup("CCF1")
+        ccf_group.members = OrderedSet(events[1:])
+        ccf_group.prob = 0.05
+        ccf_group.model = "MGL"
+        ccf_group.factors = [0.3]
+        self.ft.ccf_groups.add(ccf_group)
+        handle, self.path = tempfile.mkstemp(suffix=".npz")
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_arrays(self):
+        write_npz(self.ft, self.path)
+        arrays = read_npz(self.path)
+        self.assertEqual(arrays.name, "TestTree")
+        self.assertEqual(arrays.num_nodes, 7)
+        self.assertEqual(arrays.top_index, 4)
+        np.testing.assert_array_equal(arrays.operators, [1, 2, 3])
+        np.testing.assert_array_equal(arrays.k_nums, [0, 2, 0])
+        np.testing.assert_array_equal(arrays.child_indices(0), [3, 5, 6])
+        np.testing.assert_array_equal(arrays.parent_counts, [2, 1, 1, 1, 0, 1, 1])
+        self.assertTrue(np.isnan(arrays.probabilities[2]))
+        np.testing.assert_array_equal(arrays.house_states, [True])
+        np.testing.assert_array_equal(arrays.ccf_members, [1, 2])
+        np.testing.assert_array_equal(arrays.ccf_factors, [0.3])
+
+    def test_round_trip(self):
+        write_npz(self.ft, self.path, compressed=False)
+        rebuilt = read_npz(self.path).to_fault_tree()
+        self.assertEqual(rebuilt.expr(), self.ft.expr())
+        ccf_group = rebuilt.ccf_groups[0]
+        self.assertEqual([x.name for x in ccf_group.members], ["B2", "B3"])
+        self.assertEqual(ccf_group.prob.value, 0.05)
+        self.assertEqual([x.name for x in rebuilt.non_ccf_events], ["B1"])
+
+    def test_unknown_ccf_member(self):
+        self.ft.ccf_groups[0].members.add(BasicEvent("B9", None))
+        with self.assertRaises(ValueError):
+            write_npz(self.ft, self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import unittest
+from fault_tree import FaultTree
+from fault_tree.analysis import top_event_probability
+from fault_tree.event import Gate, BasicEvent, HouseEvent
+from fault_tree.io import parse_expr
+from fault_tree.probability import PointEstimate
+from fault_tree.transform import preprocess
+from ordered_set import OrderedSet
+from tests.helpers import generated_fault_trees, make_fault_tree
+
+
+class TestPreprocess(unittest.TestCase):
+
+    def setUp(self):
+        self.b1, self.b2, self.b3, self.b4 = (BasicEvent(f"B{i}", PointEstimate(0.1 * i)) for i in range(1, 5))
+
+    def fault_tree(self, top, *gates):
+        return make_fault_tree(top, *gates, basic_events=[self.b1, self.b2, self.b3, self.b4])
+
+    def test_house_events(self):
+        # root = B1 * (H1 + B2) * H2 with H1 false and H2 true
+        top, g1 = Gate("root", "and"), Gate("G1", "or")
+        g1.add_house_event(HouseEvent("H1", "false"))
+        g1.add_basic_event(self.b2)
+        top.add_basic_event(self.b1)
+        top.add_house_event(HouseEvent("H2", "true"))
+        top.add_gate(g1)
+        result = preprocess(self.fault_tree(top, g1))
+        self.assertEqual([x.name for x in result.gates], ["root"])
+        self.assertEqual(result.top_gate.expr(), "(B1*B2)")
+        self.assertFalse(result.house_events)
+        # The original fault tree is unchanged.
+        self.assertEqual(top.num_arguments(), 3)
+
+    def test_constant_top(self):
+        top, g1 = Gate("root", "or"), Gate("G1", "not")
+        g1.add_house_event(HouseEvent("H1", "false"))
+        top.add_basic_event(self.b1)
+        top.add_gate(g1)
+        result = preprocess(self.fault_tree(top, g1))
+        self.assertEqual([x.name for x in result.gates], ["root"])
+        self.assertEqual([(x.name, x.state) for x in result.house_events], [("N0", "true")])
+        self.assertEqual(top_event_probability(result), 1.0)
+
+    def test_coalesce(self):
+        # root = B1 + (B2 + (B3 * B4)) + G3 with G3 = B2 + B4 shared by G4
+        top, g1, g2, g3 = Gate("root", "or"), Gate("G1", "or"), Gate("G2", "and"), Gate("G3", "or")
+        g4 = Gate("G4", "and")
+        g2.add_basic_events(OrderedSet([self.b3, self.b4]))
+        g1.add_basic_event(self.b2)
+        g1.add_gate(g2)
+        g3.add_basic_events(OrderedSet([self.b2, self.b4]))
+        g4.add_basic_event(self.b1)
+        g4.add_gate(g3)
+        top.add_basic_event(self.b1)
+        top.add_gates(OrderedSet([g1, g4]))
+        result = preprocess(self.fault_tree(top, g1, g2, g3, g4))
+        self.assertEqual([x.name for x in result.gates], ["G2", "G3", "G4", "root"])
+        self.assertEqual(len(result.top_gate.b_arguments), 2)
+        self.assertEqual(set(x.name for x in result.top_gate.g_arguments), {"G2", "G4"})
+
+    def test_identical_gates(self):
+        # root = (B1 + B2) * (B2 + B1) * (B1 + -(-B2))
+        top, g1, g2, g3, g4, g5 = (Gate("root", "and"), Gate("G1", "or"), Gate("G2", "or"), Gate("G3", "or"),
+                                   Gate("G4", "not"), Gate("G5", "not"))
+        g1.add_basic_events(OrderedSet([self.b1, self.b2]))
+        g2.add_basic_events(OrderedSet([self.b2, self.b1]))
+        g3.add_basic_event(self.b1)
+        g3.add_gate(g4)
+        g5.add_basic_event(self.b2)
+        g4.add_gate(g5)
+        top.add_gates(OrderedSet([g1, g2, g3]))
+        result = preprocess(self.fault_tree(top, g1, g2, g3, g4, g5))
+        self.assertEqual([x.name for x in result.gates], ["root"])
+        self.assertEqual(result.top_gate.operator, "or")
+
+    def test_complements(self):
+        # root = B1 + (B2 * -B2) + (2 of B3, B4, true)
+        top, g1, g2, g3 = Gate("root", "or"), Gate("G1", "and"), Gate("G2", "not"), Gate("G3", "atleast", 2)
+        g2.add_basic_event(self.b2)
+        g1.add_basic_event(self.b2)
+        g1.add_gate(g2)
+        g3.add_basic_events(OrderedSet([self.b3, self.b4]))
+        g3.add_house_event(HouseEvent("H1", "true"))
+        top.add_basic_event(self.b1)
+        top.add_gates(OrderedSet([g1, g3]))
+        result = preprocess(self.fault_tree(top, g1, g2, g3))
+        self.assertEqual(result.top_gate.expr(), "(B1+B3+B4)")
+
+    def test_repeated_atleast_arguments(self):
+        # 2 of (B1, B2, B1 + H1) with H1 false counts B1 twice: B1 * (1 of B2) + (2 of B2) = B1.
+        ft = parse_expr("(atleast_2(B1,B2,(B1+H1))*B3)", house_states={'H1': 'false'})
+        result = preprocess(ft)
+        self.assertEqual(result.top_gate.expr(), "(B1*B3)")
+        # 3 of (B1, B1, B2, B3, B4) = B1 * (1 of B2, B3, B4) + (3 of B2, B3, B4)
+        ft = parse_expr("atleast_3(B1,(B1*H1),B2,B3,B4)", house_states={'H1': 'true'})
+        for basic_event in ft.basic_events:
+            basic_event.probability = PointEstimate(0.2)
+        result = preprocess(ft)
+        self.assertAlmostEqual(top_event_probability(result), 0.2 * (1 - 0.8 ** 3) + 0.8 * 0.2 ** 3, places=15)
+
+    def test_no_top_gate(self):
+        with self.assertRaises(ValueError):
+            preprocess(FaultTree("Empty"))
+
+    def test_generated(self):
+        fault_trees = generated_fault_trees(3, 60, 5)
+        self.assertTrue(fault_trees)
+        for ft in fault_trees:
+            result = preprocess(ft)
+            self.assertEqual(result.top_gate.name, "root")
+            self.assertLessEqual(len(result.gates), len(ft.gates))
+            self.assertAlmostEqual(top_event_probability(result), top_event_probability(ft), places=12)
+
+
+if __name__ == '__main__':
+    unittest.main()
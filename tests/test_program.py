@@ -0,0 +1,106 @@
+import itertools
+import unittest
+import numpy as np
+from fault_tree import FaultTree
+from fault_tree.analysis import Program, top_event_probability
+from fault_tree.event import Gate, BasicEvent, HouseEvent
+from fault_tree.probability import PointEstimate
+from ordered_set import OrderedSet
+
+
+class TestProgram(unittest.TestCase):
+
+    def setUp(self):
+        # root = (atleast_2(B1,B2,B3) + (B1 ^ B4 ^ H1)') * (B2*B3*B4)' * G7 * G8
+        # with H1 true, G7 = atleast_1(B4) and G8 = atleast_3(B1, B2, B3, B4, H2) with H2 false
+        self.events = [BasicEvent(f"B{i}", PointEstimate(p)) for i, p in enumerate([0.1, 0.2, 0.3, 0.4], start=1)]
+        e = self.events
+        self.ft = FaultTree(name="TestTree")
+        top = Gate("root", "and")
+        g1 = Gate("G1", "or")
+        g2 = Gate("G2", "atleast", k_num=2)
+        g3 = Gate("G3", "not")
+        g4 = Gate("G4", "xor")
+        g5 = Gate("G5", "not")
+        g6 = Gate("G6", "and")
+        g7 = Gate("G7", "atleast", k_num=1)
+        g8 = Gate("G8", "atleast", k_num=3)
+        g2.add_basic_events(OrderedSet(e[:3]))
+        g4.add_basic_events(OrderedSet([e[0], e[3]]))
+        g4.add_house_event(HouseEvent("H1", "true"))
+        g3.add_gate(g4)
+        g1.add_gates(OrderedSet([g2, g3]))
+        g6.add_basic_events(OrderedSet(e[1:]))
+        g5.add_gate(g6)
+        g7.add_basic_event(e[3])
+        g8.add_basic_events(OrderedSet(e))
+        g8.add_house_event(HouseEvent("H2", "false"))
+        top.add_gates(OrderedSet([g1, g5, g7, g8]))
+        self.ft.top_gate = top
+        self.ft.add_gates(OrderedSet([top, g1, g2, g3, g4, g5, g6, g7, g8]))
+
+    def expected(self, b1, b2, b3, b4):
+        return ((b1 + b2 + b3 >= 2 or not (b1 ^ b4 ^ True)) and not (b2 and b3 and b4)
+                and b4 and b1 + b2 + b3 + b4 >= 3)
+
+    def test_compile(self):
+        program = self.ft.compile()
+        self.assertIsInstance(program, Program)
+        # G7 passes B4 through, and G8 becomes a 3-of-4 instruction.
+        self.assertEqual(program.num_instructions, 8)
+        self.assertLess(program.num_registers, program.num_basic + 2 + program.num_instructions)
+        self.assertLessEqual(len(program.blocks), program.num_instructions)
+
+    def test_truth_table(self):
+        program = self.ft.compile()
+        names = [x.name for x in program.tables.basic_events]
+        assignments = list(itertools.product([False, True], repeat=4))
+        inputs = np.array([[a[int(name[1:]) - 1] for a in assignments] for name in names])
+        output = program.run(inputs)
+        self.assertEqual(output.dtype, np.bool_)
+        self.assertEqual(list(output), [self.expected(*a) for a in assignments])
+        planes = np.packbits(inputs, axis=1, bitorder='little')
+        planes = np.pad(planes, ((0, 0), (0, 6))).view(np.uint64)
+        top = int(program.run(planes)[0])
+        self.assertEqual([bool(top >> m & 1) for m in range(16)], list(output))
+
+    def test_probability(self):
+        # root = atleast_2(B1, B2, G1) * (B3 ^ B4)' with G1 = B3 + B4 shares no events with root's other argument
+        ft = FaultTree(name="Independent")
+        e = self.events
+        top = Gate("root", "and")
+        g1 = Gate("G1", "atleast", k_num=2)
+        g2 = Gate("G2", "or")
+        g3 = Gate("G3", "not")
+        g4 = Gate("G4", "xor")
+        g2.add_basic_events(OrderedSet(e[2:]))
+        g1.add_basic_events(OrderedSet(e[:2]))
+        g1.add_gate(g2)
+        g4.add_basic_events(OrderedSet([BasicEvent("B5", PointEstimate(0.5)), BasicEvent("B6", PointEstimate(0.6))]))
+        g3.add_gate(g4)
+        top.add_gates(OrderedSet([g1, g3]))
+        ft.top_gate = top
+        ft.add_gates(OrderedSet([top, g1, g2, g3, g4]))
+        program = ft.compile()
+        probabilities = np.frombuffer(program.tables.probabilities, dtype=np.float64)
+        self.assertAlmostEqual(float(program.probability(probabilities)), top_event_probability(ft))
+        columns = np.repeat(probabilities[:, None], 3, axis=1)
+        columns[:, 1] = 0.0
+        columns[:, 2] = 1.0
+        self.assertTrue(np.allclose(program.probability(columns), [top_event_probability(ft), 0.0, 1.0]))
+
+    def test_constant_top(self):
+        ft = FaultTree(name="Constant")
+        top = Gate("root", "not")
+        top.add_house_event(HouseEvent("H1", "false"))
+        ft.top_gate = top
+        ft.add_gates(OrderedSet([top]))
+        program = ft.compile()
+        self.assertEqual(program.num_instructions, 0)
+        self.assertTrue(program.run(np.zeros((0, 5), dtype=bool)).all())
+        with self.assertRaises(ValueError):
+            FaultTree(name="Empty").compile()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import math
+import pickle
+import unittest
+import numpy as np
+from fault_tree.analysis import TDigest
+
+
+class TestTDigest(unittest.TestCase):
+
+    def rank_error(self, values, digest, levels):
+        ranks = np.searchsorted(np.sort(values), digest.quantile(levels)) / len(values)
+        return np.abs(ranks - levels)
+
+    def test_error_bound(self):
+        values = np.random.default_rng(1).lognormal(-5, 1.5, 500_000)
+        digest = TDigest(compression=100)
+        for chunk in np.array_split(values, 37):
+            digest.add(chunk)
+        levels = np.array([0.001, 0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99, 0.999])
+        bound = math.pi * np.sqrt(levels * (1 - levels)) / 100 + (math.pi / 100) ** 2
+        self.assertTrue(np.all(self.rank_error(values, digest, levels) <= bound))
+        self.assertLessEqual(len(digest.means), 50)
+        self.assertEqual(len(digest), len(values))
+        self.assertAlmostEqual(digest.mean(), values.mean())
+        self.assertEqual(digest.quantile(0.0), values.min())
+        self.assertEqual(digest.quantile(1.0), values.max())
+
+    def test_merge(self):
+        rng = np.random.default_rng(2)
+        parts = [rng.normal(i, 1, 50_000) for i in range(4)]
+        digests = [TDigest() for _ in parts]
+        for digest, part in zip(digests, parts):
+            digest.add(part)
+        # Merging pickled sketches, as worker processes return them
+        merged = TDigest()
+        for digest in digests:
+            merged.merge(pickle.loads(pickle.dumps(digest)))
+        values = np.concatenate(parts)
+        levels = np.array([0.01, 0.5, 0.99])
+        bound = math.pi * np.sqrt(levels * (1 - levels)) / 200 + (math.pi / 200) ** 2
+        self.assertTrue(np.all(self.rank_error(values, merged, levels) <= bound))
+        self.assertEqual(merged.count, len(values))
+
+    def test_small(self):
+        digest = TDigest()
+        self.assertTrue(math.isnan(digest.quantile(0.5)))
+        digest.add([3.0, 1.0, math.nan, 2.0])
+        self.assertEqual(len(digest), 3)
+        self.assertEqual(digest.quantile(0.5), 2.0)
+        self.assertTrue(np.array_equal(digest.percentile([0, 100]), [1.0, 3.0]))
+        with self.assertRaises(ValueError):
+            TDigest(compression=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import itertools
+import unittest
+from unittest import mock
+from fault_tree import FaultTree
+from fault_tree.analysis import TruthTable, minimal_cut_sets, top_event_probability
+from fault_tree.analysis import truth_table
+from fault_tree.event import Gate, BasicEvent, HouseEvent
+from fault_tree.probability import PointEstimate
+from ordered_set import OrderedSet
+
+
+class TestTruthTable(unittest.TestCase):
+
+    def make_tree(self, num_groups):
+        # root = atleast_2(G0, ..., Gn) with Gi = B(2i) * B(2i+1)' + B(2i+1) * H1, H1 true
+        ft = FaultTree(name="TestTree")
+        house = HouseEvent("H1", "true")
+        top = Gate("root", "atleast", k_num=2)
+        gates = [top]
+        for i in range(num_groups):
+            b1 = BasicEvent(f"B{2 * i}", PointEstimate(0.1 + 0.02 * i))
+            b2 = BasicEvent(f"B{2 * i + 1}", PointEstimate(0.3))
+            negation = Gate(f"N{i}", "not")
+            negation.add_basic_event(b2)
+            first, second = Gate(f"A{i}", "and"), Gate(f"C{i}", "and")
+            first.add_basic_event(b1)
+            first.add_gate(negation)
+            second.add_basic_event(b2)
+            second.add_house_event(house)
+            group = Gate(f"G{i}", "or")
+            group.add_gates(OrderedSet([first, second]))
+            top.add_gate(group)
+            gates.extend([negation, first, second, group])
+        ft.top_gate = top
+        ft.add_gates(OrderedSet(gates))
+        return ft
+
+    def brute_force(self, ft, table):
+        # Gi = B(2i) + B(2i+1) as a function
+        names = [table.program.tables.basic_events[x].name for x in table.variables]
+        count = 0
+        for assignment in itertools.product([False, True], repeat=len(names)):
+            values = dict(zip(names, assignment))
+            groups = [values[f"B{2 * i}"] or values[f"B{2 * i + 1}"] for i in range(len(names) // 2)]
+            count += sum(groups) >= 2
+        return count
+
+    def expected_cut_sets(self, num_groups):
+        groups = [(f"B{2 * i}", f"B{2 * i + 1}") for i in range(num_groups)]
+        return {frozenset((x, y)) for g1, g2 in itertools.combinations(groups, 2) for x in g1 for y in g2}
+
+    def test_small(self):
+        ft = self.make_tree(2)
+        table = TruthTable(ft)
+        self.assertEqual(table.num_vars, 4)
+        self.assertEqual(table.count(), self.brute_force(ft, table))
+        self.assertAlmostEqual(table.probability(), top_event_probability(ft))
+        self.assertEqual(set(map(frozenset, table.minimal_cut_sets())), self.expected_cut_sets(2))
+
+    def test_chunks(self):
+        ft = self.make_tree(6)
+        table = TruthTable(ft)
+        with mock.patch.object(truth_table, "_MAX_WORDS", 1), mock.patch.object(truth_table, "_LOW_VARIABLES", 7):
+            chunked = TruthTable(ft)
+            self.assertAlmostEqual(chunked.probability(), top_event_probability(ft))
+        self.assertTrue((table.table == chunked.table).all())
+        self.assertEqual(table.count(), self.brute_force(ft, table))
+        self.assertAlmostEqual(table.probability(), top_event_probability(ft))
+        self.assertEqual(set(map(frozenset, table.minimal_cut_sets())), self.expected_cut_sets(6))
+        self.assertEqual(len(table.minimal_cut_sets()), 4 * 15)
+
+    def test_coherent(self):
+        # root = B1 + B2 * (B3 + B4)
+        ft = FaultTree(name="Coherent")
+        b1, b2, b3, b4 = (BasicEvent(f"B{i}", PointEstimate(0.1 * i)) for i in range(1, 5))
+        top, g1, g2 = Gate("root", "or"), Gate("G1", "and"), Gate("G2", "or")
+        g2.add_basic_events(OrderedSet([b3, b4]))
+        g1.add_basic_event(b2)
+        g1.add_gate(g2)
+        top.add_basic_event(b1)
+        top.add_gate(g1)
+        ft.top_gate = top
+        ft.add_gates(OrderedSet([top, g1, g2]))
+        table = TruthTable(ft)
+        self.assertEqual(table.minimal_cut_sets(), [("B1",), ("B2", "B3"), ("B2", "B4")])
+        self.assertEqual(set(table.minimal_cut_sets()), set(minimal_cut_sets(ft)))
+        self.assertAlmostEqual(table.probability(), top_event_probability(ft))
+
+    def test_non_coherent(self):
+        # root = B1 * B2', whose only minimal failure state is {B1}
+        ft = FaultTree(name="NonCoherent")
+        top = Gate("root", "and")
+        negation = Gate("N", "not")
+        negation.add_basic_event(BasicEvent("B2", PointEstimate(0.5)))
+        top.add_basic_event(BasicEvent("B1", PointEstimate(0.2)))
+        top.add_gate(negation)
+        ft.top_gate = top
+        ft.add_gates(OrderedSet([top, negation]))
+        table = TruthTable(ft)
+        self.assertEqual(table.minimal_cut_sets(), [("B1",)])
+        self.assertAlmostEqual(table.probability(), 0.1)
+        self.assertAlmostEqual(table.probability([1.0, 0.0]), 1.0)
+
+    def test_limit(self):
+        with self.assertRaises(ValueError):
+            TruthTable(self.make_tree(6), max_events=11)
+
+
+if __name__ == '__main__':
+    unittest.main()
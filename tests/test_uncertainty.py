@@ -0,0 +1,118 @@
+import math
+import random
+import unittest
+import numpy as np
+from statistics import NormalDist
+from fault_tree import FaultTree
+from fault_tree.analysis import UncertaintyAnalysis, lognormal_parameters, propagate_uncertainty, top_event_probability
+from fault_tree.analysis.uncertainty import latin_hypercube, normal_quantile
+from fault_tree.event import Gate, BasicEvent
+from fault_tree.probability import LogNormal, PointEstimate
+from fault_tree_generator import ComplexityFactorError, ComplexityFactors, GenerativeFaultTree
+from ordered_set import OrderedSet
+
+
+class TestUncertainty(unittest.TestCase):
+
+    def make_tree(self, probabilities):
+        # root = B1 * (B2 + B3)
+        ft = FaultTree(name="TestTree")
+        events = [BasicEvent(f"B{i}", p) for i, p in enumerate(probabilities, start=1)]
+        top = Gate("root", "and")
+        g1 = Gate("G1", "or")
+        g1.add_basic_events(OrderedSet(events[1:]))
+        top.add_basic_event(events[0])
+        top.add_gate(g1)
+        ft.top_gate = top
+        ft.add_gates(OrderedSet([top, g1]))
+        return ft
+
+    def test_lognormal_parameters(self):
+        mu, sigma = lognormal_parameters([0.01, 0.2], [3, 10], 0.95)
+        self.assertTrue(np.allclose(np.exp(mu + sigma ** 2 / 2), [0.01, 0.2]))
+        self.assertTrue(np.allclose(np.exp(NormalDist().inv_cdf(0.95) * sigma), [3, 10]))
+        with self.assertRaises(ValueError):
+            lognormal_parameters(0.1, 1.0)
+        with self.assertRaises(ValueError):
+            lognormal_parameters(0.0, 3.0)
+
+    def test_point_estimates(self):
+        ft = self.make_tree([PointEstimate(0.1), PointEstimate(0.2), PointEstimate(0.3)])
+        result = propagate_uncertainty(ft, num_samples=100, seed=1)
+        self.assertAlmostEqual(result.mean, top_event_probability(ft))
+        self.assertAlmostEqual(result.std, 0.0)
+        self.assertAlmostEqual(result.error_factor, 1.0)
+
+    def test_lognormal(self):
+        ft = self.make_tree([LogNormal(0.01, 3, 0.95), PointEstimate(1.0), PointEstimate(0.0)])
+        result = propagate_uncertainty(ft, num_samples=200_000, seed=2, percentiles=(50, 95))
+        mu, sigma = lognormal_parameters(0.01, 3, 0.95)
+        self.assertAlmostEqual(result.mean, 0.01, delta=1e-4)
+        self.assertAlmostEqual(result.percentiles[50], math.exp(mu), delta=1e-4)
+        self.assertAlmostEqual(result.error_factor, 3, delta=0.05)
+        self.assertEqual(len(result.samples), 200_000)
+
+    def test_batches(self):
+        ft = self.make_tree([LogNormal(0.1, 5), LogNormal(0.2, 5), PointEstimate(0.3)])
+        analysis = UncertaintyAnalysis(ft)
+        self.assertEqual(len(analysis.uncertain), 2)
+        samples = analysis.run(num_samples=1000, batch_size=300, seed=3).samples
+        self.assertEqual(len(samples), 1000)
+        self.assertTrue(np.all((samples >= 0) & (samples <= 1)))
+
+    def test_normal_quantile(self):
+        u = np.array([1e-300, 1e-10, 0.01, 0.3, 0.5, 0.9, 0.999, 1 - 1e-12])
+        expected = [NormalDist().inv_cdf(x) for x in u]
+        self.assertTrue(np.allclose(normal_quantile(u), expected, rtol=1e-13, atol=1e-13))
+
+    def test_latin_hypercube(self):
+        sample = latin_hypercube(3, 50, np.random.default_rng(5))
+        self.assertEqual(sample.shape, (3, 50))
+        for row in sample:
+            self.assertEqual(sorted(np.floor(row * 50).astype(int)), list(range(50)))
+
+    def test_lhs_precision(self):
+        ft = self.make_tree([LogNormal(0.01, 3, 0.95), PointEstimate(1.0), PointEstimate(0.0)])
+        mu, sigma = lognormal_parameters(0.01, 3, 0.95)
+        result = propagate_uncertainty(ft, num_samples=1000, seed=6, percentiles=(5, 50, 95), sampling="lhs")
+        self.assertAlmostEqual(result.percentiles[50], math.exp(mu), delta=2e-3 * math.exp(mu))
+        self.assertAlmostEqual(result.mean, 0.01, delta=1e-4)
+        with self.assertRaises(ValueError):
+            propagate_uncertainty(ft, num_samples=10, sampling="sobol")
+
+    def test_streaming(self):
+        ft = self.make_tree([LogNormal(0.01, 3, 0.95), LogNormal(0.5, 2), PointEstimate(0.1)])
+        exact = propagate_uncertainty(ft, num_samples=40_000, seed=7, max_workers=2)
+        streamed = propagate_uncertainty(ft, num_samples=40_000, seed=7, max_workers=2, keep_samples=False)
+        self.assertEqual(len(exact.samples), 40_000)
+        self.assertIsNone(streamed.samples)
+        self.assertEqual(streamed.digest.count, 40_000)
+        self.assertAlmostEqual(streamed.mean, exact.mean, delta=1e-12)
+        self.assertAlmostEqual(streamed.std, exact.std, delta=1e-12)
+        for p, value in exact.percentiles.items():
+            rank = np.mean(exact.samples <= streamed.percentiles[p])
+            self.assertAlmostEqual(rank, p / 100, delta=0.005)
+
+    def test_generated_lognormal(self):
+        factors = ComplexityFactors()
+        factors.set_min_max_prob(0.01, 0.1)
+        factors.set_error_factor(4)
+        factors.set_common_event_factors(0.1, 0.1, 2, 2)
+        factors.set_num_factors(3, 20)
+        factors.set_gate_weights([1, 1])
+        factors.calculate()
+        for seed in range(20):  # small trees may fail to generate
+            random.seed(seed)
+            try:
+                ft = GenerativeFaultTree("T", factors, "root", timeout=5)
+                break
+            except (AssertionError, TimeoutError):
+                continue
+        self.assertTrue(all(isinstance(x.probability, LogNormal) for x in ft.basic_events))
+        self.assertGreater(propagate_uncertainty(ft, num_samples=100, seed=4).error_factor, 1)
+        with self.assertRaises(ComplexityFactorError):
+            factors.set_error_factor(0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
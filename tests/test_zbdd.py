@@ -0,0 +1,109 @@
+import itertools
+import unittest
+from fault_tree import FaultTree
+from fault_tree.analysis import BddNodeBudgetError, FaultTreeZbdd, Zbdd, count_cut_sets, minimal_cut_sets
+from fault_tree.event import Gate, BasicEvent, HouseEvent
+from fault_tree.probability import PointEstimate
+from ordered_set import OrderedSet
+
+
+class TestZbdd(unittest.TestCase):
+
+    def setUp(self):
+        # root = (B1 + B2*B3) * atleast_2(B2,B3,B4,B5) with B2 and B3 shared
+        self.probabilities = {"B1": 0.1, "B2": 0.2, "B3": 0.3, "B4": 0.4, "B5": 0.05}
+        self.events = {name: BasicEvent(name, PointEstimate(p)) for name, p in self.probabilities.items()}
+        self.ft = FaultTree(name="TestTree")
+        e = self.events
+        top = Gate("root", "and")
+        g1 = Gate("G1", "or")
+        g2 = Gate("G2", "and")
+        g3 = Gate("G3", "atleast", k_num=2)
+        g2.add_basic_events(OrderedSet([e["B2"], e["B3"]]))
+        g1.add_basic_event(e["B1"])
+        g1.add_gate(g2)
+        g3.add_basic_events(OrderedSet([e["B2"], e["B3"], e["B4"], e["B5"]]))
+        top.add_gates(OrderedSet([g1, g3]))
+        self.ft.top_gate = top
+        self.ft.add_gates(OrderedSet([top, g1, g2, g3]))
+
+    def structure(self, values):
+        b = values
+        return (b["B1"] or (b["B2"] and b["B3"])) and b["B2"] + b["B3"] + b["B4"] + b["B5"] >= 2
+
+    def brute_force(self):
+        names = sorted(self.events)
+        cut_sets = []
+        for size in range(len(names) + 1):
+            for subset in itertools.combinations(names, size):
+                if any(set(x) <= set(subset) for x in cut_sets):
+                    continue
+                if self.structure({x: x in subset for x in names}):
+                    cut_sets.append(subset)
+        return {frozenset(x) for x in cut_sets}
+
+    def test_minimal_cut_sets(self):
+        expected = self.brute_force()
+        self.assertEqual({frozenset(x) for x in minimal_cut_sets(self.ft)}, expected)
+        self.assertEqual(count_cut_sets(self.ft), len(expected))
+        self.assertIn(frozenset(["B2", "B3"]), expected)
+
+    def test_limit_order(self):
+        expected = {x for x in self.brute_force() if len(x) <= 2}
+        cut_sets = FaultTreeZbdd(self.ft, limit_order=2)
+        self.assertEqual({frozenset(x) for x in cut_sets.cut_sets()}, expected)
+        self.assertEqual(cut_sets.count(), len(expected))
+        self.assertEqual(count_cut_sets(self.ft, limit_order=1), 0)
+
+    def test_cut_off(self):
+        def probability(cut_set):
+            result = 1.0
+            for name in cut_set:
+                result *= self.probabilities[name]
+            return result
+
+        cut_off = 0.005
+        expected = {x for x in self.brute_force() if probability(x) >= cut_off}
+        self.assertLess(len(expected), len(self.brute_force()))
+        self.assertEqual({frozenset(x) for x in minimal_cut_sets(self.ft, cut_off=cut_off)}, expected)
+
+    def test_non_coherent(self):
+        # root = (B1 ^ B4 ^ H1)' + B2*B3 with H1 true, i.e. (B1 ^ B4) + B2*B3
+        ft = FaultTree(name="NonCoherent")
+        e = self.events
+        top = Gate("root", "or")
+        g1 = Gate("G1", "not")
+        g2 = Gate("G2", "xor")
+        g3 = Gate("G3", "and")
+        g2.add_basic_events(OrderedSet([e["B1"], e["B4"]]))
+        g2.add_house_event(HouseEvent("H1", "true"))
+        g1.add_gate(g2)
+        g3.add_basic_events(OrderedSet([e["B2"], e["B3"]]))
+        top.add_gates(OrderedSet([g1, g3]))
+        ft.top_gate = top
+        ft.add_gates(OrderedSet([top, g1, g2, g3]))
+        cut_sets = [set(x) for x in minimal_cut_sets(ft)]
+        self.assertEqual(len(cut_sets), 3)
+        self.assertIn({"B1", "B4'"}, cut_sets)
+        for values in itertools.product([False, True], repeat=4):
+            b = dict(zip(["B1", "B2", "B3", "B4"], values))
+            literals = {name if value else name + "'" for name, value in b.items()}
+            self.assertEqual(any(x <= literals for x in cut_sets), (b["B1"] != b["B4"]) or (b["B2"] and b["B3"]))
+
+    def test_family_operations(self):
+        zbdd = Zbdd(4)
+        a, b, c = (zbdd.singleton(2 * i) for i in range(3))
+        ab = zbdd.product(a, b)
+        family = zbdd.union(zbdd.union(ab, a), zbdd.product(ab, c))
+        self.assertEqual(zbdd.count(family), 3)
+        self.assertEqual(zbdd.minimize(family), a)
+        self.assertEqual(zbdd.product(a, zbdd.singleton(1)), 0)  # a complementary pair
+        self.assertEqual(sorted(zbdd.sets(zbdd.union(ab, c))), [(0, 2), (4,)])
+
+    def test_node_budget(self):
+        with self.assertRaises(BddNodeBudgetError):
+            FaultTreeZbdd(self.ft, max_nodes=4)
+
+
+if __name__ == '__main__':
+    unittest.main()